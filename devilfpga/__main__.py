@@ -0,0 +1,83 @@
+"""The devilfpga command line.
+
+    devilfpga render "C2 C2a D#2 . G1s C3as . A#2" -o render/
+    devilfpga render --bank patterns.txt --cutoff 400 800 1600 --jobs 8
+"""
+import argparse
+import sys
+from dataclasses import fields
+from pathlib import Path
+
+from .render import Render, jobs, render_all
+
+# Render settings that may be swept; every combination of their values is rendered
+SETTINGS = ("cutoff", "resonance", "env_mod", "decay", "accent")
+
+
+def read_bank(path: Path) -> list[str]:
+    """Patterns, one per line; blank lines and lines starting with # are skipped."""
+    lines = (line.strip() for line in path.read_text().splitlines())
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+def add_render(subparsers):
+    defaults = {f.name: f.default for f in fields(Render)}
+
+    parser = subparsers.add_parser("render", help="Render note patterns through the voice model to WAV",
+                                   description="Render note patterns through the voice model to WAV; "
+                                               "one file per pattern and combination of settings")
+    parser.add_argument("patterns", nargs="*",
+                        help='Patterns, e.g. "C2 C2a D#2 . G1s C3as . A#2" (a = accent, s = slide, . = rest)')
+    parser.add_argument("--bank", type=Path, help="File of patterns, one per line")
+    parser.add_argument("-o", "--output", type=Path, default=Path("render"), help="Directory to write the WAVs to")
+    parser.add_argument("-j", "--jobs", type=int, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--tempo", type=float, default=defaults["tempo"], help="BPM; four steps per beat")
+    parser.add_argument("--loops", type=int, default=defaults["loops"], help="Times to play each pattern")
+    parser.add_argument("--chunk", type=int, default=defaults["chunk"], help="Samples rendered per block")
+    parser.add_argument("--f-sample", type=int, default=defaults["f_sample"], help="Sample rate")
+    parser.add_argument("--cutoff", type=float, nargs="+", default=[defaults["cutoff"]], help="Cutoff (Hz)")
+    parser.add_argument("--resonance", type=float, nargs="+", default=[defaults["resonance"]],
+                        help="Resonance, 0 - 4")
+    parser.add_argument("--env-mod", type=float, nargs="+", default=[defaults["env_mod"]],
+                        help="Envelope modulation; peak cutoff, as a multiple of the cutoff")
+    parser.add_argument("--decay", type=float, nargs="+", default=[defaults["decay"]],
+                        help="Envelope decay time constant (s)")
+    parser.add_argument("--accent", type=float, nargs="+", default=[defaults["accent"]],
+                        help="Envelope peak of accented steps")
+    parser.set_defaults(command=render_command)
+
+
+def render_command(parser, args):
+    patterns = list(args.patterns)
+    if args.bank:
+        patterns += read_bank(args.bank)
+    if not patterns:
+        parser.error("no patterns; pass them as arguments or with --bank")
+
+    try:
+        batch = jobs(
+            patterns,
+            args.output,
+            {name: getattr(args, name) for name in SETTINGS},
+            tempo=args.tempo,
+            loops=args.loops,
+            chunk=args.chunk,
+            f_sample=args.f_sample,
+        )
+        for job in render_all(batch, args.jobs):
+            print(f"{job.output}: {job.pattern}")
+    except ValueError as e:
+        parser.error(str(e))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="devilfpga", description="Roland TB-303 on FPGA")
+    subparsers = parser.add_subparsers(required=True)
+    add_render(subparsers)
+
+    args = parser.parse_args(argv)
+    args.command(parser, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,305 @@
+"""Benchmarks: simulation throughput, and resource estimates, per module.
+
+    python -m devilfpga.benchmark [-o results.json] [--compare previous.json]
+
+Results are written as JSON, keyed by module, so runs from two commits can be diffed (--compare).
+"""
+import argparse
+import json
+import math
+import platform
+import subprocess
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+from amaranth.back import rtlil
+from amaranth.sim import Simulator
+
+from .fixed import dsp_blocks
+from .sim import CxxrtlSimulator, testbench
+from .toolchain import yosys
+
+
+def phase_accumulator():
+    from .oscillators.phase_accumulator import PhaseAccumulator
+    return PhaseAccumulator(100_000_000, 11), {"i_enable": 1, "i_f_target": 440}
+
+
+def saw_oscillator():
+    from .oscillators.saw_oscillator import SawOscillator
+    return SawOscillator(100_000_000, 8, 2 ** 11), {"i_enable": 1, "i_f_target": 440}
+
+
+def vco():
+    from .modules.vco import VCO
+    return VCO(16), {"i_cv": 2 ** 15}
+
+
+def antilog():
+    from .modules.exp_converter import Antilog
+    from .modules.vco import F_C1, F_E5
+    return Antilog(16, F_C1, F_E5), {"i_cv": 2 ** 15}
+
+
+def note_word():
+    from .modules.cv import NoteWord
+    return NoteWord(6), {"i_octave": 2, "i_note_c": 1}
+
+
+def tuning_word():
+    from .modules.cv import TuningWord
+    return TuningWord(48_000), {"i_octave": 2, "i_note_c": 1}
+
+
+def envelope_bank():
+    from .modules.envelope import EnvelopeBank
+    return EnvelopeBank(16), {"i_strobe": 1, "i_trigger": 1}
+
+
+BENCHMARKS = {
+    "PhaseAccumulator": phase_accumulator,
+    "SawOscillator": saw_oscillator,
+    "VCO": vco,
+    "Antilog": antilog,
+    "NoteWord": note_word,
+    "TuningWord": tuning_word,
+    "EnvelopeBank": envelope_bank,
+}
+
+# Cell types that end a combinational path
+SEQUENTIAL = ("dff", "$mem")
+
+# Cyclone V block sizes
+M10K_BITS = 10 * 1024
+
+
+def sim_throughput(factory, n_cycles: int, backend: str) -> float:
+    """Simulated clock cycles per second, with the inputs held at the benchmark's stimulus."""
+    dut, stimulus = factory()
+
+    def bench():
+        for name, value in stimulus.items():
+            yield getattr(dut, name).eq(value)
+        for _ in range(n_cycles):
+            yield
+
+    if backend == "cxxrtl":
+        sim = CxxrtlSimulator(dut)     # built (and cached) before timing
+        start = time.perf_counter()
+        sim.run([bench])
+    else:
+        sim = Simulator(dut)
+        sim.add_clock(1e-8)
+        sim.add_testbench(testbench(bench))
+        start = time.perf_counter()
+        sim.run()
+
+    return n_cycles / (time.perf_counter() - start)
+
+
+def netlist(dut) -> dict:
+    """The flattened, coarse-grained netlist of dut, as Yosys JSON."""
+    design = rtlil.convert(dut, ports=dut.ports(), emit_src=False)
+    script = "\n".join([
+        f"read_rtlil <<rtlil\n{design}\nrtlil",
+        "hierarchy -top top",
+        "proc",
+        "flatten",
+        "opt",
+        "wreduce",
+        "memory_collect",
+        "opt_clean",
+        "write_json",
+    ])
+    return json.loads(yosys(script))["modules"]["top"]
+
+
+def param(cell: dict, name: str) -> int:
+    """A numeric cell parameter; Yosys JSON writes them as binary strings."""
+    value = cell["parameters"][name]
+    return int(value, 2) if isinstance(value, str) else value
+
+
+def lut_cost(cell: dict) -> int:
+    """A rough LUT count for a coarse cell: one per output bit, more for wide muxes, shifters and dividers."""
+    kind = cell["type"]
+    params = {name: param(cell, name) for name in cell["parameters"] if name.endswith("WIDTH")}
+    width = params.get("Y_WIDTH", params.get("WIDTH", 1))
+
+    if kind == "$mul" or kind.startswith("$mem") or any(s in kind for s in SEQUENTIAL):
+        return 0
+    if kind in ("$div", "$mod", "$divfloor", "$modfloor"):
+        return width * params["B_WIDTH"]
+    if kind == "$pmux":
+        return width * math.ceil(params["S_WIDTH"] / 2)
+    if kind in ("$shl", "$shr", "$sshl", "$sshr", "$shift", "$shiftx"):
+        return width * math.ceil(params["B_WIDTH"] / 2)
+    if kind in ("$eq", "$ne", "$lt", "$le", "$gt", "$ge"):
+        return max(params["A_WIDTH"], params["B_WIDTH"])
+    if kind.startswith("$reduce_") or kind.startswith("$logic_"):
+        return math.ceil(params["A_WIDTH"] / 5)
+    return width
+
+
+def cell_levels(cell: dict) -> int:
+    """A rough count of the LUT levels a coarse cell's output is behind its inputs, from its type and width.
+
+    Adders, multipliers and comparators, log2 of their width (a carry chain); dividers, their width (a subtract
+    per quotient bit); shifters, a 4:1 mux stage per two bits of shift; parallel muxes and reductions, a tree
+    of their inputs; bitwise cells and plain muxes, one.
+    """
+    kind = cell["type"]
+    params = {name: param(cell, name) for name in cell.get("parameters", {}) if name.endswith("WIDTH")}
+    width = params.get("Y_WIDTH", params.get("WIDTH", 1))
+    operands = max(params.get("A_WIDTH", 1), params.get("B_WIDTH", 1))
+
+    if kind in ("$div", "$mod", "$divfloor", "$modfloor"):
+        return width
+    if kind in ("$add", "$sub", "$neg", "$alu", "$mul"):
+        return max(1, math.ceil(math.log2(width)))
+    if kind in ("$eq", "$ne", "$lt", "$le", "$gt", "$ge"):
+        return max(1, math.ceil(math.log2(operands)))
+    if kind in ("$shl", "$shr", "$sshl", "$sshr", "$shift", "$shiftx"):
+        return max(1, math.ceil(params["B_WIDTH"] / 2))
+    if kind == "$pmux":
+        return max(1, math.ceil(math.log2(params["S_WIDTH"])))
+    if kind.startswith("$reduce_") or kind.startswith("$logic_"):
+        return max(1, math.ceil(math.log(max(params["A_WIDTH"], 2), 5)))
+    return 1
+
+
+def logic_depth(cells: dict) -> int:
+    """The longest combinational path between registers (or ports), in estimated LUT levels (see `cell_levels`);
+    a proxy for the design's critical path, before technology mapping."""
+    driver = {}
+    for name, cell in cells.items():
+        for port, bits in cell["connections"].items():
+            if cell["port_directions"].get(port) == "output":
+                for bit in bits:
+                    driver[bit] = name
+
+    # Registers start paths; each combinational cell is its own levels past its deepest driver
+    depth = {name: 0 for name, cell in cells.items() if any(s in cell["type"] for s in SEQUENTIAL)}
+    for root in cells:
+        stack = [root]
+        visiting = set()
+        while stack:
+            name = stack[-1]
+            if name in depth:
+                stack.pop()
+                continue
+
+            cell = cells[name]
+            inputs = {driver[bit] for port, bits in cell["connections"].items()
+                      if cell["port_directions"].get(port) == "input"
+                      for bit in bits if bit in driver}
+            pending = [d for d in inputs if d not in depth and d not in visiting]
+            if pending and name not in visiting:
+                visiting.add(name)
+                stack.extend(pending)
+                continue
+
+            # (A combinational loop, if any, is cut where it was entered)
+            depth[name] = cell_levels(cell) + max((depth.get(d, 0) for d in inputs), default=0)
+            stack.pop()
+
+    return max(depth.values(), default=0)
+
+
+def resources(dut) -> dict:
+    """Resource estimates from the coarse netlist.
+
+    The Yosys bundled with amaranth-yosys has no technology mapping, so these are estimates: LUTs from a
+    per-cell cost model, DSP blocks per multiplier (see `fixed.dsp_blocks`), BRAM as M10K blocks per memory.
+    """
+    cells = netlist(dut)["cells"]
+    counts = Counter(cell["type"] for cell in cells.values() if cell["type"] != "$scopeinfo")
+    ffs = sum(param(cell, "WIDTH") for cell in cells.values() if "dff" in cell["type"])
+    dsps = sum(dsp_blocks(param(cell, "A_WIDTH"), param(cell, "B_WIDTH"))
+               for cell in cells.values() if cell["type"] == "$mul")
+    brams = sum(math.ceil(param(cell, "WIDTH") * param(cell, "SIZE") / M10K_BITS)
+                for cell in cells.values() if cell["type"].startswith("$mem"))
+
+    return {
+        "cells": dict(sorted(counts.items())),
+        "luts": sum(lut_cost(cell) for cell in cells.values()),
+        "ffs": ffs,
+        "dsps": dsps,
+        "brams": brams,
+        "logic_depth": logic_depth(cells),
+    }
+
+
+def run(names: list, n_cycles: int) -> dict:
+    results = {}
+    for name in names:
+        factory = BENCHMARKS[name]
+        try:
+            dut, _ = factory()
+            result = {"resources": resources(dut)}
+            result["cycles_per_second"] = {
+                backend: round(sim_throughput(factory, n_cycles, backend))
+                for backend in ("pysim", "cxxrtl")
+            }
+        except Exception as e:
+            # Keep going; a broken module shouldn't hide the others' numbers
+            result = {"error": f"{type(e).__name__}: {e}"}
+        results[name] = result
+        print(f"{name}: {json.dumps(result)}", file=sys.stderr)
+    return results
+
+
+def commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=Path(__file__).parent,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(previous: dict, current: dict):
+    """Print the metrics that changed since a previous run."""
+    for name, result in current["results"].items():
+        before = previous["results"].get(name, {})
+        for section in ("resources", "cycles_per_second"):
+            for metric, value in result.get(section, {}).items():
+                old = before.get(section, {}).get(metric)
+                if isinstance(value, dict) or old is None or old == value:
+                    continue
+                change = f" ({(value - old) / old:+.1%})" if old else ""
+                print(f"{name}.{metric}: {old} -> {value}{change}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark simulation throughput and resource usage per module")
+    parser.add_argument("-o", "--output", type=Path, help="JSON file to write the results to")
+    parser.add_argument("--compare", type=Path, help="JSON results of a previous run to diff against")
+    parser.add_argument("--cycles", type=int, default=20_000, help="Clock cycles to simulate per module")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, default=list(BENCHMARKS),
+                        help="Modules to benchmark")
+    args = parser.parse_args(argv)
+
+    results = {
+        "commit": commit(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "cycles": args.cycles,
+        "results": run(args.only, args.cycles),
+    }
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        compare(json.loads(args.compare.read_text()), results)
+
+
+if __name__ == "__main__":
+    main()
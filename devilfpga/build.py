@@ -0,0 +1,319 @@
+"""Generates the core's HDL into the Analogue Pocket project; incremental, one netlist per unit.
+
+    python -m devilfpga.build [--output open-fpga/src/fpga] [--clean]
+
+Each of the core's units (see `Core.units`) is converted on its own, to Verilog and RTLIL, and cached under
+build/netlists, keyed by its class, its parameters and the source of the modules it is built from. A build
+only regenerates the units whose key changed; the top-level module instantiates the units as black boxes,
+so it is cheap to regenerate.
+"""
+import argparse
+import hashlib
+import inspect
+import json
+import re
+import shutil
+import sys
+import types
+from pathlib import Path
+
+import numpy as np
+from amaranth import ClockSignal, Elaboratable, Fragment, Instance, ResetSignal, Signal
+from amaranth.back import rtlil
+from amaranth.lib.memory import Memory
+
+from .toolchain import yosys
+
+ROOT = Path(__file__).parents[1]
+OUTPUT_DIR = ROOT / "open-fpga" / "src" / "fpga"
+CACHE_DIR = ROOT / "build" / "netlists"
+MANIFEST = ".devilfpga-build.json"
+PREFIX = "devilfpga"
+
+# Bump to invalidate every cached netlist, e.g. when the conversion below changes
+VERSION = 2
+
+
+def describe(value, seen=None):
+    """A JSON-able description of a parameter; what a unit's netlist depends on, besides its source."""
+    seen = set() if seen is None else seen
+    if isinstance(value, (bool, int, float, str)) or value is None:
+        return value
+    if isinstance(value, (list, tuple)):
+        return [describe(x, seen) for x in value]
+    if isinstance(value, dict):
+        return {str(k): describe(v, seen) for k, v in value.items()}
+    if isinstance(value, np.ndarray):
+        return hashlib.sha256(value.tobytes()).hexdigest()
+    if isinstance(value, (types.FunctionType, type)):
+        return f"{value.__module__}.{value.__qualname__}"
+    if isinstance(value, Memory):
+        return {
+            "shape": repr(value.shape),
+            "depth": value.depth,
+            "init": hashlib.sha256(repr(list(value.init)).encode()).hexdigest(),
+        }
+    if isinstance(value, Elaboratable):
+        if id(value) in seen:
+            return None
+        seen.add(id(value))
+        return {"class": describe(type(value)), "parameters": parameters(value, seen)}
+    return repr(value)
+
+
+def parameters(unit: Elaboratable, seen=None) -> dict:
+    """The unit's parameters; its public attributes, other than its signals."""
+    return {
+        name: describe(value, seen)
+        for name, value in sorted(vars(unit).items())
+        if not name.startswith("_") and not isinstance(value, Signal)
+    }
+
+
+def source_hash(cls: type) -> str:
+    """A hash of the source of cls' module, and of every devilfpga module it (transitively) imports."""
+    package = __name__.split(".")[0]
+    digest = hashlib.sha256()
+    pending = [sys.modules[cls.__module__]]
+    seen = set()
+    while pending:
+        module = pending.pop()
+        if module.__name__ in seen:
+            continue
+        seen.add(module.__name__)
+        digest.update(module.__name__.encode())
+        digest.update(Path(module.__file__).read_bytes())
+
+        for value in vars(module).values():
+            name = value.__name__ if isinstance(value, types.ModuleType) else getattr(value, "__module__", None)
+            if isinstance(name, str) and name.split(".")[0] == package and name in sys.modules:
+                pending.append(sys.modules[name])
+
+    return digest.hexdigest()
+
+
+def unit_key(name: str, unit: Elaboratable) -> str:
+    cls = type(unit)
+    return hashlib.sha256(json.dumps({
+        "version": VERSION,
+        "name": name,
+        "class": describe(cls),
+        "parameters": parameters(unit),
+        "source": source_hash(cls),
+    }, sort_keys=True).encode()).hexdigest()
+
+
+def interface(unit: Elaboratable) -> dict:
+    """The unit's interface; the signals of its `ports()`, by attribute name."""
+    names = {id(value): name for name, value in vars(unit).items() if isinstance(value, Signal)}
+    ports = {}
+    for signal in unit.ports():
+        if id(signal) not in names:
+            raise ValueError(f"Port {signal.name} of {type(unit).__name__} is not a signal attribute of it")
+        ports[names[id(signal)]] = signal
+    return ports
+
+
+def port_directions(text: str, module: str) -> dict:
+    """The directions of the ports of one module of an RTLIL design, by port name."""
+    directions = {}
+    current = None
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("module "):
+            current = line.split()[1].lstrip("\\")
+        elif current == module:
+            match = re.match(r"wire (?:width \d+ )?(input|output|inout) \d+ +(?:signed )?\\(\S+)$", line)
+            if match:
+                directions[match[2]] = match[1]
+    return directions
+
+
+def verilog(text: str) -> str:
+    """The Verilog of an RTLIL design; its processes and memories lowered as Amaranth's Verilog backend does."""
+    return yosys("\n".join([
+        f"read_rtlil <<rtlil\n{text}\nrtlil",
+        "proc -nomux -norom",
+        "memory_collect",
+        "write_verilog -norename",
+    ]))
+
+
+def convert(name: str, unit: Elaboratable) -> dict:
+    """Converts one unit to RTLIL and Verilog; its module is named after the unit."""
+    module = f"{PREFIX}_{name}"
+    signals = interface(unit)
+    # Without source locations, which would put the absolute paths of the checkout in the cached netlists
+    text = rtlil.convert(unit, name=module, ports=[(port, signal, None) for port, signal in signals.items()],
+                         emit_src=False)
+    ports = port_directions(text, module)
+    if missing := set(signals) - set(ports):
+        raise RuntimeError(f"Ports {sorted(missing)} of {module} were not found in its netlist")
+    return {
+        "module": module,
+        "ports": ports,
+        "rtlil": text,
+        "verilog": verilog(text),
+    }
+
+
+class Blackbox(Elaboratable):
+    """Stands in for a unit in the top level; an instance of the unit's separately generated module.
+
+    Attribute access goes through to the unit, so its parent connects to the stub as it would to the unit.
+    """
+
+    def __init__(self, unit: Elaboratable, module: str, ports: dict):
+        self._unit = unit
+        self._module = module
+        self._ports = ports
+
+    def __getattr__(self, name):
+        return getattr(self._unit, name)
+
+    def elaborate(self, _) -> Instance:
+        signals = interface(self._unit)
+        connections = {}
+        for port, direction in self._ports.items():
+            if port in signals:
+                value = signals[port]
+            elif port == "clk" or port.endswith("_clk"):
+                value = ClockSignal(port[:-len("_clk")] or "sync")
+            elif port == "rst" or port.endswith("_rst"):
+                value = ResetSignal(port[:-len("_rst")] or "sync")
+            else:
+                raise ValueError(f"Port {port} of {self._module} is neither a signal of the unit nor a clock")
+            connections[f"{direction[0]}_{port}"] = value
+
+        return Instance(self._module, **connections)
+
+
+class Cache:
+    """Generated netlists on disk, one set of files per key."""
+
+    def __init__(self, root: Path = CACHE_DIR):
+        self.root = Path(root)
+
+    def load(self, key: str) -> dict | None:
+        meta = self.root / f"{key}.json"
+        if not meta.exists():
+            return None
+        netlist = json.loads(meta.read_text())
+        netlist["rtlil"] = (self.root / f"{key}.il").read_text()
+        netlist["verilog"] = (self.root / f"{key}.v").read_text()
+        return netlist
+
+    def store(self, key: str, netlist: dict):
+        self.root.mkdir(parents=True, exist_ok=True)
+        (self.root / f"{key}.il").write_text(netlist["rtlil"])
+        (self.root / f"{key}.v").write_text(netlist["verilog"])
+        # Written last; a netlist is cached once its metadata exists
+        meta = {k: v for k, v in netlist.items() if k not in ("rtlil", "verilog")}
+        (self.root / f"{key}.json.tmp").write_text(json.dumps(meta, indent=2))
+        (self.root / f"{key}.json.tmp").replace(self.root / f"{key}.json")
+
+
+def write(path: Path, text: str) -> bool:
+    """Writes text to path, unless it already holds it (so the file's timestamp only moves when it changes)."""
+    if path.exists() and path.read_text() == text:
+        return False
+    path.write_text(text)
+    return True
+
+
+def build(core=None, output: Path = OUTPUT_DIR, cache: Cache = None, log=print) -> dict:
+    """Generates the core's HDL into output; returns, per unit (and "top"), whether it was "generated" or "cached"."""
+    if core is None:
+        from .core import Core
+        core = Core()
+    cache = Cache() if cache is None else cache
+    output = Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+
+    status = {}
+    files = []
+    netlists = {}
+    for name, unit in core.units.items():
+        key = unit_key(name, unit)
+        netlist = cache.load(key)
+        if netlist is None:
+            netlist = convert(name, unit)
+            cache.store(key, netlist)
+            status[name] = "generated"
+        else:
+            # Elaborated all the same; only its conversion is skipped
+            Fragment.get(unit, None)
+            status[name] = "cached"
+        netlists[name] = (key, netlist)
+
+    # The top level, with the units swapped for black boxes
+    cls = type(core)
+    key = hashlib.sha256(json.dumps({
+        "version": VERSION,
+        "class": describe(cls),
+        "parameters": parameters(core),
+        "source": hashlib.sha256(Path(inspect.getfile(cls)).read_bytes()).hexdigest(),
+        "units": {name: key for name, (key, _) in netlists.items()},
+    }, sort_keys=True).encode()).hexdigest()
+    top = cache.load(key)
+    units = core.units
+    core.units = {name: Blackbox(unit, netlists[name][1]["module"], netlists[name][1]["ports"])
+                  for name, unit in units.items()}
+    try:
+        if top is None:
+            top = convert("core", core)
+            cache.store(key, top)
+            status["top"] = "generated"
+        else:
+            Fragment.get(core, None)
+            status["top"] = "cached"
+    finally:
+        core.units = units
+    netlists["top"] = (key, top)
+
+    for name, (_, netlist) in netlists.items():
+        for suffix, text in ((".v", netlist["verilog"]), (".il", netlist["rtlil"])):
+            path = output / f"{netlist['module']}{suffix}"
+            write(path, text)
+            files.append(path.name)
+
+    write(output / MANIFEST, json.dumps({
+        "top": top["module"],
+        "units": {name: key for name, (key, _) in netlists.items()},
+        "files": sorted(files),
+    }, indent=2) + "\n")
+
+    for name, state in status.items():
+        log(f"{name}: {state}")
+    return status
+
+
+def clean(output: Path = OUTPUT_DIR, cache: Cache = None):
+    """Removes the generated files (those listed in the manifest) and the netlist cache."""
+    cache = Cache() if cache is None else cache
+    manifest = Path(output) / MANIFEST
+    if manifest.exists():
+        for name in json.loads(manifest.read_text())["files"]:
+            (Path(output) / name).unlink(missing_ok=True)
+        manifest.unlink()
+    shutil.rmtree(cache.root, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the core's Verilog and RTLIL, reusing cached netlists")
+    parser.add_argument("-o", "--output", type=Path, default=OUTPUT_DIR, help="Directory to write the HDL to")
+    parser.add_argument("--cache", type=Path, default=CACHE_DIR, help="Directory of the cached netlists")
+    parser.add_argument("--clean", action="store_true", help="Remove the generated HDL and the cache")
+    parser.add_argument("--data-slots", action="store_true",
+                        help="Load the tables from data slots at boot (see devilfpga.slots), not from the bitstream")
+    args = parser.parse_args(argv)
+
+    if args.clean:
+        clean(args.output, Cache(args.cache))
+    else:
+        from .core import Core
+        build(Core(data_slots=args.data_slots), output=args.output, cache=Cache(args.cache))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+from amaranth import Cat, Elaboratable, Module, Mux, Signal
+
+from .i2c.i2c_bus import I2CBus
+from .modules.bridge import DataSlot, connect
+from .modules.cv import Slide, TuningWord, slide_shift
+from .modules.envelope import Envelope, decay_shift
+from .modules.strobe import Scheduler
+from .modules.vcf import VCF
+from .modules.vco import VCO
+from .oscillators.oscillator import lut_table
+from .oscillators.saw_oscillator import saw
+
+# The tables loaded over the bridge, with data_slots; see open-fpga/data.json
+SLOTS = {
+    "saw": DataSlot("Saw LUT", 2, 0x1000_0000, "saw.bin"),
+}
+
+
+def slot_tables(lut_width: int = 8, lut_depth: int = 2 ** 11) -> dict:
+    """The tables `Core` loads from `SLOTS` with data_slots, by slot; as `Core.tables()` has them, without a core."""
+    return {SLOTS["saw"]: lut_table(saw, lut_width, lut_depth)}
+
+
+class Core(Elaboratable):
+    """The synthesizer core; one voice, from its keyboard to the I2S DAC.
+
+    The held key (i_keys, A to G#, the lowest wins) and i_octave pick the note; `TuningWord` looks up its
+    tuning word, which `Slide` glides toward while i_slide is held, at the control rate. The VCO takes the
+    tuning word as its phase increment; no antilog, nor divide, on the pitch path.
+
+    The `Scheduler` strobes the voice once per sample: the VCO, then the VCF (filter and VCA), whose
+    output is sent, on both channels, to the `I2CBus` transmitter. The audio domain clocks the I2S bus.
+
+    The `Envelope` decays at the control rate; i_trigger restarts it (i_accent for a higher peak). It is
+    the VCA's gain, and sweeps the cutoff up from i_cutoff_cv by the envelope shifted right by i_env_mod.
+
+    With data_slots, the VCO's table is loaded from `SLOTS` at boot, over the APF bridge (the bridge
+    domain, and i_bridge_*), rather than built into the bitstream; `tables()` (or `slot_tables`) has their
+    contents, for `devilfpga.slots` to write. A table change then doesn't change the design.
+
+    The blocks are kept in `units`, by name; the build (`devilfpga.build`) generates each unit's netlist
+    separately, and caches it.
+
+    Parameters
+    ----------
+    f_clk : int
+        The clock frequency.
+    f_sample : int
+        The audio sample rate.
+    audio_width : int
+        The width in bits of the (signed) audio samples.
+    lut_width : int
+        The width in bits of the waveform LUT elements.
+    lut_depth : int
+        The word count (# of storage elements) of the waveform LUT.
+    t_slide : float
+        The slide's time constant, in seconds.
+    data_slots : bool
+        Whether to load the tables from data slots.
+
+    """
+
+    def __init__(self,
+                 f_clk: int = 100_000_000,
+                 f_sample: int = 48_000,
+                 audio_width: int = 16,
+                 lut_width: int = 8,
+                 lut_depth: int = 2 ** 11,
+                 t_slide: float = 0.04,
+                 data_slots: bool = False,
+                 ):
+        self.f_clk = f_clk
+        self.f_sample = f_sample
+        self.audio_width = audio_width
+        self.lut_width = lut_width
+        self.lut_depth = lut_depth
+        self.data_slots = data_slots
+
+        scheduler = Scheduler(f_clk, f_sample)
+        envelope = Envelope(16, decay_shift(0.2, scheduler.f_control))  # ~200 ms
+
+        self.i_bridge_addr = Signal(32)
+        self.i_bridge_wr = Signal()
+        self.i_bridge_wr_data = Signal(32)
+
+        self.i_octave = Signal(3)  # 0-4
+        self.i_keys = Signal(12)  # A, A#, B, ..., G#
+        self.i_slide = Signal()
+        self.i_waveform = Signal()  # 0 = saw, 1 = square
+        self.i_cutoff_cv = Signal(16)
+        self.i_resonance = Signal(16)
+        self.i_trigger = Signal()
+        self.i_accent = Signal()
+        self.i_decay = Signal.like(envelope.i_decay)
+        self.i_env_mod = Signal(4)  # The cutoff sweep, as a right shift of the envelope
+
+        self.o_dac = Signal()
+        self.o_lrclk = Signal()
+        self.o_mclk = Signal()
+        self.o_sclk = Signal()
+
+        slots = SLOTS if data_slots else {}
+        self.units = {
+            "scheduler": scheduler,
+            "tuning": TuningWord(f_sample),
+            # Strobed at the control rate
+            "slide": Slide(32, slide_shift(t_slide, scheduler.f_control)),
+            "envelope": envelope,
+            # Strobed at the sample rate
+            "vco": VCO(16, f_sample, lut_width, lut_depth, lut_slot=slots.get("saw"), mode="increment"),
+            "vcf": VCF(audio_width, f_sample),
+            "i2s": I2CBus(audio_width),
+        }
+
+    def tables(self) -> dict:
+        """The tables loaded from data slots, by slot."""
+        return self.units["vco"].tables()
+
+    def elaborate(self, _) -> Module:
+        m = Module()
+
+        for name, unit in self.units.items():
+            m.submodules[name] = unit
+
+        scheduler = self.units["scheduler"]
+        tuning = self.units["tuning"]
+        slide = self.units["slide"]
+        vco = self.units["vco"]
+        envelope = self.units["envelope"]
+        vcf = self.units["vcf"]
+        i2s = self.units["i2s"]
+
+        # Centre the unsigned waveform, and scale it to the audio width
+        audio = Signal.like(vcf.i_audio)
+        m.d.comb += audio.eq((vco.o_a - (1 << (self.lut_width - 1))) << (self.audio_width - self.lut_width))
+
+        # The envelope sweeps the cutoff up, saturating at the top of its range
+        cutoff = Signal(17)
+        m.d.comb += cutoff.eq(self.i_cutoff_cv + (envelope.o_env >> self.i_env_mod))
+
+        if self.data_slots:
+            m.d.comb += connect(vco, self)
+
+        m.d.comb += [tuning.i_octave.eq(self.i_octave), tuning.i_slide.eq(self.i_slide)]
+        m.d.comb += [key.eq(self.i_keys[i]) for i, key in enumerate(tuning.keys())]
+
+        m.d.comb += [
+            slide.i_target.eq(tuning.o_inc),
+            slide.i_slide.eq(self.i_slide),
+            slide.i_strobe.eq(scheduler.o_control),
+
+            envelope.i_trigger.eq(self.i_trigger),
+            envelope.i_accent.eq(self.i_accent),
+            envelope.i_decay.eq(self.i_decay),
+            envelope.i_strobe.eq(scheduler.o_control),
+
+            vco.i_inc.eq(slide.o_inc),
+            vco.i_waveform.eq(self.i_waveform),
+            vco.i_strobe.eq(scheduler.o_audio),
+
+            vcf.i_audio.eq(audio),
+            vcf.i_cutoff_cv.eq(Mux(cutoff[-1], (1 << 16) - 1, cutoff)),
+            vcf.i_resonance.eq(self.i_resonance),
+            vcf.i_envelope.eq(envelope.o_env),
+            vcf.i_strobe.eq(vco.o_stb),
+
+            i2s.i_audio.eq(Cat(vcf.o_audio, vcf.o_audio)),
+            i2s.i_valid.eq(vcf.o_stb),
+
+            self.o_dac.eq(i2s.o_audio),
+            self.o_lrclk.eq(i2s.lrclk),
+            self.o_mclk.eq(i2s.mclk),
+            self.o_sclk.eq(i2s.sclk),
+        ]
+
+        return m
+
+    def ports(self):
+        bridge = [self.i_bridge_addr, self.i_bridge_wr, self.i_bridge_wr_data] if self.data_slots else []
+        return bridge + [
+            self.i_octave,
+            self.i_keys,
+            self.i_slide,
+            self.i_waveform,
+            self.i_cutoff_cv,
+            self.i_resonance,
+            self.i_trigger,
+            self.i_accent,
+            self.i_decay,
+            self.i_env_mod,
+            self.o_dac,
+            self.o_lrclk,
+            self.o_mclk,
+            self.o_sclk,
+        ]
@@ -0,0 +1,93 @@
+"""Fingerprints of Python functions and values; what a cached result computed by (or from) them depends on.
+
+A function's fingerprint covers its bytecode and constants, the values it closes over, its defaults, and the
+globals it reads, recursively; so a cache keyed by it misses when any of them change, not just its source.
+The modules and classes of this package are fingerprinted by their contents (the attributes a function reads
+of a module, the methods of a class); those of other packages, by name.
+"""
+import functools
+import types
+
+import numpy as np
+from amaranth import Elaboratable, Value
+
+PACKAGE = __name__.split(".")[0]
+
+
+def _local(name: str) -> bool:
+    """Whether the module name is of this package."""
+    return isinstance(name, str) and name.split(".")[0] == PACKAGE
+
+
+def fingerprint(obj, seen: dict = None) -> bytes:
+    """Identifies obj by value; functions by their code, the values they close over, and the globals they read.
+
+    Elaboratables and signals are left out, but for their type; a design is identified by its netlist.
+    An object may define `__fingerprint__()`, returning what identifies it in its place.
+    """
+    if obj is None or isinstance(obj, (bool, int, float, complex, str, bytes)):
+        return repr(obj).encode()
+    if isinstance(obj, np.ndarray):
+        return f"{obj.dtype}{obj.shape}".encode() + obj.tobytes()
+    if isinstance(obj, np.generic):
+        return repr(obj.item()).encode()
+
+    # Containers and objects, once each (they may refer back to themselves); by id, and kept alive, so the
+    # ids of temporaries (e.g. a class's members) aren't reused within the call
+    seen = {} if seen is None else seen
+    if id(obj) in seen:
+        return b"..."
+    seen[id(obj)] = obj
+    if isinstance(obj, (Elaboratable, Value)):
+        return type(obj).__qualname__.encode()
+    if hasattr(type(obj), "__fingerprint__"):
+        return type(obj).__qualname__.encode() + fingerprint(obj.__fingerprint__(), seen)
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        items = sorted(obj, key=repr) if isinstance(obj, (set, frozenset)) else obj
+        return b"[" + b",".join(fingerprint(item, seen) for item in items) + b"]"
+    if isinstance(obj, dict):
+        return b"{" + b",".join(fingerprint(k, seen) + b":" + fingerprint(v, seen) for k, v in obj.items()) + b"}"
+    if isinstance(obj, types.FunctionType):
+        closure = [cell.cell_contents for cell in obj.__closure__ or ()]
+        return code_fingerprint(obj.__code__, obj.__globals__, seen) + fingerprint(closure, seen) + \
+            fingerprint(obj.__defaults__, seen) + fingerprint(obj.__kwdefaults__, seen)
+    if isinstance(obj, functools.partial):
+        return fingerprint([obj.func, obj.args, obj.keywords], seen)
+    if isinstance(obj, (staticmethod, classmethod)):
+        return fingerprint(obj.__func__, seen)
+    if isinstance(obj, property):
+        return fingerprint([obj.fget, obj.fset, obj.fdel], seen)
+    if isinstance(obj, type):
+        name = f"{obj.__module__}.{obj.__qualname__}".encode()
+        if not _local(obj.__module__):
+            return name
+        members = {k: v for k, v in vars(obj).items() if k not in ("__dict__", "__weakref__", "__doc__")}
+        return name + fingerprint(obj.__bases__, seen) + fingerprint(members, seen)
+    if isinstance(obj, (types.ModuleType, types.BuiltinFunctionType)):
+        return obj.__name__.encode()
+    if hasattr(obj, "__dict__"):
+        # A plain object, e.g. a model instance; by its class, and its attributes
+        return fingerprint(type(obj), seen) + fingerprint(vars(obj), seen)
+    return type(obj).__qualname__.encode()
+
+
+def code_fingerprint(code: types.CodeType, globals_: dict, seen: dict = None) -> bytes:
+    """Identifies a code object; its bytecode, its constants (nested code included), and the globals it reads."""
+    seen = {} if seen is None else seen
+    parts = [code.co_code]
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            parts.append(code_fingerprint(const, globals_, seen))
+        else:
+            parts.append(fingerprint(const, seen))
+    for name in code.co_names:
+        if name in globals_:
+            parts.append(name.encode() + b"=" + fingerprint(globals_[name], seen))
+
+            # The attributes read of a module of this package (helper.f() names both helper and f)
+            module = globals_[name]
+            if isinstance(module, types.ModuleType) and _local(module.__name__):
+                for attribute in code.co_names:
+                    if attribute in vars(module):
+                        parts.append(f"{name}.{attribute}=".encode() + fingerprint(vars(module)[attribute], seen))
+    return b"|".join(parts)
@@ -0,0 +1,221 @@
+"""Fixed-point (Q format) arithmetic over Amaranth values.
+
+    x = Fixed(self.i_x, 12)                               # a signal holding a Q3.12 value
+    k = Fixed.const(2 * math.pi * 440 / 48_000, 16)       # quantized here, when the design is elaborated
+    m.d.sync += self.o_y.eq((x * k).to(Q(4, 12)))         # rounded, and saturated, to the output's format
+
+Results are as wide as they need to be: a sum is one bit wider than its widest (aligned) operand, a product
+as wide as both operands together; nothing is dropped, or wraps, until `round`, `truncate`, `saturate` or
+`to` says so. Formats are Qm.n, m integer bits (including the sign bit, if signed) and n fraction bits.
+"""
+import math
+from amaranth import Cat, Const, Mux, signed, unsigned
+from amaranth.hdl import Shape, Value
+
+# Cyclone V variable precision DSP blocks; one multiplies up to 27 x 27 bits, or two 18 x 18
+DSP_WIDTHS = (18, 27)
+
+
+def dsp_blocks(a_width: int, b_width: int) -> int:
+    """The DSP blocks an a_width x b_width multiply maps onto; wider multiplies split into 18 bit limbs."""
+    if max(a_width, b_width) <= DSP_WIDTHS[1]:
+        return 1
+    return math.ceil(a_width / DSP_WIDTHS[0]) * math.ceil(b_width / DSP_WIDTHS[0])
+
+
+def saturate(value, width: int) -> Value:
+    """Clamps value (an integer) to the range of a signed integer of the given width."""
+    return Fixed(value).saturate(Q(width, 0, signed=True)).value
+
+
+class Q:
+    """A fixed-point format; Qm.n, m integer bits (including the sign bit, if signed) and n fraction bits.
+
+    Parameters
+    ----------
+    int_bits : int
+        The number of integer bits, m.
+    frac_bits : int
+        The number of fraction bits, n.
+    signed : bool
+        Whether values are two's complement.
+
+    """
+
+    def __init__(self, int_bits: int, frac_bits: int, signed: bool = False):
+        if int_bits + frac_bits < 1:
+            raise ValueError(f"Q{int_bits}.{frac_bits} has no bits")
+        self.int_bits = int_bits
+        self.frac_bits = frac_bits
+        self.signed = signed
+
+    @property
+    def width(self) -> int:
+        return self.int_bits + self.frac_bits
+
+    def shape(self) -> Shape:
+        return signed(self.width) if self.signed else unsigned(self.width)
+
+    @property
+    def min(self) -> int:
+        """The smallest raw (integer) value."""
+        return -(1 << (self.width - 1)) if self.signed else 0
+
+    @property
+    def max(self) -> int:
+        """The largest raw (integer) value."""
+        return (1 << (self.width - 1 if self.signed else self.width)) - 1
+
+    def quantize(self, x: float, saturate: bool = True) -> int:
+        """The raw value nearest x; out of range values saturate, or raise if not saturate."""
+        raw = math.floor(x * (1 << self.frac_bits) + 0.5)
+        if not self.min <= raw <= self.max:
+            if not saturate:
+                raise OverflowError(f"{x} is out of the range of {self}")
+            raw = min(max(raw, self.min), self.max)
+        return raw
+
+    def __eq__(self, other):
+        return isinstance(other, Q) and (self.int_bits, self.frac_bits, self.signed) == \
+            (other.int_bits, other.frac_bits, other.signed)
+
+    def __hash__(self):
+        return hash((self.int_bits, self.frac_bits, self.signed))
+
+    def __repr__(self):
+        return f"{'s' if self.signed else 'u'}Q{self.int_bits}.{self.frac_bits}"
+
+
+class Fixed:
+    """A fixed-point value; an Amaranth value (raw, two's complement if signed) with frac_bits fraction bits.
+
+    Parameters
+    ----------
+    value : Value
+        The raw value; its shape sets the format's width and signedness.
+    frac_bits : int
+        The number of fraction bits. May exceed the width, or be negative (for scaled integers).
+
+    """
+
+    def __init__(self, value, frac_bits: int = 0):
+        self.value = Value.cast(value)
+        self.frac_bits = frac_bits
+
+    @classmethod
+    def const(cls, x: float, frac_bits: int, signed: bool = None) -> "Fixed":
+        """x, rounded to frac_bits fraction bits, as a constant as narrow as it can be."""
+        raw = math.floor(x * (1 << frac_bits) + 0.5)
+        if raw < 0 if signed is None else signed:
+            shape = Shape((raw if raw >= 0 else -raw - 1).bit_length() + 1, signed=True)
+        elif raw < 0:
+            raise ValueError(f"{x} is negative; an unsigned constant can't hold it")
+        else:
+            shape = unsigned(max(raw.bit_length(), 1))
+        return cls(Const(raw, shape), frac_bits)
+
+    @property
+    def signed(self) -> bool:
+        return self.value.shape().signed
+
+    @property
+    def width(self) -> int:
+        return self.value.shape().width
+
+    @property
+    def format(self) -> Q:
+        return Q(self.width - self.frac_bits, self.frac_bits, self.signed)
+
+    def _cast(self, other) -> "Fixed":
+        if isinstance(other, Fixed):
+            return other
+        if isinstance(other, int):
+            return Fixed.const(other, 0)
+        if isinstance(other, float):
+            # Its precision is a design decision; quantizing it to the other operand's could round it to 0
+            raise TypeError(f"Cannot combine a fixed-point value with the float {other!r}; quantize it with "
+                            f"Fixed.const({other!r}, frac_bits)")
+        raise TypeError(f"Cannot combine a fixed-point value with {other!r}; wrap it in Fixed")
+
+    def _align(self, other) -> tuple[Value, Value, int]:
+        """Both raw values, shifted to the same (the larger) number of fraction bits."""
+        other = self._cast(other)
+        frac_bits = max(self.frac_bits, other.frac_bits)
+        return (self.value.shift_left(frac_bits - self.frac_bits), other.value.shift_left(frac_bits - other.frac_bits),
+                frac_bits)
+
+    def __add__(self, other) -> "Fixed":
+        a, b, frac_bits = self._align(other)
+        return Fixed(a + b, frac_bits)
+
+    __radd__ = __add__
+
+    def __sub__(self, other) -> "Fixed":
+        a, b, frac_bits = self._align(other)
+        return Fixed(a - b, frac_bits)
+
+    def __rsub__(self, other) -> "Fixed":
+        return self._cast(other) - self
+
+    def __neg__(self) -> "Fixed":
+        return Fixed(-self.value, self.frac_bits)
+
+    def __mul__(self, other) -> "Fixed":
+        """The exact product; fraction bits add up, as do widths. Operands of up to 18 (or 27) bits map
+        onto one DSP block (see `dsp_blocks`); quantize wider operands first, to keep it to one."""
+        other = self._cast(other)
+        return Fixed(self.value * other.value, self.frac_bits + other.frac_bits)
+
+    __rmul__ = __mul__
+
+    def __lshift__(self, n: int) -> "Fixed":
+        """Scaled by 2 ** n; only the binary point moves."""
+        return Fixed(self.value, self.frac_bits - n)
+
+    def __rshift__(self, n: int) -> "Fixed":
+        """Scaled by 2 ** -n; only the binary point moves."""
+        return Fixed(self.value, self.frac_bits + n)
+
+    def truncate(self, frac_bits: int) -> "Fixed":
+        """Down to frac_bits fraction bits, rounding toward -infinity."""
+        if frac_bits == self.frac_bits:
+            return self
+        if frac_bits > self.frac_bits:
+            return Fixed(self.value.shift_left(frac_bits - self.frac_bits), frac_bits)
+        return Fixed(self.value.shift_right(self.frac_bits - frac_bits), frac_bits)
+
+    def round(self, frac_bits: int) -> "Fixed":
+        """Down to frac_bits fraction bits, rounding to nearest (ties toward +infinity)."""
+        if frac_bits >= self.frac_bits:
+            return self.truncate(frac_bits)
+        shift = self.frac_bits - frac_bits
+        return Fixed((self.value + (1 << (shift - 1))).shift_right(shift), frac_bits)
+
+    def saturate(self, fmt: Q) -> "Fixed":
+        """Clamped to the range of fmt; the fraction bits must already match (see `round`, `truncate`)."""
+        if fmt.frac_bits != self.frac_bits:
+            raise ValueError(f"Cannot saturate {self.format} to {fmt}; round or truncate it to {fmt.frac_bits} "
+                             f"fraction bits first")
+        value = self.value
+        if self.format.max > fmt.max:
+            value = Mux(value > fmt.max, fmt.max, value)
+        if self.format.min < fmt.min:
+            value = Mux(value < fmt.min, fmt.min, value)
+        return Fixed(value, fmt.frac_bits)._wrap(fmt)
+
+    def _wrap(self, fmt: Q) -> "Fixed":
+        """The low bits of the raw value, as fmt; out of range values wrap."""
+        value = self.value
+        if self.width < fmt.width:
+            extension = value[-1] if self.signed else Const(0, 1)
+            value = Cat(value, extension.replicate(fmt.width - self.width))
+        raw = value[:fmt.width]
+        return Fixed(raw.as_signed() if fmt.signed else raw, fmt.frac_bits)
+
+    def to(self, fmt: Q, rounding: bool = True, saturate: bool = True) -> Value:
+        """The raw value in fmt, of fmt's shape; rounded (or truncated), then saturated (or wrapped)."""
+        x = self.round(fmt.frac_bits) if rounding else self.truncate(fmt.frac_bits)
+        return (x.saturate(fmt) if saturate else x._wrap(fmt)).value
+
+    def __repr__(self):
+        return f"(fixed {self.format} {self.value!r})"
@@ -1,74 +1,156 @@
-from amaranth import Elaboratable, Module, Signal
+from amaranth import ClockSignal, Elaboratable, Module, Signal
+from amaranth.lib.fifo import AsyncFIFO
 
 
 class I2CBus(Elaboratable):
-    """I2C audio bus controller.
+    """I2S audio bus transmitter.
+
+    (The Pocket's audio bus is I2S; the name is historical.)
+
+    Samples are produced in the synthesis (`sync`) domain, a frame of n_channels x output_width bits at a time,
+    and cross into the audio domain through an asynchronous FIFO. The audio domain's clock is the master
+    clock (MCLK); the serial clock (SCLK) is MCLK / mclk_div, and the word-select clock (LRCLK) toggles every
+    slot_width bits. Data is sent MSB first, changing on the falling edge of SCLK, one SCLK after LRCLK,
+    with left (channel 0) while LRCLK is low.
+
+    The synthesis core may write frames in bursts, whenever o_ready is high; frames written while the FIFO is
+    full are dropped, and counted in o_overruns. When a frame is due and the FIFO is empty, silence is sent,
+    and counted in o_underruns (in the audio domain).
 
     Parameters
     ----------
-    f_clk : int
-        The clock frequency.
-    f_dac_clk : int
-        The clock frequency of the DAC.
     output_width : int
         The width in bits of the audio output (per channel).
     n_channels : int
+        The number of channels per frame.
+    slot_width : int
+        The number of SCLK cycles per channel; samples are padded with zeros. Defaults to output_width.
+    mclk_div : int
+        The number of MCLK cycles per SCLK cycle; even.
+    fifo_depth : int
+        The number of frames the FIFO holds.
+    domain : str
+        The audio (MCLK) clock domain.
 
     """
 
     def __init__(self,
-                 f_clk: int = 480000,
-                 f_dac_clk: int = 480000 * 64,
                  output_width: int = 16,
                  n_channels: int = 2,
+                 slot_width: int = None,
+                 mclk_div: int = 4,
+                 fifo_depth: int = 16,
+                 domain: str = "audio",
                  ):
+        if mclk_div < 2 or mclk_div % 2:
+            raise ValueError(f"MCLK divider {mclk_div} must be even")
+
+        self.output_width = output_width
+        self.n_channels = n_channels
+        self.slot_width = slot_width or output_width
+        self.mclk_div = mclk_div
+        self.fifo_depth = fifo_depth
+        self.domain = domain
+
+        if self.slot_width < output_width:
+            raise ValueError(f"Slot width {self.slot_width} is narrower than the output width {output_width}")
+
+        self.i_audio = Signal(n_channels * output_width)    # frame; channel 0 in the low bits
+        self.i_valid = Signal()
+        self.o_ready = Signal()
+        self.o_overruns = Signal(16)
 
-        self.i_audio = Signal()                 # data output to speakers
         self.o_audio = Signal(name="aud_dac")   # data output to speakers (PCM)
         self.lrclk = Signal(name="aud_lrck")    # L/R / word-select clock
         self.mclk = Signal(name="aud_mclk")     # master clock
         self.sclk = Signal(name="aud_sclk")     # serial clock / bit clock
-
-        self.f_mclk = f_clk * 256
-        self.f_sclk = f_dac_clk
+        self.o_underruns = Signal(16)
 
     def elaborate(self, platform):
         m = Module()
 
+        audio = m.d[self.domain]
+        w = self.output_width
+        n_slot_bits = self.n_channels * self.slot_width
+
+        m.submodules.fifo = fifo = AsyncFIFO(
+            width=len(self.i_audio),
+            depth=self.fifo_depth,
+            r_domain=self.domain,
+            w_domain="sync",
+        )
+
+        # Synthesis side
+        m.d.comb += [
+            fifo.w_data.eq(self.i_audio),
+            fifo.w_en.eq(self.i_valid),
+            self.o_ready.eq(fifo.w_rdy),
+        ]
+        with m.If(self.i_valid & ~fifo.w_rdy):
+            m.d.sync += self.o_overruns.eq(self.o_overruns + 1)
+
         # Generate MCLK (Master Clock)
-        m.domains.sync += self.mclk.eq(1)
-        m.d.sync += self.mclk.eq(~self.mclk)
+        m.d.comb += self.mclk.eq(ClockSignal(self.domain))
 
         # Generate SCLK (Serial Clock)
-        sclk_counter = Signal(range(int(self.f_mclk / self.f_sclk)))
-        with m.If(sclk_counter == 0):
-            m.d.sync += sclk_counter.eq(sclk_counter.reset)
-            m.d.sync += self.sclk.eq(~self.sclk)
+        s_sclk_count = Signal(range(self.mclk_div // 2))
+        sclk_fall = Signal()
+        m.d.comb += sclk_fall.eq(self.sclk & (s_sclk_count == self.mclk_div // 2 - 1))
+        with m.If(s_sclk_count == self.mclk_div // 2 - 1):
+            audio += [
+                s_sclk_count.eq(0),
+                self.sclk.eq(~self.sclk),
+            ]
         with m.Else():
-            m.d.sync += sclk_counter.eq(sclk_counter + 1)
+            audio += s_sclk_count.eq(s_sclk_count + 1)
 
-        # Output data on the rising edge of SCLK
-        with m.If(self.sclk):
-            m.d.sync += self.o_audio.eq(self.aud_adc)
+        # Shift out on the falling edge of SCLK
+        s_bit = Signal(range(n_slot_bits))
+        s_shift = Signal(n_slot_bits)
 
-        lrclk_counter = Signal(range(2))
+        frame = Signal(n_slot_bits)
+        for c in range(self.n_channels):
+            # MSB first, so each channel's sample sits at the top of its slot
+            top = (self.n_channels - c) * self.slot_width
+            m.d.comb += frame[top - w:top].eq(fifo.r_data[c * w:(c + 1) * w])
 
-        # Left
-        with m.If(lrclk_counter == 0):
-            m.d.sync += lrclk_counter.eq(lrclk_counter + 1)
-            m.d.sync += self.lrclk.eq(0)
-        # Right
-        with m.Else():
-            m.d.sync += lrclk_counter.eq(lrclk_counter.reset)
-            m.d.sync += self.lrclk.eq(1)
+        with m.If(sclk_fall):
+            with m.If(s_bit == n_slot_bits - 1):
+                audio += s_bit.eq(0)
+                m.d.comb += fifo.r_en.eq(1)
+                with m.If(fifo.r_rdy):
+                    audio += s_shift.eq(frame)
+                with m.Else():
+                    audio += [
+                        s_shift.eq(0),
+                        self.o_underruns.eq(self.o_underruns + 1),
+                    ]
+            with m.Else():
+                audio += [
+                    s_bit.eq(s_bit + 1),
+                    s_shift.eq(s_shift << 1),
+                ]
+
+            # LRCLK leads the data by one bit
+            with m.If(s_bit == n_slot_bits - 2):
+                audio += self.lrclk.eq(0)
+            for c in range(1, self.n_channels):
+                with m.Elif(s_bit == c * self.slot_width - 2):
+                    audio += self.lrclk.eq(~self.lrclk)
+
+        m.d.comb += self.o_audio.eq(s_shift[-1])
 
         return m
 
     def ports(self):
         return [
             self.i_audio,
+            self.i_valid,
+            self.o_ready,
+            self.o_overruns,
             self.o_audio,
             self.lrclk,
             self.mclk,
             self.sclk,
+            self.o_underruns,
         ]
@@ -0,0 +1,42 @@
+import numpy as np
+
+
+class Slide:
+    """Reference model of :class:`devilfpga.modules.cv.Slide`.
+
+    One value per control-rate strobe; the recurrence runs sample by sample on Python integers.
+
+    Parameters
+    ----------
+    width : int
+        The width in bits of the tuning word.
+    shift : int
+        The glide time constant, as a power of two of strobes.
+
+    """
+
+    def __init__(self, width: int = 32, shift: int = 7):
+        self.width = width
+        self.shift = shift
+
+        self.s_inc = 0
+
+    def reset(self):
+        self.s_inc = 0
+
+    def process(self, target, slide) -> np.ndarray:
+        """o_inc after each strobe, for a block of targets; slide may be a scalar or a block."""
+        target = np.asarray(target, dtype=np.int64)
+        n = len(target)
+        slide = np.broadcast_to(np.asarray(slide, dtype=bool), (n,))
+
+        inc = self.s_inc
+        out = np.empty(n, dtype=np.int64)
+        for i, (t, s) in enumerate(zip(target.tolist(), slide.tolist())):
+            step = (t - inc) >> self.shift
+            inc = inc + step if s and step not in (0, -1) else t
+            out[i] = inc
+
+        self.s_inc = inc
+
+        return out
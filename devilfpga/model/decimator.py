@@ -0,0 +1,130 @@
+import math
+import numpy as np
+
+from ..modules.decimator import cic_compensator
+
+
+def wrap(x, width: int) -> np.ndarray:
+    """Wrap x to a signed integer of the given width."""
+    x = np.asarray(x, dtype=np.int64) & ((1 << width) - 1)
+    return x - ((x >> (width - 1)) << width)
+
+
+class CICDecimator:
+    """Reference model of :class:`devilfpga.modules.decimator.CICDecimator`.
+
+    Processes one value per input sample (per strobe), and returns one value per output sample,
+    without the pipeline delay.
+
+    Parameters
+    ----------
+    input_width : int
+        The width in bits of the (signed) input samples.
+    ratio : int
+        The decimation ratio.
+    stages : int
+        The number of integrator and comb stages.
+
+    """
+
+    def __init__(self, input_width: int, ratio: int, stages: int):
+        self.ratio = ratio
+        self.stages = stages
+        self.output_width = input_width + math.ceil(stages * math.log2(ratio))
+        self.reset()
+
+    def reset(self):
+        self.s_integrators = np.zeros(self.stages, dtype=np.int64)
+        self.s_combs = np.zeros(self.stages, dtype=np.int64)
+        self.s_count = 0
+
+    def process(self, x) -> np.ndarray:
+        x = np.asarray(x, dtype=np.int64)
+
+        # The integrators are registered; each sees the previous stage's value from the sample before
+        y = np.cumsum(x) + self.s_integrators[0]
+        for i in range(1, self.stages):
+            prev = np.concatenate([[self.s_integrators[i - 1]], y[:-1]])
+            self.s_integrators[i - 1] = y[-1]
+            y = np.cumsum(prev) + self.s_integrators[i]
+        self.s_integrators[-1] = y[-1]
+
+        # Decimate
+        first = self.ratio - 1 - self.s_count
+        self.s_count = (self.s_count + len(x)) % self.ratio
+        y = y[first::self.ratio]
+
+        # Combs
+        for i in range(self.stages):
+            delayed = np.concatenate([[self.s_combs[i]], y[:-1]])
+            if len(y):
+                self.s_combs[i] = y[-1]
+            y = y - delayed
+
+        return wrap(y, self.output_width)
+
+
+class FIR:
+    """Reference model of :class:`devilfpga.modules.decimator.FIR`.
+
+    Processes one value per input sample (per strobe), without the pipeline delay.
+
+    Parameters
+    ----------
+    width : int
+        The width in bits of the (signed) samples.
+    taps : list[int]
+        The coefficients, fixed point with coeff_frac fractional bits.
+    coeff_frac : int
+        The number of fractional bits of the coefficients.
+
+    """
+
+    def __init__(self, width: int, taps: list[int], coeff_frac: int = 14):
+        self.width = width
+        self.taps = np.asarray(taps, dtype=np.int64)
+        self.coeff_frac = coeff_frac
+        self.reset()
+
+    def reset(self):
+        self.s_delay_line = np.zeros(len(self.taps) - 1, dtype=np.int64)
+
+    def process(self, x) -> np.ndarray:
+        x = np.concatenate([self.s_delay_line, np.asarray(x, dtype=np.int64)])
+        self.s_delay_line = x[len(x) - len(self.s_delay_line):]
+
+        acc = np.convolve(x, self.taps, mode="valid")
+        y = (acc + (1 << (self.coeff_frac - 1))) >> self.coeff_frac
+        return np.clip(y, -(1 << (self.width - 1)), (1 << (self.width - 1)) - 1)
+
+
+class Decimator:
+    """Reference model of :class:`devilfpga.modules.decimator.Decimator`.
+
+    Parameters
+    ----------
+    width : int
+        The width in bits of the (signed) input and output samples.
+    ratio : int
+        The decimation ratio.
+    stages : int
+        The number of CIC stages.
+    n_taps : int
+        The number of taps of the compensating FIR.
+
+    """
+
+    def __init__(self, width: int = 16, ratio: int = 64, stages: int = 4, n_taps: int = 15):
+        self.width = width
+        coeff_frac = 14
+
+        self.cic = CICDecimator(width, ratio, stages)
+        self.fir = FIR(width, cic_compensator(stages, ratio, n_taps, coeff_frac=coeff_frac), coeff_frac)
+
+    def reset(self):
+        self.cic.reset()
+        self.fir.reset()
+
+    def process(self, x) -> np.ndarray:
+        """The output samples for a block of input samples."""
+        return self.fir.process(self.cic.process(x) >> (self.cic.output_width - self.width))
@@ -0,0 +1,52 @@
+import numpy as np
+
+
+class Envelope:
+    """Reference model of :class:`devilfpga.modules.envelope.Envelope`.
+
+    One value per control-rate strobe; the recurrence runs sample by sample on Python integers. A voice of
+    :class:`devilfpga.modules.envelope.EnvelopeBank` follows the same model, one value per sweep.
+
+    Parameters
+    ----------
+    width : int
+        The width in bits of the envelope.
+    decay : int
+        The decay time constant, as a power of two of strobes.
+    accent_shift : int
+        The peak without accent is 1 - 2 ** -accent_shift of full scale.
+
+    """
+
+    def __init__(self, width: int = 16, decay: int = 9, accent_shift: int = 2):
+        self.width = width
+        self.decay = decay
+        self.accent_shift = accent_shift
+
+        self.s_env = 0
+
+    def reset(self):
+        self.s_env = 0
+
+    def peak(self, accent: bool) -> int:
+        full = (1 << self.width) - 1
+        return full if accent else full - (full >> self.accent_shift)
+
+    def process(self, trigger, accent=False) -> np.ndarray:
+        """o_env after each strobe, for a block of triggers (since the last strobe); accent may be a scalar or a block."""
+        trigger = np.asarray(trigger, dtype=bool)
+        n = len(trigger)
+        accent = np.broadcast_to(np.asarray(accent, dtype=bool), (n,))
+
+        env = self.s_env
+        out = np.empty(n, dtype=np.int64)
+        for i, (t, a) in enumerate(zip(trigger.tolist(), accent.tolist())):
+            if t:
+                env = self.peak(a)
+            else:
+                env -= max(env >> self.decay, 1 if env else 0)
+            out[i] = env
+
+        self.s_env = env
+
+        return out
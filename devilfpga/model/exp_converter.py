@@ -0,0 +1,66 @@
+import numpy as np
+
+from ..modules.exp_converter import antilog_table
+from .pipeline import Delay
+
+
+class Antilog:
+    """Reference model of :class:`devilfpga.modules.exp_converter.Antilog`.
+
+    Parameters
+    ----------
+    width : int
+        The width in bits of the CV.
+    y_min : float
+        The output at CV = 0.
+    y_max : float
+        The output at CV = max.
+    output_width : int
+        The width in bits of o_y.
+    table_bits : int
+        The number of CV bits resolved by the table (2 ** table_bits entries).
+    mantissa_bits : int
+        The precision in bits of the table entries.
+
+    """
+
+    def __init__(self,
+                 width: int,
+                 y_min: float,
+                 y_max: float,
+                 output_width: int = 16,
+                 table_bits: int = 8,
+                 mantissa_bits: int = 16,
+                 ):
+        self.width = width
+        self.table_bits = table_bits
+        self.output_width = output_width
+
+        mantissas, deltas, octaves, self.shift = antilog_table(width, y_min, y_max, table_bits, mantissa_bits)
+        self.mantissas = np.array(mantissas, dtype=np.int64)
+        self.deltas = np.array(deltas, dtype=np.int64)
+        self.octaves = np.array(octaves, dtype=np.int64)
+
+        # The table is read at address 0 (CV = 0) from the first cycle, so y_min comes out a cycle before the first CV
+        latency = 3
+        self.delay = Delay(latency, [0] * (latency - 1) + [int(self.convert(0))])
+
+    def reset(self):
+        self.delay.reset()
+
+    def convert(self, cv) -> np.ndarray:
+        """o_y for each CV, without the pipeline delay."""
+        cv = np.asarray(cv, dtype=np.int64)
+        residual_bits = self.width - self.table_bits
+
+        j = cv >> residual_bits
+        residual = cv & ((1 << residual_bits) - 1)
+        mantissa = self.mantissas[j] + ((self.deltas[j] * residual) >> residual_bits)
+
+        rounding = 1 << (self.shift - 1) if self.shift else 0
+        y = ((mantissa << self.octaves[j]) + rounding) >> self.shift
+        return y & ((1 << self.output_width) - 1)
+
+    def process(self, cv) -> np.ndarray:
+        """o_y for a block of CV values, one per clock cycle."""
+        return self.delay.process(self.convert(cv))
@@ -0,0 +1,139 @@
+import math
+import numpy as np
+
+from ..oscillators.lut import generate_lut
+from .pipeline import Delay
+
+
+class PhaseAccumulator:
+    """Reference model of :class:`devilfpga.oscillators.phase_accumulator.PhaseAccumulator`.
+
+    Processes whole blocks of samples at once; the accumulator state is kept between calls so
+    consecutive blocks form one continuous stream. One sample corresponds to one clock edge of the HDL.
+
+    Parameters
+    ----------
+    f_clk : int
+        The clock frequency.
+    output_width : int
+        The width in bits of the phase output (the top bits of the accumulator).
+
+    """
+
+    def __init__(self, f_clk: int, output_width: int):
+        self.f_clk = f_clk
+        self.output_width = output_width
+        self.phase_acc_width = 32
+
+        self.s_phase_acc = 0
+
+    def reset(self):
+        self.s_phase_acc = 0
+
+    def increment(self, f_target):
+        """The tuning word (o_inc) for each target frequency; inc = (Ft * 2 ** d) // Fc."""
+        f = np.asarray(f_target, dtype=np.uint64)
+        mask = np.uint64((1 << self.phase_acc_width) - 1)
+        return ((f << np.uint64(self.phase_acc_width)) // np.uint64(self.f_clk)) & mask
+
+    def process(self, inc) -> np.ndarray:
+        """The phase output (o_i) for a block of tuning words, one per clock cycle."""
+        inc = np.asarray(inc, dtype=np.uint64)
+        mask = np.uint64((1 << self.phase_acc_width) - 1)
+
+        # uint64 arithmetic wraps modulo 2 ** 64, which preserves the value modulo 2 ** 32
+        acc = np.cumsum(inc, dtype=np.uint64)
+        acc -= inc
+        acc += np.uint64(self.s_phase_acc)
+        acc &= mask
+
+        if len(inc):
+            self.s_phase_acc = int((acc[-1] + inc[-1]) & mask)
+
+        return acc >> np.uint64(self.phase_acc_width - self.output_width)
+
+
+class Oscillator:
+    """Reference model of :class:`devilfpga.oscillators.oscillator.Oscillator`.
+
+    The target frequency is registered once before it reaches the phase accumulator, so the model
+    delays it by one sample. The phase indexes the waveform LUT, and the looked up sample (o_a)
+    lags the phase (o_i) by the read pipeline's latency.
+
+    Parameters
+    ----------
+    f_clk : int
+        The clock frequency.
+    lut_width : int
+        The width in bits of the waveform LUT elements.
+    lut_depth : int
+        The word count (# of storage elements) of the waveform LUT.
+    lut_generator : Function(i: int | np.ndarray, width: int, depth: int)
+        A function that will generate the values of the waveform LUT.
+    interpolation_bits : int
+        The number of phase bits used to interpolate between the stored entries; 0 stores the full table.
+    mode : str
+        "divide" takes target frequencies; "increment" takes the tuning words themselves.
+
+    """
+
+    def __init__(self,
+                 f_clk: int,
+                 lut_width: int,
+                 lut_depth: int,
+                 lut_generator,
+                 interpolation_bits: int = 0,
+                 mode: str = "divide",
+                 ):
+        self.f_clk = f_clk
+        self.mode = mode
+        self.lut_width = lut_width
+        self.memory_addr_width = math.ceil(math.log2(lut_depth))
+        self.interpolation_bits = interpolation_bits
+        self.latency = 3 if interpolation_bits else 2
+
+        self.phase_acc = PhaseAccumulator(f_clk, self.memory_addr_width)
+
+        # Memory truncates its initial values to the element width
+        self.lut = generate_lut(lut_generator, lut_width, lut_depth) & ((1 << lut_width) - 1)
+
+        self.s_f_target = 0
+        self.delay = Delay(self.latency)
+
+    def reset(self):
+        self.phase_acc.reset()
+        self.s_f_target = 0
+        self.delay.reset()
+
+    def lookup(self, phase: np.ndarray) -> np.ndarray:
+        """The sample for each phase, read from the (possibly interpolated) LUT."""
+        k = self.interpolation_bits
+        if not k:
+            return self.lut[phase]
+
+        coarse = self.lut[::1 << k]
+        delta = np.roll(coarse, -1) - coarse
+        j = phase >> k
+        frac = phase & ((1 << k) - 1)
+        return (coarse[j] + ((delta[j] * frac) >> k)) & ((1 << self.lut_width) - 1)
+
+    def process(self, f_target) -> tuple[np.ndarray, np.ndarray]:
+        """The (o_i, o_a) outputs for a block of target frequencies (or tuning words), one per clock cycle."""
+        f_target = np.asarray(f_target, dtype=np.uint64)
+        if not len(f_target):
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+
+        f = np.empty_like(f_target)
+        f[0] = self.s_f_target
+        f[1:] = f_target[:-1]
+        self.s_f_target = int(f_target[-1])
+
+        inc = f if self.mode == "increment" else self.phase_acc.increment(f)
+        phase = self.phase_acc.process(inc).astype(np.int64)
+
+        o_i = phase & ((1 << self.lut_width) - 1)
+
+        o_a = self.delay.process(self.lookup(phase))
+
+        return o_i, o_a
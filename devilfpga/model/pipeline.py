@@ -0,0 +1,28 @@
+import numpy as np
+
+
+class Delay:
+    """Delays a stream of samples by a fixed number of samples, across blocks; models a register pipeline.
+
+    Parameters
+    ----------
+    latency : int
+        The number of samples (pipeline stages) to delay by.
+    init : list[int]
+        The first `latency` outputs, i.e. the pipeline's contents at reset; zeros by default.
+
+    """
+
+    def __init__(self, latency: int, init=None):
+        self.latency = latency
+        self.init = np.zeros(latency, dtype=np.int64) if init is None else np.asarray(init, dtype=np.int64)
+
+        self.s_pipeline = self.init.copy()
+
+    def reset(self):
+        self.s_pipeline = self.init.copy()
+
+    def process(self, x) -> np.ndarray:
+        pipeline = np.concatenate([self.s_pipeline, np.asarray(x, dtype=np.int64)])
+        self.s_pipeline = pipeline[len(pipeline) - self.latency:]
+        return pipeline[:len(pipeline) - self.latency]
@@ -0,0 +1,37 @@
+import numpy as np
+
+
+class VCA:
+    """Reference model of :class:`devilfpga.modules.vca.VCA`; scales signed audio by an unsigned gain.
+
+        y = sat((x * gain) >> gain_frac_bits)
+
+    Processes one value per audio sample (per strobe), without the pipeline delay.
+
+    Parameters
+    ----------
+    width : int
+        The width in bits of the (signed) audio samples.
+    gain_frac_bits : int
+        The number of fractional bits of the gain.
+    saturate : bool
+        Whether to saturate the result, rather than let it wrap.
+
+    """
+
+    def __init__(self, width: int = 16, gain_frac_bits: int = 16, saturate: bool = True):
+        self.width = width
+        self.gain_frac_bits = gain_frac_bits
+        self.saturate = saturate
+
+    def process(self, audio, gain) -> np.ndarray:
+        audio = np.asarray(audio, dtype=np.int64)
+        gain = np.asarray(gain, dtype=np.int64)
+        y = (audio * gain) >> self.gain_frac_bits
+
+        if self.saturate:
+            return np.clip(y, -(1 << (self.width - 1)), (1 << (self.width - 1)) - 1)
+
+        # Wrap to the signed width
+        y &= (1 << self.width) - 1
+        return y - ((y >> (self.width - 1)) << self.width)
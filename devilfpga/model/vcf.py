@@ -0,0 +1,82 @@
+import numpy as np
+
+
+def saturate(x: int, width: int) -> int:
+    """Clamp x to the range of a signed integer of the given width."""
+    hi = (1 << (width - 1)) - 1
+    lo = -(1 << (width - 1))
+    return min(max(x, lo), hi)
+
+
+class LadderFilter:
+    """Reference model of :class:`devilfpga.modules.vcf.LadderFilter`; a 4-pole (24 dB/oct) resonant low-pass.
+
+    Fixed-point, signed datapath. Per sample,
+
+        u   = sat(x - (k * y3) >> 14)
+        yn  = sat(yn + (g * (y(n-1) - yn)) >> 16),  y(-1) = u, n = 0..3
+
+    where g (the cutoff) is an unsigned Q0.16 and k (the resonance) is an unsigned Q2.14.
+    The poles are updated in order, each one seeing the already updated output of the previous pole.
+    Shifts are arithmetic (rounding toward negative infinity), as in the HDL.
+
+    The recurrence cannot be vectorized over time (each step saturates and truncates, so it isn't a linear
+    filter), but it can across voices: a 2-D block (samples x voices) is processed one sample at a time,
+    every voice (column) at once. A 1-D block (one voice) is processed on Python integers.
+
+    Parameters
+    ----------
+    width : int
+        The width in bits of the (signed) audio samples and filter state.
+
+    """
+
+    def __init__(self, width: int = 16):
+        self.width = width
+
+        self.s_y = [0, 0, 0, 0]
+
+    def reset(self):
+        self.s_y = [0, 0, 0, 0]
+
+    @staticmethod
+    def step(x, g, k, y: list, clip) -> list:
+        """One sample of the recurrence; the updated poles, given the input, the coefficients and the poles."""
+        u = clip(x - ((k * y[3]) >> 14))
+        y0 = clip(y[0] + ((g * (u - y[0])) >> 16))
+        y1 = clip(y[1] + ((g * (y0 - y[1])) >> 16))
+        y2 = clip(y[2] + ((g * (y1 - y[2])) >> 16))
+        y3 = clip(y[3] + ((g * (y2 - y[3])) >> 16))
+        return [y0, y1, y2, y3]
+
+    def process(self, audio, cutoff, resonance) -> np.ndarray:
+        """The filtered output for a block of samples, or of samples x voices; cutoff and resonance may be
+        scalars, per-voice rows, or blocks."""
+        audio = np.asarray(audio, dtype=np.int64)
+        cutoff = np.broadcast_to(np.asarray(cutoff, dtype=np.int64), audio.shape)
+        resonance = np.broadcast_to(np.asarray(resonance, dtype=np.int64), audio.shape)
+        out = np.empty_like(audio)
+
+        width = self.width
+        y = self.s_y
+        if audio.ndim == 1:
+            def clip(x):
+                return saturate(x, width)
+
+            for i, (x, g, k) in enumerate(zip(audio.tolist(), cutoff.tolist(), resonance.tolist())):
+                y = self.step(x, g, k, y, clip)
+                out[i] = y[3]
+        else:
+            lo, hi = -(1 << (width - 1)), (1 << (width - 1)) - 1
+
+            def clip(x):
+                return np.minimum(np.maximum(x, lo, out=x), hi, out=x)
+
+            y = [np.broadcast_to(np.asarray(pole, dtype=np.int64), audio.shape[1:]).copy() for pole in y]
+            for i in range(len(audio)):
+                y = self.step(audio[i], cutoff[i], resonance[i], y, clip)
+                out[i] = y[3]
+
+        self.s_y = y
+
+        return out
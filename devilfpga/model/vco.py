@@ -0,0 +1,51 @@
+import numpy as np
+
+from ..modules.vco import F_C1, F_E5
+from ..oscillators.saw_oscillator import saw
+from .exp_converter import Antilog
+from .oscillator import Oscillator
+
+
+class VCO:
+    """Reference model of :class:`devilfpga.modules.vco.VCO`.
+
+    Parameters
+    ----------
+    width : int
+        The width in bits of the CV.
+    f_clk : int
+        The clock frequency.
+    lut_width : int
+        The width in bits of the waveform LUT elements.
+    lut_depth : int
+        The word count (# of storage elements) of the waveform LUT.
+    mode : str
+        How the pitch is given; "cv", or "increment" (tuning words).
+
+    """
+
+    def __init__(self,
+                 width: int,
+                 f_clk: int = 100_000_000,
+                 lut_width: int = 8,
+                 lut_depth: int = 2 ** 11,
+                 mode: str = "cv",
+                 ):
+        self.width = width
+        self.lut_width = lut_width
+
+        self.antilog = Antilog(width, F_C1, F_E5) if mode == "cv" else None
+        self.nco_saw = Oscillator(f_clk, lut_width, lut_depth, saw, mode="divide" if mode == "cv" else "increment")
+
+    def reset(self):
+        if self.antilog is not None:
+            self.antilog.reset()
+        self.nco_saw.reset()
+
+    def process(self, cv, waveform=0) -> np.ndarray:
+        """The waveform output (o_a) for a block of CV values (or tuning words), one per clock cycle; waveform
+        may be a scalar or a block (0 = saw, 1 = square)."""
+        _, o_a = self.nco_saw.process(cv if self.antilog is None else self.antilog.process(cv))
+        # The square; the saw through a comparator at half scale
+        square = np.where(o_a >> (self.lut_width - 1), (1 << self.lut_width) - 1, 0)
+        return np.where(np.asarray(waveform, dtype=bool), square, o_a)
@@ -0,0 +1,63 @@
+import numpy as np
+
+from .vca import VCA
+from .vcf import LadderFilter
+from .vco import VCO
+
+
+class Voice:
+    """Reference model of a full voice; VCO -> VCF -> VCA.
+
+    Every stage advances once per sample, at f_sample. The unsigned VCO output is centred and
+    scaled up to the signed audio width before it enters the filter.
+
+    Parameters
+    ----------
+    f_sample : int
+        The sample rate at which the voice is rendered.
+    cv_width : int
+        The width in bits of the pitch CV.
+    audio_width : int
+        The width in bits of the (signed) audio samples.
+    lut_width : int
+        The width in bits of the waveform LUT elements.
+    lut_depth : int
+        The word count (# of storage elements) of the waveform LUT.
+    voices : int
+        The number of voices processed together; with more than one, blocks are samples x voices, and the
+        filter (the one stage stepped sample by sample) runs every voice at once.
+
+    """
+
+    def __init__(self,
+                 f_sample: int = 48_000,
+                 cv_width: int = 16,
+                 audio_width: int = 16,
+                 lut_width: int = 8,
+                 lut_depth: int = 2 ** 11,
+                 voices: int = 1,
+                 ):
+        self.f_sample = f_sample
+        self.audio_width = audio_width
+        self.lut_width = lut_width
+
+        self.vcos = [VCO(cv_width, f_sample, lut_width, lut_depth) for _ in range(voices)]
+        self.vcf = LadderFilter(audio_width)
+        self.vca = VCA(audio_width)
+
+    def reset(self):
+        for vco in self.vcos:
+            vco.reset()
+        self.vcf.reset()
+
+    def process(self, cv, cutoff, resonance, gain) -> np.ndarray:
+        """The audio output for a block of pitch CVs (samples x voices, for several voices); the other controls
+        may be scalars, per-voice rows, or blocks."""
+        cv = np.asarray(cv, dtype=np.int64)
+        if cv.ndim == 1:
+            a = self.vcos[0].process(cv)
+        else:
+            a = np.stack([vco.process(cv[:, j]) for j, vco in enumerate(self.vcos)], axis=1)
+        audio = (a - (1 << (self.lut_width - 1))) << (self.audio_width - self.lut_width)
+        audio = self.vcf.process(audio, cutoff, resonance)
+        return self.vca.process(audio, gain)
@@ -0,0 +1,130 @@
+import math
+from dataclasses import dataclass
+from amaranth import Elaboratable, Module, Signal
+from amaranth.lib.memory import Memory
+
+# The clock domain of the APF bridge (clk_74a)
+BRIDGE_DOMAIN = "bridge"
+
+
+@dataclass(frozen=True)
+class DataSlot:
+    """A data slot (see open-fpga/data.json); a file the Pocket streams over the bridge at boot.
+
+    The slot occupies the bridge addresses [address, address + size); each 32-bit word of the file (big endian,
+    as the bridge sends it) holds one table entry, LSB aligned. See `devilfpga.slots` for the packer.
+
+    Parameters
+    ----------
+    name : str
+        The name of the slot, as shown by the Pocket.
+    id : int
+        The slot's id.
+    address : int
+        The bridge address the slot is loaded at; a multiple of size.
+    filename : str
+        The file loaded into the slot.
+    size : int
+        The size in bytes of the slot's window of bridge addresses; a power of 2.
+
+    """
+
+    name: str
+    id: int
+    address: int
+    filename: str
+    size: int = 1 << 16
+
+    def __post_init__(self):
+        if self.size & (self.size - 1) or self.address % self.size:
+            raise ValueError(f"Slot {self.name} at {self.address:#x} is not aligned to its size ({self.size:#x})")
+
+    def definition(self, depth: int) -> dict:
+        """The slot's entry in data.json, for a table of depth entries."""
+        return {
+            "name": self.name,
+            "id": self.id,
+            "required": True,
+            "parameters": 0,
+            "filename": self.filename,
+            "extensions": ["bin"],
+            "size_exact": 4 * depth,
+            "address": f"0x{self.address:08X}",
+        }
+
+
+class SlotWriter(Elaboratable):
+    """Writes a data slot into a table (memory) as the bridge streams it in.
+
+    Decodes the bridge writes to the slot's addresses, and writes each word's entry through a write port of
+    the memory, in the bridge domain; the table's other ports read it in their own. The memory's initial
+    contents are those until the slot is loaded.
+
+    Parameters
+    ----------
+    slot : DataSlot
+        The slot.
+    memory : Memory
+        The table; not yet elaborated.
+
+    """
+
+    def __init__(self, slot: DataSlot, memory: Memory):
+        if 4 * memory.depth > slot.size:
+            raise ValueError(f"A table of {memory.depth} entries does not fit slot {slot.name} ({slot.size} bytes)")
+
+        self.slot = slot
+
+        self.i_addr = Signal(32)
+        self.i_wr = Signal()
+        self.i_wr_data = Signal(32)
+
+        self._depth = memory.depth
+        self._port = memory.write_port(domain=BRIDGE_DOMAIN)
+
+    def elaborate(self, _) -> Module:
+        m = Module()
+
+        bits = int(math.log2(self.slot.size))
+        index = self.i_addr[2:bits]
+        hit = (self.i_addr[bits:] == self.slot.address >> bits) & (index < self._depth)
+
+        m.d.comb += [
+            self._port.addr.eq(index),
+            self._port.data.eq(self.i_wr_data),
+            self._port.en.eq(self.i_wr & hit),
+        ]
+
+        return m
+
+    def ports(self):
+        return [
+            self.i_addr,
+            self.i_wr,
+            self.i_wr_data,
+        ]
+
+
+def add_table(m: Module, name: str, memory: Memory, slot: DataSlot | None, owner) -> Memory:
+    """Adds memory to m as name; if slot is given, loaded from it over owner's bridge signals.
+
+    owner has the bridge signals i_bridge_addr, i_bridge_wr and i_bridge_wr_data.
+    """
+    m.submodules[name] = memory
+    if slot is not None:
+        m.submodules[f"{name}_writer"] = writer = SlotWriter(slot, memory)
+        m.d.comb += [
+            writer.i_addr.eq(owner.i_bridge_addr),
+            writer.i_wr.eq(owner.i_bridge_wr),
+            writer.i_wr_data.eq(owner.i_bridge_wr_data),
+        ]
+    return memory
+
+
+def connect(child, parent) -> list:
+    """Forwards parent's bridge signals to child."""
+    return [
+        child.i_bridge_addr.eq(parent.i_bridge_addr),
+        child.i_bridge_wr.eq(parent.i_bridge_wr),
+        child.i_bridge_wr_data.eq(parent.i_bridge_wr_data),
+    ]
@@ -1,4 +1,13 @@
-from amaranth import Elaboratable, Module, Signal
+import math
+from amaranth import Elaboratable, Module, Signal, signed, unsigned
+from amaranth.lib.memory import Memory
+
+from ..fixed import Fixed, Q
+from .vco import F_C1
+
+# The note values of C1 and E5 (see `NoteWord`); the lowest and highest pitches, the span of the `VCO`'s antilog
+NOTE_C1 = 11
+NOTE_E5 = 63
 
 
 class NoteWord(Elaboratable):
@@ -8,7 +17,7 @@ class NoteWord(Elaboratable):
     Is this necessary here? No. But we have LUTs so we're doing it anyway.
 
     A1  = 8  (lowest*)  0V
-    C1  = 14
+    C1  = 11
     C2  = 23 (middle C)
     C3  = 35
     C4  = 47
@@ -18,12 +27,19 @@ class NoteWord(Elaboratable):
 
     *Apparently the voltage pins this low, until C1
 
+    The keys are priority encoded (the lowest wins, should several be held) and offset by the octave's first
+    note; shifts and adds, no multipliers. o_note is registered.
+
+    i_slide is carried for the sequencer's sake; the glide itself is applied to the tuning word (see `Slide`).
+
     Parameters
     ----------
+    width : int
+        The width in bits of the note value.
 
     """
 
-    def __init__(self, width: int):
+    def __init__(self, width: int = 6):
         self.i_slide = Signal()
         self.i_octave = Signal(3)  # 0-4
 
@@ -40,43 +56,113 @@ class NoteWord(Elaboratable):
         self.i_note_g = Signal()
         self.i_note_g_s = Signal()  # 11
 
-        self.o_note = Signal(6)
+        self.o_note = Signal(width)
+
+        self.width = width
+
+    def keys(self) -> list[Signal]:
+        return [
+            self.i_note_a,
+            self.i_note_a_s,
+            self.i_note_b,
+            self.i_note_c,
+            self.i_note_c_s,
+            self.i_note_d,
+            self.i_note_d_s,
+            self.i_note_e,
+            self.i_note_f,
+            self.i_note_f_s,
+            self.i_note_g,
+            self.i_note_g_s,
+        ]
+
+    def note(self, m: Module) -> Signal:
+        """The (combinational) note value of the held key; the key's index (0-11), + (octave + 1) * 12 - 4."""
+        key = Signal(range(12))
+        # Later assignments win; the lowest key takes priority
+        for i, pressed in reversed(list(enumerate(self.keys()))):
+            with m.If(pressed):
+                m.d.comb += key.eq(i)
+
+        # (octave + 1) * 12 - 4, as shifts and adds
+        note = Signal(self.width)
+        m.d.comb += note.eq((self.i_octave << 3) + (self.i_octave << 2) + 8 + key)
+        return note
 
     def elaborate(self, _) -> Module:
         m = Module()
 
-        # Only one note will be high at a time
-        #  the output will be the note's value from 0-11, + (octave + 1) * 12 - 4
-        m.d.sync += self.o_note.eq(
-            self.i_note_a * 0 +
-            self.i_note_a_s * 1 +
-            self.i_note_b * 2 +
-            self.i_note_c * 3 +
-            self.i_note_c_s * 4 +
-            self.i_note_d * 5 +
-            self.i_note_d_s * 6 +
-            self.i_note_e * 7 +
-            self.i_note_f * 8 +
-            self.i_note_f_s * 9 +
-            self.i_note_g * 10 +
-            self.i_note_g_s * 11 +
-            (self.i_octave + 1) * 12 - 4
-        )
+        m.d.sync += self.o_note.eq(self.note(m))
 
         return m
 
     def ports(self):
         return [
-            self.i_note_0,
-            self.i_note_1,
-            self.i_note_2,
-            self.i_note_3,
-            self.i_note_4,
-            self.i_note_5,
-            self.i_note_6,
-            self.i_note_7,
-            self.i_accent,
+            self.i_octave,
+            *self.keys(),
             self.i_slide,
+            self.o_note,
+        ]
+
+
+def tuning_words(f_clk: int, width: int = 32, note_width: int = 6) -> list[int]:
+    """The phase increment (tuning word) of each note value, for a phase accumulator advancing at f_clk.
+
+    Equal temperament, from C1 (130.81 Hz, as the `VCO`'s antilog maps CV = 0); the notes below C1 pin to it.
+    """
+    def frequency(note: int) -> float:
+        return F_C1 * 2 ** (max(note - NOTE_C1, 0) / 12)
+
+    return [round(frequency(note) * (1 << width) / f_clk) for note in range(1 << note_width)]
+
+
+class TuningWord(NoteWord):
+    """TuningWord
+
+    The fast path from the keyboard to the oscillator: the `NoteWord` note indexes a ROM of precomputed
+    tuning words (see `tuning_words`), bypassing the DAC, the antilog and the phase accumulator's divide.
+    o_inc follows the keys by one cycle, with no multipliers; feed it to `Slide`, or straight to the i_inc
+    of a phase accumulator (or `VCO`) in "increment" mode, as `Core` does through `Slide`.
+
+    The ROM is generated when the module is elaborated.
+
+    Parameters
+    ----------
+    f_clk : int
+        The clock frequency, or the strobe rate, the phase accumulator advances at.
+    inc_width : int
+        The width in bits of the tuning word; `width` remains that of the note value, as in `NoteWord`.
+
+    """
+
+    def __init__(self, f_clk: int, inc_width: int = 32):
+        super().__init__()
+
+        self.f_clk = f_clk
+        self.inc_width = inc_width
+
+        self.o_inc = Signal(inc_width)
+
+    def elaborate(self, _) -> Module:
+        m = Module()
+
+        note = self.note(m)
+        m.d.sync += self.o_note.eq(note)
+
+        m.submodules.rom = rom = Memory(shape=unsigned(self.inc_width), depth=1 << self.width,
+                                        init=tuning_words(self.f_clk, self.inc_width, self.width))
+        rd = rom.read_port()
+        m.d.comb += [
+            rd.addr.eq(note),
+            self.o_inc.eq(rd.data),
+        ]
+
+        return m
+
+    def ports(self):
+        return [
+            *super().ports(),
+            self.o_inc,
         ]
 
 
@@ -84,34 +170,44 @@ class DAC(Elaboratable):
     """CV
 
     The TB-303 takes a 6-bit output from its microcontroller (whose bits are somewhat erroneously named 'note #'), and through
-    a resistor ladder DAC, converts it to a value between 0 and 3V. 
+    a resistor ladder DAC, converts it to a value between 0 and 3V.
+
+    C1 (`NOTE_C1`) is 0, E5 (`NOTE_E5`) is max, linear in between; lower notes pin to 0. The scale is a
+    fixed-point constant (see `devilfpga.fixed`), with `frac_bits` fraction bits; the CV is rounded to the
+    nearest step, and saturates at both ends.
 
-    # TODO(antoniae): confirm range is 0-max
-    # TODO(antoniae): slide
+    Slide isn't applied to the CV; it glides between tuning words, downstream (see `Slide`).
+
+    The CV only updates on cycles i_strobe is high (by default, every cycle); drive it with the control-rate strobe.
 
     Parameters
     ----------
+    width : int
+        The width in bits of the CV.
 
     """
 
     def __init__(self, width: int):
         self.i_slide = Signal()
+        self.i_strobe = Signal(init=1)
         self.i_note = Signal(6)
 
         self.o_cv = Signal(width)
 
         self.width = width
+        # Enough that the rounding error, over the 52 semitones, stays below half a step
+        self.frac_bits = 12
 
     def elaborate(self, _) -> Module:
         m = Module()
 
-        # C1 = note 14 = 0V
+        # C1 = note 11 = 0V
         # E5 = note 63 = 3V (max)
-        ceil = 2 ** self.width - 1
-        a = ceil / 49
-        b = -ceil / (49 * 14)
+        step = Fixed.const((1 << self.width) / (NOTE_E5 - NOTE_C1), self.frac_bits)
+        cv = (Fixed(self.i_note) - NOTE_C1) * step
 
-        m.d.sync += self.o_cv.eq(self.i_note * a + b)
+        with m.If(self.i_strobe):
+            m.d.sync += self.o_cv.eq(cv.to(Q(self.width, 0)))
 
         return m
 
@@ -119,5 +215,69 @@ class DAC(Elaboratable):
         return [
             self.i_note,
             self.i_slide,
+            self.i_strobe,
             self.o_cv,
         ]
+
+
+def slide_shift(t_slide: float, f_control: int) -> int:
+    """The `Slide` shift whose time constant (2 ** shift control ticks) is closest to t_slide seconds."""
+    return max(round(math.log2(t_slide * f_control)), 0)
+
+
+class Slide(Elaboratable):
+    """Slide
+
+    The TB-303's slide (glide), applied directly to the phase increment (tuning word). While i_slide is high,
+    on every control-rate i_strobe the output moves a fixed fraction of the way toward the target,
+
+        inc += (target - inc) >> shift
+
+    a one-pole (exponential) glide with a time constant of 2 ** shift strobes; only an add and a shift,
+    no multiplier. Once a step would round to nothing, the output snaps to the target.
+    Without i_slide, the output jumps to the target on the next strobe.
+
+    Parameters
+    ----------
+    width : int
+        The width in bits of the tuning word.
+    shift : int
+        The glide time constant, as a power of two of strobes (see `slide_shift`).
+
+    """
+
+    def __init__(self, width: int = 32, shift: int = 7):
+        self.width = width
+        self.shift = shift
+
+        self.i_target = Signal(width)
+        self.i_slide = Signal()
+        self.i_strobe = Signal(init=1)
+
+        self.o_inc = Signal(width)
+
+    def elaborate(self, _) -> Module:
+        m = Module()
+
+        delta = Signal(signed(self.width + 1))
+        step = Signal(signed(self.width + 1 - self.shift))
+        m.d.comb += [
+            delta.eq(self.i_target - self.o_inc),
+            step.eq(delta >> self.shift),
+        ]
+
+        with m.If(self.i_strobe):
+            with m.If(self.i_slide & (step != 0) & (step != -1)):
+                m.d.sync += self.o_inc.eq(self.o_inc + step)
+            with m.Else():
+                m.d.sync += self.o_inc.eq(self.i_target)
+
+        return m
+
+    def ports(self):
+        return [
+            self.i_target,
+            self.i_slide,
+            self.i_strobe,
+            self.o_inc,
+        ]
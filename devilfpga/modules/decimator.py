@@ -0,0 +1,280 @@
+import math
+import numpy as np
+from amaranth import Array, Cat, Const, Elaboratable, Module, Mux, Signal, signed
+
+from ..fixed import saturate
+
+
+def cic_compensator(stages: int, ratio: int, n_taps: int, passband: float = 0.4, coeff_frac: int = 14) -> list[int]:
+    """Taps of a FIR that flattens the passband droop of a CIC decimator, quantized to coeff_frac bits.
+
+    Designed by frequency sampling: the inverse of the CIC's response up to `passband` (as a fraction of
+    the output rate), zero above it, windowed (Hamming) and normalized to unity gain at DC.
+    """
+    n_fft = 512
+    f = np.arange(n_fft // 2 + 1) / n_fft
+    x = np.pi * np.maximum(f, 1e-9)
+    droop = np.abs(np.sin(x) / (ratio * np.sin(x / ratio))) ** stages
+    desired = np.where(f <= passband, 1 / droop, 0.0)
+
+    h = np.fft.irfft(desired, n_fft)
+    h = np.roll(h, n_taps // 2)[:n_taps] * np.hamming(n_taps)
+    h /= h.sum()
+
+    return [int(x) for x in np.round(h * (1 << coeff_frac))]
+
+
+class CICDecimator(Elaboratable):
+    """A cascaded integrator-comb (CIC) decimator.
+
+    Multiplier-free: `stages` integrators run at the input rate (every i_strobe), and `stages` combs at the
+    output rate, one every `ratio` inputs. The register width grows by stages * log2(ratio) bits so the
+    wrapping integrators are exact; the DC gain is `gain` = ratio ** stages. The combs are pipelined one stage
+    per cycle, so o_data holds the new sample, and o_stb pulses, stages + 1 cycles after the decimating input.
+
+    Parameters
+    ----------
+    input_width : int
+        The width in bits of the (signed) input samples.
+    ratio : int
+        The decimation ratio.
+    stages : int
+        The number of integrator and comb stages.
+
+    """
+
+    def __init__(self, input_width: int, ratio: int, stages: int):
+        self.input_width = input_width
+        self.ratio = ratio
+        self.stages = stages
+        self.gain = ratio ** stages
+        self.output_width = input_width + math.ceil(stages * math.log2(ratio))
+
+        self.i_data = Signal(signed(input_width))
+        self.i_strobe = Signal(init=1)
+
+        self.o_data = Signal(signed(self.output_width))
+        self.o_stb = Signal()
+
+    def elaborate(self, _) -> Module:
+        m = Module()
+
+        w = self.output_width
+
+        # Integrators
+        integrators = [Signal(signed(w), name=f"integrator{i}") for i in range(self.stages)]
+        with m.If(self.i_strobe):
+            m.d.sync += integrators[0].eq(integrators[0] + self.i_data)
+            for prev, integrator in zip(integrators, integrators[1:]):
+                m.d.sync += integrator.eq(integrator + prev)
+
+        # Decimate
+        s_count = Signal(range(self.ratio))
+        s_tick = Signal(self.stages + 1)
+        s_sample = Signal(signed(w))
+        m.d.sync += s_tick.eq(s_tick << 1)
+        with m.If(self.i_strobe):
+            with m.If(s_count == self.ratio - 1):
+                m.d.sync += [
+                    s_count.eq(0),
+                    s_sample.eq(integrators[-1] + integrators[-2] if self.stages > 1
+                                else integrators[-1] + self.i_data),
+                    s_tick[0].eq(1),
+                ]
+            with m.Else():
+                m.d.sync += s_count.eq(s_count + 1)
+
+        # Combs; stage i runs the cycle after stage i - 1
+        x = s_sample
+        for i in range(self.stages):
+            delayed = Signal(signed(w), name=f"comb{i}_delayed")
+            y = Signal(signed(w), name=f"comb{i}")
+            with m.If(s_tick[i]):
+                m.d.sync += [
+                    delayed.eq(x),
+                    y.eq(x - delayed),
+                ]
+            x = y
+
+        m.d.comb += [
+            self.o_data.eq(x),
+            self.o_stb.eq(s_tick[-1]),
+        ]
+
+        return m
+
+    def ports(self):
+        return [
+            self.i_data,
+            self.i_strobe,
+            self.o_data,
+            self.o_stb,
+        ]
+
+
+class FIR(Elaboratable):
+    """A FIR filter, computed with one multiply-accumulate per tap.
+
+    On every i_strobe the input joins the delay line; the taps are then multiplied and accumulated one per
+    cycle, and the sum is rounded (to coeff_frac bits) and saturated. o_data holds the new sample,
+    and o_stb pulses, `cycles` cycles after the strobe. A new strobe is accepted every len(taps) cycles;
+    strobes while busy are ignored. i_strobe is high by default, filtering back to back.
+
+    Parameters
+    ----------
+    width : int
+        The width in bits of the (signed) samples.
+    taps : list[int]
+        The coefficients, fixed point with coeff_frac fractional bits.
+    coeff_frac : int
+        The number of fractional bits of the coefficients.
+
+    """
+
+    def __init__(self, width: int, taps: list[int], coeff_frac: int = 14):
+        self.width = width
+        self.taps = taps
+        self.coeff_frac = coeff_frac
+
+        self.cycles = len(taps) + 2
+
+        self.i_data = Signal(signed(width))
+        self.i_strobe = Signal(init=1)
+
+        self.o_data = Signal(signed(width))
+        self.o_stb = Signal()
+
+    def elaborate(self, _) -> Module:
+        m = Module()
+
+        n_taps = len(self.taps)
+        coeff_width = max(abs(c) for c in self.taps).bit_length() + 1
+        acc_width = self.width + coeff_width + math.ceil(math.log2(n_taps))
+
+        delay_line = Array(Signal(signed(self.width), name=f"x{i}") for i in range(n_taps))
+        coeffs = Array(Const(c, signed(coeff_width)) for c in self.taps)
+
+        s_busy = Signal()
+        s_tap = Signal(range(n_taps))
+        s_product = Signal(signed(self.width + coeff_width))
+        s_product_valid = Signal()
+        s_first = Signal()
+        s_last = Signal()
+        s_acc = Signal(signed(acc_width))
+
+        m.d.sync += [
+            s_product_valid.eq(0),
+            s_first.eq(0),
+            s_last.eq(0),
+            self.o_stb.eq(0),
+        ]
+
+        # Multiply
+        with m.If(s_busy):
+            m.d.sync += [
+                s_product.eq(delay_line[s_tap] * coeffs[s_tap]),
+                s_product_valid.eq(1),
+                s_first.eq(s_tap == 0),
+                s_last.eq(s_tap == n_taps - 1),
+            ]
+            with m.If(s_tap == n_taps - 1):
+                m.d.sync += s_busy.eq(0)
+            with m.Else():
+                m.d.sync += s_tap.eq(s_tap + 1)
+
+        # Accept the next sample as the last tap is multiplied
+        with m.If(self.i_strobe & (~s_busy | (s_tap == n_taps - 1))):
+            m.d.sync += [
+                Cat(*delay_line).eq(Cat(self.i_data, *delay_line[:-1])),
+                s_busy.eq(1),
+                s_tap.eq(0),
+            ]
+
+        # Accumulate; the first product restarts the sum, so the next sample may start while this one drains
+        acc = Mux(s_first, 0, s_acc) + s_product
+        with m.If(s_product_valid):
+            m.d.sync += s_acc.eq(acc)
+            with m.If(s_last):
+                rounding = 1 << (self.coeff_frac - 1)
+                m.d.sync += [
+                    self.o_data.eq(saturate((acc + rounding) >> self.coeff_frac, self.width)),
+                    self.o_stb.eq(1),
+                ]
+
+        return m
+
+    def ports(self):
+        return [
+            self.i_data,
+            self.i_strobe,
+            self.o_data,
+            self.o_stb,
+        ]
+
+
+class Decimator(Elaboratable):
+    """Decimates a stream from an oscillator's rate to the audio rate; a `CICDecimator` followed by a
+    compensating `FIR`.
+
+    The CIC output is scaled down by its gain (rounded up to a power of two; exact when ratio is a power of two)
+    back to output_width bits, and the FIR flattens the CIC's passband droop (see `cic_compensator`).
+    Drive i_strobe at ratio x the output rate, e.g. an oscillator strobed at 64 x 48 kHz with ratio = 64.
+    The FIR shares one multiplier across its taps, so n_taps must not exceed ratio.
+
+    Parameters
+    ----------
+    width : int
+        The width in bits of the (signed) input and output samples.
+    ratio : int
+        The decimation ratio.
+    stages : int
+        The number of CIC stages.
+    n_taps : int
+        The number of taps of the compensating FIR.
+
+    """
+
+    def __init__(self, width: int = 16, ratio: int = 64, stages: int = 4, n_taps: int = 15):
+        if ratio < n_taps:
+            raise ValueError(f"The FIR's {n_taps} taps don't fit in the {ratio} cycles between CIC outputs")
+
+        self.width = width
+        self.ratio = ratio
+        self.stages = stages
+        self.n_taps = n_taps
+        self.coeff_frac = 14
+
+        self.i_data = Signal(signed(width))
+        self.i_strobe = Signal(init=1)
+
+        self.o_data = Signal(signed(width))
+        self.o_stb = Signal()
+
+    def elaborate(self, _) -> Module:
+        m = Module()
+
+        m.submodules.cic = cic = CICDecimator(self.width, self.ratio, self.stages)
+        m.submodules.fir = fir = FIR(
+            self.width,
+            cic_compensator(self.stages, self.ratio, self.n_taps, coeff_frac=self.coeff_frac),
+            self.coeff_frac,
+        )
+
+        m.d.comb += [
+            cic.i_data.eq(self.i_data),
+            cic.i_strobe.eq(self.i_strobe),
+            fir.i_data.eq(cic.o_data >> (cic.output_width - self.width)),
+            fir.i_strobe.eq(cic.o_stb),
+            self.o_data.eq(fir.o_data),
+            self.o_stb.eq(fir.o_stb),
+        ]
+
+        return m
+
+    def ports(self):
+        return [
+            self.i_data,
+            self.i_strobe,
+            self.o_data,
+            self.o_stb,
+        ]
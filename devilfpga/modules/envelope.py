@@ -0,0 +1,203 @@
+import math
+from amaranth import Elaboratable, Module, Mux, Signal, unsigned
+from amaranth.lib.memory import Memory
+
+
+def decay_shift(t_decay: float, f_control: int) -> int:
+    """The decay shift whose time constant (2 ** shift control ticks) is closest to t_decay seconds."""
+    return max(round(math.log2(t_decay * f_control)), 0)
+
+
+def decayed(env, shift):
+    """One step of the decay; env - (env >> shift), but at least 1 while above 0, so it reaches 0."""
+    step = env >> shift
+    return env - Mux((step == 0) & (env != 0), 1, step)
+
+
+def peak(accent, width: int, accent_shift: int):
+    """The envelope's level at the start of a note; full scale when accented, otherwise 1 - 2 ** -accent_shift."""
+    full = (1 << width) - 1
+    return Mux(accent, full, full - (full >> accent_shift))
+
+
+class Envelope(Elaboratable):
+    """The TB-303's envelope generator; decay only.
+
+    A leaky integrator: i_trigger restarts it at its peak (higher, with i_accent), and on every control-rate
+    i_strobe it decays by a fixed fraction,
+
+        env -= env >> i_decay
+
+    an exponential decay with a time constant of 2 ** i_decay strobes (see `decay_shift`); only a shift and
+    a subtract, no multiplier. A trigger takes effect on the next strobe. One envelope drives both the
+    filter's cutoff and the VCA's gain (as a Q0.width fraction); o_env fans out to both.
+
+    Parameters
+    ----------
+    width : int
+        The width in bits of the envelope.
+    decay : int
+        The reset value of i_decay.
+    accent_shift : int
+        The peak without accent is 1 - 2 ** -accent_shift of full scale.
+
+    """
+
+    def __init__(self, width: int = 16, decay: int = 9, accent_shift: int = 2):
+        self.width = width
+        self.decay = decay
+        self.accent_shift = accent_shift
+
+        self.i_trigger = Signal()
+        self.i_accent = Signal()
+        self.i_decay = Signal(range(width), init=decay)
+        self.i_strobe = Signal(init=1)
+
+        self.o_env = Signal(unsigned(width))
+
+    def elaborate(self, _) -> Module:
+        m = Module()
+
+        # Hold a trigger (and its accent) until the strobe
+        s_pending = Signal()
+        s_accent = Signal()
+        with m.If(self.i_trigger):
+            m.d.sync += [
+                s_pending.eq(1),
+                s_accent.eq(self.i_accent),
+            ]
+
+        trigger = s_pending | self.i_trigger
+        accent = Mux(self.i_trigger, self.i_accent, s_accent)
+        with m.If(self.i_strobe):
+            m.d.sync += s_pending.eq(0)
+            with m.If(trigger):
+                m.d.sync += self.o_env.eq(peak(accent, self.width, self.accent_shift))
+            with m.Else():
+                m.d.sync += self.o_env.eq(decayed(self.o_env, self.i_decay))
+
+        return m
+
+    def ports(self):
+        return [
+            self.i_trigger,
+            self.i_accent,
+            self.i_decay,
+            self.i_strobe,
+            self.o_env,
+        ]
+
+
+class EnvelopeBank(Elaboratable):
+    """A bank of time-multiplexed `Envelope`s.
+
+    Serves n_voices envelopes from one decay (shift and subtract) datapath; the envelopes live in block RAM.
+    On every i_strobe, the voices are swept round-robin, one per cycle, through a 2 stage pipeline:
+
+        0: read the voice's envelope
+        1: write back the next value (its peak, if triggered since the last sweep), and output it
+
+    Each envelope comes out on o_env with its voice on o_voice, and o_valid high. A sweep takes `cycles`
+    clock cycles; strobes during a sweep are ignored, and i_strobe is high by default, sweeping back to back.
+    Voices are triggered by their bit of i_trigger (with their bit of i_accent), at any time; the decay time
+    constant is shared.
+
+    Parameters
+    ----------
+    n_voices : int
+        The number of voices.
+    width : int
+        The width in bits of the envelopes.
+    decay : int
+        The reset value of i_decay.
+    accent_shift : int
+        The peak without accent is 1 - 2 ** -accent_shift of full scale.
+
+    """
+
+    def __init__(self, n_voices: int, width: int = 16, decay: int = 9, accent_shift: int = 2):
+        self.n_voices = n_voices
+        self.width = width
+        self.decay = decay
+        self.accent_shift = accent_shift
+
+        # Clock cycles per sweep, from strobe to the last voice's envelope
+        self.cycles = n_voices + 2
+
+        self.i_trigger = Signal(n_voices)
+        self.i_accent = Signal(n_voices)
+        self.i_decay = Signal(range(width), init=decay)
+        self.i_strobe = Signal(init=1)
+
+        self.o_env = Signal(unsigned(width))
+        self.o_voice = Signal(range(n_voices))
+        self.o_valid = Signal()
+
+    def elaborate(self, _) -> Module:
+        m = Module()
+
+        m.submodules.state = state = Memory(shape=unsigned(self.width), depth=self.n_voices, init=[])
+        rd = state.read_port()
+        wr = state.write_port()
+
+        # Sweep
+        s_busy = Signal()
+        s_voice = Signal(range(self.n_voices))
+        with m.If(self.i_strobe & ~s_busy):
+            m.d.sync += [
+                s_busy.eq(1),
+                s_voice.eq(0),
+            ]
+        with m.Elif(s_busy):
+            with m.If(s_voice == self.n_voices - 1):
+                m.d.sync += s_busy.eq(0)
+            with m.Else():
+                m.d.sync += s_voice.eq(s_voice + 1)
+
+        # 0: read the voice's envelope
+        s_voice_1 = Signal.like(s_voice)
+        s_valid_1 = Signal()
+        m.d.comb += rd.addr.eq(s_voice)
+        m.d.sync += [
+            s_voice_1.eq(s_voice),
+            s_valid_1.eq(s_busy),
+        ]
+
+        # 1: decay, or restart if triggered since the voice's last turn
+        s_pending = Signal(self.n_voices)
+        s_accent = Signal(self.n_voices)
+        triggered = s_pending.bit_select(s_voice_1, 1)
+        accent = s_accent.bit_select(s_voice_1, 1)
+        env = Mux(triggered, peak(accent, self.width, self.accent_shift), decayed(rd.data, self.i_decay))
+
+        # A voice's trigger is consumed on its turn, unless it is triggered again in the same cycle
+        consumed = Signal(self.n_voices)
+        m.d.comb += consumed.eq(Mux(s_valid_1, 1 << s_voice_1, 0))
+        m.d.sync += [
+            s_pending.eq((s_pending & ~consumed) | self.i_trigger),
+            s_accent.eq((s_accent & ~self.i_trigger) | (self.i_accent & self.i_trigger)),
+        ]
+
+        m.d.comb += [
+            wr.addr.eq(s_voice_1),
+            wr.data.eq(env),
+            wr.en.eq(s_valid_1),
+        ]
+        m.d.sync += [
+            self.o_env.eq(env),
+            self.o_voice.eq(s_voice_1),
+            self.o_valid.eq(s_valid_1),
+        ]
+
+        return m
+
+    def ports(self):
+        return [
+            self.i_trigger,
+            self.i_accent,
+            self.i_decay,
+            self.i_strobe,
+            self.o_env,
+            self.o_voice,
+            self.o_valid,
+        ]
@@ -0,0 +1,146 @@
+import math
+from amaranth import Elaboratable, Module, Signal, unsigned
+from amaranth.lib.memory import Memory
+
+from .bridge import DataSlot, add_table
+
+
+def antilog_table(width: int, y_min: float, y_max: float, table_bits: int,
+                  mantissa_bits: int) -> tuple[list[int], list[int], list[int], int]:
+    """The table of `Antilog`; y at every 2 ** (width - table_bits)th CV value, from y_min to (past) y_max.
+
+    Entry j holds y as a mantissa, shifted left by an octave; y = mantissa << octave >> shift, mantissas of
+    mantissa_bits bits. Each entry also holds the delta to the next entry's y, at its own octave, for
+    interpolation. Returns the mantissas, deltas, octaves and the shift.
+    """
+    if y_max <= y_min:
+        raise ValueError(f"The range {y_min} - {y_max} is not increasing")
+
+    shift = mantissa_bits - 1 - math.floor(math.log2(y_min))
+    if shift < 0:
+        raise ValueError(f"{mantissa_bits} bit mantissas cannot hold {y_min}")
+
+    n = 1 << table_bits
+    # Entry n is the CV just past max, so the top of the range interpolates toward it
+    y = [y_min * (y_max / y_min) ** ((j << (width - table_bits)) / ((1 << width) - 1)) for j in range(n + 1)]
+    octaves = [max(math.floor(math.log2(y[j])) - math.floor(math.log2(y_min)), 0) for j in range(n)]
+    mantissas = [round(y[j] * 2 ** (shift - octaves[j])) for j in range(n)]
+    deltas = [round(y[j + 1] * 2 ** (shift - octaves[j])) - mantissas[j] for j in range(n)]
+    return mantissas, deltas, octaves, shift
+
+
+class Antilog(Elaboratable):
+    """An exponential converter; maps the CV to o_y = y_min * (y_max / y_min) ** (i_cv / max).
+
+    The exponential's scale is folded into the table, rather than multiplied into the CV: the top table_bits
+    of the CV index a table spanning the whole range (see `antilog_table`), each entry a mantissa and the
+    octave to barrel-shift it by. The remaining bits of the CV linearly interpolate between entries, with
+    one multiply; the only one. The result is rounded to the nearest integer.
+
+    Fixed latency of `latency` cycles, from i_cv to o_y.
+
+    With a slot, the table is loaded from the data slot, over the bridge signals (i_bridge_*), at boot.
+
+    Parameters
+    ----------
+    width : int
+        The width in bits of the CV.
+    y_min : float
+        The output at CV = 0.
+    y_max : float
+        The output at CV = max.
+    output_width : int
+        The width in bits of o_y.
+    table_bits : int
+        The number of CV bits resolved by the table (2 ** table_bits entries).
+    mantissa_bits : int
+        The precision in bits of the table entries.
+    slot : DataSlot
+        The data slot to load the table from, if any.
+
+    """
+
+    def __init__(self,
+                 width: int,
+                 y_min: float,
+                 y_max: float,
+                 output_width: int = 16,
+                 table_bits: int = 8,
+                 mantissa_bits: int = 16,
+                 slot: DataSlot = None,
+                 ):
+        if not 0 < table_bits < width:
+            raise ValueError(f"Table bits ({table_bits}) must be fewer than the bits of the CV ({width})")
+        if round(y_max) >> output_width:
+            raise ValueError(f"{y_max} does not fit in {output_width} bits")
+
+        self.width = width
+        self.output_width = output_width
+        self.table_bits = table_bits
+        self.slot = slot
+
+        self.latency = 3
+
+        self.i_bridge_addr = Signal(32)
+        self.i_bridge_wr = Signal()
+        self.i_bridge_wr_data = Signal(32)
+
+        self.i_cv = Signal(width)
+        self.o_y = Signal(output_width)
+
+        self.mantissas, self.deltas, self.octaves, self.shift = \
+            antilog_table(width, y_min, y_max, table_bits, mantissa_bits)
+        self.mantissa_width = max(self.mantissas).bit_length()
+        self.delta_width = max(self.deltas).bit_length()
+        self.octave_width = max(max(self.octaves).bit_length(), 1)
+
+    def table(self) -> list[int]:
+        """The entries of the table; Cat(mantissa, delta, octave)."""
+        mw = self.mantissa_width
+        dw = self.delta_width
+        return [mantissa | (delta << mw) | (octave << (mw + dw))
+                for mantissa, delta, octave in zip(self.mantissas, self.deltas, self.octaves)]
+
+    def tables(self) -> dict:
+        """The tables loaded from data slots, by slot."""
+        return {self.slot: self.table()} if self.slot else {}
+
+    def elaborate(self, _) -> Module:
+        m = Module()
+
+        mw = self.mantissa_width
+        dw = self.delta_width
+        width = mw + dw + self.octave_width
+        memory = Memory(shape=unsigned(width), depth=1 << self.table_bits, init=[] if self.slot else self.table())
+        rd = add_table(m, "memory", memory, self.slot, self).read_port()
+
+        residual_bits = self.width - self.table_bits
+
+        # 0: address the table
+        s_residual = Signal(residual_bits)
+        m.d.comb += rd.addr.eq(self.i_cv[residual_bits:])
+        m.d.sync += s_residual.eq(self.i_cv[:residual_bits])
+
+        # 1: entry is read; scale the slope by the residual
+        s_value = Signal(mw)
+        s_octave = Signal(self.octave_width)
+        s_product = Signal(dw + residual_bits)
+        m.d.sync += [
+            s_value.eq(rd.data[:mw]),
+            s_octave.eq(rd.data[mw + dw:]),
+            s_product.eq(rd.data[mw:mw + dw] * s_residual),
+        ]
+
+        # 2: interpolate, shift
+        mantissa = s_value + (s_product >> residual_bits)
+        rounding = 1 << (self.shift - 1) if self.shift else 0
+        m.d.sync += self.o_y.eq(((mantissa << s_octave) + rounding) >> self.shift)
+
+        return m
+
+    def ports(self):
+        bridge = [self.i_bridge_addr, self.i_bridge_wr, self.i_bridge_wr_data] if self.slot else []
+        return bridge + [
+            self.i_cv,
+            self.o_y,
+        ]
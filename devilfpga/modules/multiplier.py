@@ -0,0 +1,108 @@
+from amaranth import Cat, Elaboratable, Module, Shape, Signal
+
+
+class MultiplierPort:
+    """A client's connection to a `SharedMultiplier`.
+
+    Pulse i_req with the operands on i_a and i_b, and hold them until o_valid; o_p then holds the product,
+    at least `latency` cycles after the request.
+    """
+
+    def __init__(self, a_shape, b_shape, index: int, latency: int):
+        self.latency = latency
+
+        self.i_a = Signal(a_shape, name=f"mul{index}_a")
+        self.i_b = Signal(b_shape, name=f"mul{index}_b")
+        self.i_req = Signal(name=f"mul{index}_req")
+
+        self.o_p = Signal(Shape(a_shape.width + b_shape.width, a_shape.signed or b_shape.signed),
+                          name=f"mul{index}_p")
+        self.o_valid = Signal(name=f"mul{index}_valid")
+
+
+class SharedMultiplier(Elaboratable):
+    """A pipelined multiplier, time-shared between clients.
+
+    Requests are issued one per cycle, lowest port first, through registered operands and a registered product
+    (so the multiply maps onto one DSP block); each result is valid `latency` cycles after its request is issued.
+    Clients running on the audio-rate strobe have thousands of cycles per sample, so a handful of them can
+    share one multiplier without ever waiting long.
+
+    Parameters
+    ----------
+    a_shape : Shape
+        The shape of the first operand.
+    b_shape : Shape
+        The shape of the second operand.
+    n_ports : int
+        The number of clients.
+
+    """
+
+    def __init__(self, a_shape, b_shape, n_ports: int):
+        self.a_shape = Shape.cast(a_shape)
+        self.b_shape = Shape.cast(b_shape)
+
+        self.latency = 2
+
+        self.clients = [MultiplierPort(self.a_shape, self.b_shape, k, self.latency) for k in range(n_ports)]
+
+    def elaborate(self, _) -> Module:
+        m = Module()
+
+        n_ports = len(self.clients)
+
+        # Requests wait here until issued
+        s_pending = Signal(n_ports)
+        pending = Signal(n_ports)
+        m.d.comb += pending.eq(s_pending | Cat(*[port.i_req for port in self.clients]))
+
+        issue = Signal(range(n_ports))
+        issue_valid = Signal()
+        for k in reversed(range(n_ports)):
+            with m.If(pending[k]):
+                m.d.comb += [
+                    issue.eq(k),
+                    issue_valid.eq(1),
+                ]
+
+        m.d.sync += s_pending.eq(pending & ~Cat(*[issue_valid & (issue == k) for k in range(n_ports)]))
+
+        # 0: operands
+        s_a = Signal(self.a_shape)
+        s_b = Signal(self.b_shape)
+        s_port = Signal.like(issue)
+        s_valid = Signal()
+        with m.Switch(issue):
+            for k, port in enumerate(self.clients):
+                with m.Case(k):
+                    m.d.sync += [
+                        s_a.eq(port.i_a),
+                        s_b.eq(port.i_b),
+                    ]
+        m.d.sync += [
+            s_port.eq(issue),
+            s_valid.eq(issue_valid),
+        ]
+
+        # 1: product
+        s_p = Signal.like(self.clients[0].o_p)
+        s_port_1 = Signal.like(s_port)
+        s_valid_1 = Signal()
+        m.d.sync += [
+            s_p.eq(s_a * s_b),
+            s_port_1.eq(s_port),
+            s_valid_1.eq(s_valid),
+        ]
+
+        for k, port in enumerate(self.clients):
+            m.d.comb += [
+                port.o_p.eq(s_p),
+                port.o_valid.eq(s_valid_1 & (s_port_1 == k)),
+            ]
+
+        return m
+
+    def ports(self):
+        return [signal for port in self.clients
+                for signal in [port.i_a, port.i_b, port.i_req, port.o_p, port.o_valid]]
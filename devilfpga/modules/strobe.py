@@ -0,0 +1,114 @@
+import math
+from amaranth import Elaboratable, Module, Signal
+
+
+class Strobe(Elaboratable):
+    """A clock enable; pulses o_stb for one cycle, f_out times per second on average.
+
+    A fractional divider (a phase accumulator over the reduced ratio f_out / f_clk), so rates that don't divide
+    the clock evenly (e.g. 48 kHz from 100 MHz) are exact on average, with at most one cycle of jitter.
+
+    Parameters
+    ----------
+    f_clk : int
+        The clock frequency.
+    f_out : int
+        The strobe rate.
+
+    """
+
+    def __init__(self, f_clk: int, f_out: int):
+        if not 0 < f_out <= f_clk:
+            raise ValueError(f"Strobe rate {f_out} must be within (0, {f_clk}]")
+
+        self.f_clk = f_clk
+        self.f_out = f_out
+
+        self.o_stb = Signal()
+
+    def elaborate(self, _) -> Module:
+        m = Module()
+
+        gcd = math.gcd(self.f_clk, self.f_out)
+        num = self.f_out // gcd
+        den = self.f_clk // gcd
+
+        s_acc = Signal(range(den))
+        with m.If(s_acc + num >= den):
+            m.d.sync += [
+                s_acc.eq(s_acc + num - den),
+                self.o_stb.eq(1),
+            ]
+        with m.Else():
+            m.d.sync += [
+                s_acc.eq(s_acc + num),
+                self.o_stb.eq(0),
+            ]
+
+        return m
+
+    def ports(self):
+        return [
+            self.o_stb,
+        ]
+
+
+class Scheduler(Elaboratable):
+    """Multi-rate clock enables for the synthesis core.
+
+    One divider produces the audio-rate strobe; every control_divider-th audio tick also raises the
+    control-rate strobe. Modules that accept an i_strobe only advance on their strobe, and compute their
+    tuning words against its rate, leaving `cycles_per_sample` clock cycles per sample free for time-sharing.
+
+    Parameters
+    ----------
+    f_clk : int
+        The clock frequency.
+    f_sample : int
+        The audio sample rate.
+    control_divider : int
+        The number of audio samples per control-rate tick.
+
+    """
+
+    def __init__(self,
+                 f_clk: int = 100_000_000,
+                 f_sample: int = 48_000,
+                 control_divider: int = 16,
+                 ):
+        if f_sample % control_divider:
+            raise ValueError(f"Sample rate {f_sample} is not a multiple of the control divider {control_divider}")
+
+        self.f_clk = f_clk
+        self.f_sample = f_sample
+        self.f_control = f_sample // control_divider
+        self.control_divider = control_divider
+        self.cycles_per_sample = f_clk // f_sample
+
+        self.o_audio = Signal()
+        self.o_control = Signal()
+
+    def elaborate(self, _) -> Module:
+        m = Module()
+
+        m.submodules.audio = audio = Strobe(self.f_clk, self.f_sample)
+
+        s_count = Signal(range(self.control_divider))
+        m.d.comb += [
+            self.o_audio.eq(audio.o_stb),
+            self.o_control.eq(audio.o_stb & (s_count == 0)),
+        ]
+
+        with m.If(audio.o_stb):
+            with m.If(s_count == self.control_divider - 1):
+                m.d.sync += s_count.eq(0)
+            with m.Else():
+                m.d.sync += s_count.eq(s_count + 1)
+
+        return m
+
+    def ports(self):
+        return [
+            self.o_audio,
+            self.o_control,
+        ]
@@ -0,0 +1,108 @@
+from amaranth import Elaboratable, Module, Signal, signed, unsigned
+
+from ..fixed import saturate
+from .multiplier import MultiplierPort
+
+
+class VCA(Elaboratable):
+    """VCA
+
+    Scales signed audio by an unsigned gain (e.g. the envelope); o_audio = (i_audio * i_gain) >> gain_frac_bits,
+    saturated to the audio width (or wrapped, without saturate).
+
+    On every i_strobe the input sample and gain are latched; the multiply is registered on both sides,
+    so it maps onto a DSP block. o_audio holds the result, and o_stb pulses, `latency` cycles later.
+    Given a `SharedMultiplier` port, the VCA issues its multiply there instead of instantiating its own;
+    at the audio rate, the output stage then needs no dedicated DSP. `latency` is then the least it takes;
+    more while other clients hold the multiplier.
+
+    Parameters
+    ----------
+    width : int
+        The width in bits of the (signed) audio samples.
+    gain_width : int
+        The width in bits of the gain.
+    gain_frac_bits : int
+        The number of fractional bits of the gain; gain_width = gain_frac_bits is a gain in [0, 1).
+    saturate : bool
+        Whether to saturate the result, rather than let it wrap.
+    multiplier : MultiplierPort
+        A port of a `SharedMultiplier` (with signed(width) x unsigned(gain_width) operands) to use, if any.
+
+    """
+
+    def __init__(self,
+                 width: int = 16,
+                 gain_width: int = 16,
+                 gain_frac_bits: int = 16,
+                 saturate: bool = True,
+                 multiplier: MultiplierPort = None,
+                 ):
+        self.width = width
+        self.gain_width = gain_width
+        self.gain_frac_bits = gain_frac_bits
+        self.saturate = saturate
+        self.multiplier = multiplier
+
+        # Clock cycles from strobe to output; the latch, the multiply (the request, and the multiplier's
+        # pipeline, if shared), the output
+        self.latency = 3 if multiplier is None else 2 + multiplier.latency
+
+        self.i_audio = Signal(signed(width))
+        self.i_gain = Signal(unsigned(gain_width))
+        self.i_strobe = Signal(init=1)
+
+        self.o_audio = Signal(signed(width))
+        self.o_stb = Signal()
+
+    def elaborate(self, _) -> Module:
+        if self.multiplier is not None:
+            operands = (self.multiplier.i_a.shape(), self.multiplier.i_b.shape())
+            if operands != (self.i_audio.shape(), self.i_gain.shape()):
+                raise ValueError(f"The multiplier's operands are {operands[0]} x {operands[1]}, "
+                                 f"not {self.i_audio.shape()} x {self.i_gain.shape()}")
+
+        m = Module()
+
+        s_audio = Signal.like(self.i_audio)
+        s_gain = Signal.like(self.i_gain)
+        with m.If(self.i_strobe):
+            m.d.sync += [
+                s_audio.eq(self.i_audio),
+                s_gain.eq(self.i_gain),
+            ]
+
+        product = Signal(signed(self.width + self.gain_width))
+        product_valid = Signal()
+
+        if self.multiplier is None:
+            s_stb = Signal()
+            m.d.sync += [
+                s_stb.eq(self.i_strobe),
+                product.eq(s_audio * s_gain),
+                product_valid.eq(s_stb),
+            ]
+        else:
+            m.d.sync += self.multiplier.i_req.eq(self.i_strobe)
+            m.d.comb += [
+                self.multiplier.i_a.eq(s_audio),
+                self.multiplier.i_b.eq(s_gain),
+                product.eq(self.multiplier.o_p),
+                product_valid.eq(self.multiplier.o_valid),
+            ]
+
+        scaled = product >> self.gain_frac_bits
+        m.d.sync += self.o_stb.eq(product_valid)
+        with m.If(product_valid):
+            m.d.sync += self.o_audio.eq(saturate(scaled, self.width) if self.saturate else scaled)
+
+        return m
+
+    def ports(self):
+        return [
+            self.i_audio,
+            self.i_gain,
+            self.i_strobe,
+            self.o_audio,
+            self.o_stb,
+        ]
@@ -1,62 +1,200 @@
+import math
 from amaranth import Elaboratable, Module, Signal, signed
 
+from .exp_converter import Antilog
+from .vca import VCA
+from ..fixed import saturate
 
-class LadderFilter(Module):
-    def __init__(self, audio_in, audio_out, cutoff_cv, resonance_cv):
-        self.audio_in = audio_in
-        self.audio_out = audio_out
-        self.cutoff_cv = cutoff_cv
-        self.resonance_cv = resonance_cv
+# The cutoff frequencies at the cutoff CV's 0 and max
+F_CUTOFF_MIN = 100.0
+F_CUTOFF_MAX = 5_000.0
+
+
+class LadderFilter(Elaboratable):
+    """A 4-pole (24 dB/oct) resonant low-pass ladder filter.
+
+    Fixed-point, signed datapath; see `model.vcf.LadderFilter` for the recurrence. The resonance feedback
+    and the four poles are computed one after another through a single pipelined multiplier, one
+    multiply per step, three cycles per step (operands, product, write back). On every i_strobe the input
+    sample and coefficients are latched; `cycles` clock cycles later o_audio holds the filtered sample,
+    and o_stb pulses. Strobes while busy are ignored; i_strobe is high by default, filtering back to back.
+
+    Parameters
+    ----------
+    width : int
+        The width in bits of the (signed) audio samples and filter state.
+
+    """
+
+    def __init__(self, width: int = 16):
+        self.width = width
+
+        # Clock cycles from strobe to output
+        self.cycles = 5 * 3 + 1
+
+        self.i_audio = Signal(signed(width))
+        self.i_cutoff = Signal(16)      # g, Q0.16
+        self.i_resonance = Signal(16)   # k, Q2.14
+        self.i_strobe = Signal(init=1)
+
+        self.o_audio = Signal(signed(width))
+        self.o_stb = Signal()
 
         # Filter state variables
-        self.delay_line = [Signal(signed(16)) for _ in range(4)]
-        self.feedback = Signal(signed(16))
+        self.delay_line = [Signal(signed(width), name=f"y{i}") for i in range(4)]
+
+    def elaborate(self, _) -> Module:
+        m = Module()
+
+        y = self.delay_line
+
+        s_x = Signal.like(self.i_audio)
+        s_g = Signal.like(self.i_cutoff)
+        s_k = Signal.like(self.i_resonance)
+        s_u = Signal(signed(self.width))
+
+        s_busy = Signal()
+        s_step = Signal(range(5))   # 0: resonance feedback, 1-4: poles
+        s_stage = Signal(range(3))  # 0: operands, 1: product, 2: write back
+
+        m.d.sync += self.o_stb.eq(0)
+
+        with m.If(self.i_strobe & ~s_busy):
+            m.d.sync += [
+                s_x.eq(self.i_audio),
+                s_g.eq(self.i_cutoff),
+                s_k.eq(self.i_resonance),
+                s_busy.eq(1),
+                s_step.eq(0),
+                s_stage.eq(0),
+            ]
 
-        # Calculate filter coefficients
-        self.g = (1 - 2 * self.resonance_cv) / (1 + 2 * self.resonance_cv)
-        self.alpha = 1 / (1 + 2 * self.resonance_cv)
-        self.beta = (1 - self.alpha) / 2
+        # The shared multiplier; registered operands and product
+        s_a = Signal(16)
+        s_b = Signal(signed(self.width + 1))
+        s_p = Signal(signed(16 + 1 + self.width + 1))
 
-        # Filter processing
-        self.comb += self.delay_line[0].eq(self.audio_in +
-                                           (self.feedback * self.g))
-        self.sync += [self.delay_line[i].eq(self.delay_line[i + 1])
-                      for i in range(3)]
-        self.comb += self.audio_out.eq(self.delay_line[3])
-        self.comb += self.feedback.eq(self.alpha *
-                                      (self.audio_in - self.delay_line[3]))
+        with m.If(s_busy):
+            with m.Switch(s_stage):
+                with m.Case(0):
+                    with m.Switch(s_step):
+                        with m.Case(0):
+                            m.d.sync += [s_a.eq(s_k), s_b.eq(y[3])]
+                        with m.Case(1):
+                            m.d.sync += [s_a.eq(s_g), s_b.eq(s_u - y[0])]
+                        for i in range(1, 4):
+                            with m.Case(i + 1):
+                                m.d.sync += [s_a.eq(s_g), s_b.eq(y[i - 1] - y[i])]
+                    m.d.sync += s_stage.eq(1)
 
+                with m.Case(1):
+                    m.d.sync += [
+                        s_p.eq(s_a * s_b),
+                        s_stage.eq(2),
+                    ]
 
-class AntilogConverter(Elaboratable):
-    def __init__(self):
-        self.i_sig = Signal()
-        self.o_sig = Signal()
+                with m.Case(2):
+                    with m.Switch(s_step):
+                        with m.Case(0):
+                            m.d.sync += s_u.eq(saturate(s_x - (s_p >> 14), self.width))
+                        for i in range(4):
+                            with m.Case(i + 1):
+                                m.d.sync += y[i].eq(saturate(y[i] + (s_p >> 16), self.width))
 
-        self.comb += self.o_sig.eq(((1 << 16) - 1) * (
-            1 - ((2 ** 16) - 1) ** (-self.i_sig / ((1 << 16) - 1))))
+                    with m.If(s_step == 4):
+                        m.d.sync += [
+                            s_busy.eq(0),
+                            self.o_audio.eq(saturate(y[3] + (s_p >> 16), self.width)),
+                            self.o_stb.eq(1),
+                        ]
+                    with m.Else():
+                        m.d.sync += [
+                            s_step.eq(s_step + 1),
+                            s_stage.eq(0),
+                        ]
 
+        return m
 
-class Amplifier(Elaboratable):
-    def __init__(self, input_signal, output_signal, envelope_cv):
-        self.input_signal = input_signal
-        self.output_signal = output_signal
-        self.envelope_cv = envelope_cv
+    def ports(self):
+        return [
+            self.i_audio,
+            self.i_cutoff,
+            self.i_resonance,
+            self.i_strobe,
+            self.o_audio,
+            self.o_stb,
+        ]
 
-        self.comb += self.output_signal.eq(self.input_signal *
-                                           self.envelope_cv)
+
+def cutoff_range(f_sample: int, f_min: float = F_CUTOFF_MIN, f_max: float = F_CUTOFF_MAX) -> tuple[float, float]:
+    """The ladder filter's cutoff coefficients (g = 2 * pi * fc / f_sample, Q0.16; see `LadderFilter.i_cutoff`)
+    at f_min and f_max; the range of the cutoff CV's `Antilog`."""
+    if f_max >= f_sample / (2 * math.pi):
+        raise ValueError(f"Cutoff {f_max} Hz is too high for a sample rate of {f_sample} Hz")
+    return 2 * math.pi * f_min / f_sample * (1 << 16), 2 * math.pi * f_max / f_sample * (1 << 16)
 
 
 class VCF(Elaboratable):
-    def __init__(self):
-        self.i_audio = Signal()
-        self.o_audio = Signal()
-        self.cutoff_cv = Signal()
-        self.resonance_cv = Signal()
-        self.envelope_cv = Signal()
-
-        self.submodules.moog_filter = LadderFilter()
-        self.submodules.antilog = AntilogConverter()
-        self.submodules.amplifier = Amplifier()
-
-        self.moog_output = Signal(signed(16))
-        self.antilog_output = Signal(signed(16))
+    """VCF
+
+    The filter section of the voice; the cutoff CV sets the ladder filter's cutoff, exponentially (through an
+    `Antilog`) from F_CUTOFF_MIN to F_CUTOFF_MAX, and the envelope drives the `VCA` that follows it. Processes one sample per i_strobe (the audio rate);
+    o_stb pulses when o_audio holds the result. As the `LadderFilter`'s, i_strobe is high by default.
+
+    Parameters
+    ----------
+    width : int
+        The width in bits of the (signed) audio samples.
+    f_sample : int
+        The audio sample rate.
+
+    """
+
+    def __init__(self, width: int = 16, f_sample: int = 48_000):
+        self.i_audio = Signal(signed(width))
+        self.i_cutoff_cv = Signal(16)
+        self.i_resonance = Signal(16)
+        self.i_envelope = Signal(16)
+        self.i_strobe = Signal(init=1)
+
+        self.o_audio = Signal(signed(width))
+        self.o_stb = Signal()
+
+        self.width = width
+        self.f_sample = f_sample
+
+    def elaborate(self, _) -> Module:
+        m = Module()
+
+        m.submodules.antilog = antilog = Antilog(16, *cutoff_range(self.f_sample))
+        m.submodules.moog_filter = moog_filter = LadderFilter(self.width)
+        m.submodules.amplifier = amplifier = VCA(self.width)
+
+        m.d.comb += [
+            antilog.i_cv.eq(self.i_cutoff_cv),
+
+            moog_filter.i_audio.eq(self.i_audio),
+            moog_filter.i_cutoff.eq(antilog.o_y),
+            moog_filter.i_resonance.eq(self.i_resonance),
+            moog_filter.i_strobe.eq(self.i_strobe),
+
+            amplifier.i_audio.eq(moog_filter.o_audio),
+            amplifier.i_gain.eq(self.i_envelope),
+            amplifier.i_strobe.eq(moog_filter.o_stb),
+
+            self.o_audio.eq(amplifier.o_audio),
+            self.o_stb.eq(amplifier.o_stb),
+        ]
+
+        return m
+
+    def ports(self):
+        return [
+            self.i_audio,
+            self.i_cutoff_cv,
+            self.i_resonance,
+            self.i_envelope,
+            self.i_strobe,
+            self.o_audio,
+            self.o_stb,
+        ]
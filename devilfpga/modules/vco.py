@@ -1,100 +1,125 @@
-from amaranth import Elaboratable, Module, Signal
+from amaranth import Elaboratable, Module, Mux, Signal
 
+from .bridge import DataSlot, connect
+from .exp_converter import Antilog
 from ..oscillators.saw_oscillator import SawOscillator
-from ..oscillators.square_oscillator import SquareOscillator
 
+F_C1 = 130.81
+F_E5 = 2637.02
 
-class Antilog(Elaboratable):
-    """Antilog
 
-    Parameters
-    ----------
-    width : int
-        The width in bits of the CV.
-
-    """
-
-    def __init__(self, width: int):
-        self.i_cv = Signal(width)
-        self.o_f = Signal(16)
-
-        self.width = width
-
-    def elaborate(self, _) -> Module:
-        m = Module()
-
-        # C1 = 0    = 130.81 Hz
-        # E5 = max  = 2637.02 Hz
-        ceil = 2 ** self.width - 1
-        m.d.comb += self.o_f.eq(self.i_cv * (2637 - 131) // ceil + 131)
-
-        return m
+class VCO(Elaboratable):
+    """VCO
 
-    def ports(self):
-        return [
-            self.i_cv,
-            self.o_f,
-        ]
+    The CV sets the frequency of one saw oscillator, exponentially (through an `Antilog`), from C1 (0) to E5
+    (max); the square is derived from the saw, as on the TB-303, by a comparator (the waveshaper) at half scale.
+    Both waveforms share the oscillator's phase accumulator and LUT; i_waveform picks one. o_stb pulses when
+    o_a holds a new sample.
 
+    With mode "increment", the pitch is given as the phase accumulator's tuning word, on i_inc (e.g. from
+    `modules.cv.TuningWord`, through `modules.cv.Slide`), instead of the CV; there is no antilog, nor divide.
 
-class VCO(Elaboratable):
-    """VCO
+    Given data slots, the saw LUT and the antilog's exponential table are loaded at boot over the bridge
+    signals (i_bridge_*), instead of being built into the design.
 
     Parameters
     ----------
-
+    width : int
+        The width in bits of the CV.
+    f_clk : int
+        The clock frequency, or the strobe rate if i_strobe is driven (see `modules.strobe.Scheduler`).
+    lut_width : int
+        The width in bits of the waveform LUT elements.
+    lut_depth : int
+        The word count (# of storage elements) of the waveform LUT.
+    lut_slot : DataSlot
+        The data slot to load the waveform LUT from, if any.
+    exp_slot : DataSlot
+        The data slot to load the antilog's exponential table from, if any.
+    mode : str
+        How the pitch is given; "cv", or "increment".
 
     """
 
-    def __init__(self, width: int):
+    def __init__(self,
+                 width: int,
+                 f_clk: int = 100_000_000,
+                 lut_width: int = 8,
+                 lut_depth: int = 2 ** 11,
+                 lut_slot: DataSlot = None,
+                 exp_slot: DataSlot = None,
+                 mode: str = "cv",
+                 ):
+        if mode not in ("cv", "increment"):
+            raise ValueError(f"Unknown pitch mode '{mode}'")
+        if mode == "increment" and exp_slot is not None:
+            raise ValueError("There is no antilog table to load, in increment mode")
+
+        self.i_bridge_addr = Signal(32)
+        self.i_bridge_wr = Signal()
+        self.i_bridge_wr_data = Signal(32)
+
         self.i_cv = Signal(width)
+        self.i_inc = Signal(32)
         self.i_waveform = Signal()  # 0 = saw, 1 = square
-        self.o_a = Signal(width)
+        self.i_strobe = Signal(init=1)
+        self.o_a = Signal(lut_width)
+        self.o_stb = Signal()
 
         self.width = width
+        self.f_clk = f_clk
+        self.lut_width = lut_width
+        self.lut_depth = lut_depth
+        self.mode = mode
 
-    def elaborate(self, _) -> Module:
-        m = Module()
+        self.antilog = Antilog(width, F_C1, F_E5, slot=exp_slot) if mode == "cv" else None
+        self.nco_saw = SawOscillator(f_clk, lut_width, lut_depth, lut_slot=lut_slot,
+                                     mode="divide" if mode == "cv" else "increment")
 
-        f_clk = 100_000_000
-        lut_width = 8
-        lut_depth = 2 ** 11
+    def tables(self) -> dict:
+        """The tables loaded from data slots, by slot."""
+        antilog = self.antilog.tables() if self.antilog else {}
+        return {**antilog, **self.nco_saw.tables()}
 
-        m.submodule.antilog = antilog = Antilog(self.width)
-        m.submodule.nco_saw = nco_saw = SawOscillator(
-            f_clk,
-            lut_width,
-            lut_depth,
-        )
-        m.submodule.nco_sqr = nco_sqr = SquareOscillator(
-            f_clk,
-            lut_width,
-            lut_depth,
-        )
+    def elaborate(self, _) -> Module:
+        m = Module()
 
-        f = Signal(16)
+        m.submodules.nco_saw = nco_saw = self.nco_saw
+        m.d.comb += connect(nco_saw, self)
 
-        m.d.comb += antilog.i_cv.eq(self.i_cv)
-        m.d.comb += f.eq(antilog.o_f)
+        if self.antilog is not None:
+            m.submodules.antilog = antilog = self.antilog
+            m.d.comb += connect(antilog, self)
+            m.d.comb += [
+                antilog.i_cv.eq(self.i_cv),
+                nco_saw.i_f_target.eq(antilog.o_y),
+            ]
+        else:
+            m.d.comb += nco_saw.i_inc.eq(self.i_inc)
 
         m.d.comb += [
             nco_saw.i_enable.eq(1),
-            nco_saw.i_f_target.eq(f),
-            nco_sqr.i_enable.eq(1),
-            nco_sqr.i_f_target.eq(f)
+            nco_saw.i_strobe.eq(self.i_strobe),
+            self.o_stb.eq(nco_saw.o_stb),
         ]
 
+        # Waveshaper; high while the saw is above half scale
+        square = Mux(nco_saw.o_a[-1], (1 << self.lut_width) - 1, 0)
+
         with m.If(self.i_waveform == 0):
             m.d.comb += self.o_a.eq(nco_saw.o_a)
-
-        with m.Elif(self.i_waveform == 1):
-            m.d.comb += self.o_a.eq(nco_sqr.o_a)
+        with m.Else():
+            m.d.comb += self.o_a.eq(square)
 
         return m
 
     def ports(self):
-        return [
-            self.i_cv,
+        loaded = self.nco_saw.lut_slot or (self.antilog and self.antilog.slot)
+        bridge = [self.i_bridge_addr, self.i_bridge_wr, self.i_bridge_wr_data] if loaded else []
+        return bridge + [
+            self.i_cv if self.mode == "cv" else self.i_inc,
             self.i_waveform,
+            self.i_strobe,
             self.o_a,
+            self.o_stb,
         ]
@@ -0,0 +1,90 @@
+import functools
+import hashlib
+import math
+import os
+import types
+from pathlib import Path
+
+import numpy as np
+
+from ..fingerprint import fingerprint
+
+
+def cache_dir() -> Path:
+    """The directory generated LUTs are cached in; overridden by the DEVILFPGA_CACHE_DIR environment variable."""
+    root = os.environ.get("DEVILFPGA_CACHE_DIR")
+    if root is None:
+        root = Path.home() / ".cache" / "devilfpga"
+    return Path(root) / "lut"
+
+
+def generator_key(lut_generator) -> str | None:
+    """A key identifying the generator by name and code, or None if it isn't a Python function.
+
+    The values it closes over, its defaults, and the globals it reads (e.g. the constants of its module, and
+    the helpers it calls, recursively) are part of the key (see `devilfpga.fingerprint`); so generators built
+    by a factory function don't share a table, and changing a constant a generator reads invalidates it.
+    """
+    if not isinstance(lut_generator, types.FunctionType):
+        return None
+
+    identity = f"{lut_generator.__module__}.{lut_generator.__qualname__}\n".encode() + fingerprint(lut_generator)
+    return hashlib.sha256(identity).hexdigest()
+
+
+def _generate(lut_generator, width: int, depth: int) -> np.ndarray:
+    addr_width = math.ceil(math.log2(depth))
+
+    # Generators written against NumPy take every index at once
+    try:
+        lut = np.asarray(lut_generator(np.arange(depth), width, addr_width))
+        if lut.shape == (depth,):
+            return lut.astype(np.int64)
+    except (TypeError, ValueError):
+        pass
+
+    return np.array([lut_generator(x, width, addr_width) for x in range(depth)], dtype=np.int64)
+
+
+@functools.lru_cache(maxsize=None)
+def _generate_cached(lut_generator, key: str | None, width: int, depth: int) -> np.ndarray:
+    if key is None:
+        return _generate(lut_generator, width, depth)
+
+    path = cache_dir() / f"{key[:16]}-{width}-{depth}.npy"
+    try:
+        return np.load(path)
+    except (OSError, ValueError):
+        pass
+
+    lut = _generate(lut_generator, width, depth)
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, lut)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+    return lut
+
+
+def generate_lut(lut_generator, width: int, depth: int) -> np.ndarray:
+    """The values of a waveform LUT, generated once and cached on disk.
+
+    Parameters
+    ----------
+    lut_generator : Function(i: int, width: int, depth: int)
+        A function that will generate the values of the waveform LUT. It is first called with
+        every index at once as a NumPy array, and falls back to one call per index if that fails.
+    width : int
+        The width in bits of the waveform LUT elements.
+    depth : int
+        The word count (# of storage elements) of the waveform LUT.
+
+    """
+    lut = _generate_cached(lut_generator, generator_key(lut_generator), width, depth)
+    lut.flags.writeable = False
+    return lut
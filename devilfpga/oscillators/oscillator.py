@@ -1,25 +1,78 @@
 import math
-from amaranth import Elaboratable, Memory, Module, Signal
+from amaranth import Cat, Elaboratable, Module, Signal, signed, unsigned
+from amaranth.lib.memory import Memory
 
+from .lut import generate_lut
 from .phase_accumulator import PhaseAccumulator
+from ..modules.bridge import DataSlot, add_table
+
+
+def compress_lut(lut, lut_width: int, interpolation_bits: int) -> list[int]:
+    """Packs a waveform LUT into a coarse table for linear interpolation.
+
+    Keeps every (2 ** interpolation_bits)th value, each stored alongside the (signed) difference to the
+    next kept value; the last entry interpolates toward the first, as the phase wraps.
+    Words are Cat(value, delta); lut_width + (lut_width + 1) bits.
+    """
+    mask = (1 << lut_width) - 1
+    coarse = [int(x) & mask for x in lut[::1 << interpolation_bits]]
+    delta_mask = (1 << (lut_width + 1)) - 1
+
+    return [value | (((coarse[(j + 1) % len(coarse)] - value) & delta_mask) << lut_width)
+            for j, value in enumerate(coarse)]
+
+
+def lut_table(lut_generator, lut_width: int, lut_depth: int, interpolation_bits: int = 0) -> list[int]:
+    """The entries of an `Oscillator`'s waveform LUT; generated, or loaded from the cache."""
+    lut = generate_lut(lut_generator, lut_width, lut_depth)
+    if interpolation_bits:
+        return compress_lut(lut, lut_width, interpolation_bits)
+
+    # Memory truncates its initial values to the element width
+    mask = (1 << lut_width) - 1
+    return (lut & mask).tolist()
 
 
 class Oscillator(Elaboratable):
     """A generic waveform generator.
 
     Synthesizes a waveform via DDS; a combination of a phase accumulator and lookup table.
-    The lookup table is generated using the passed lut_generator function.
+    The lookup table is generated using the passed lut_generator function, and cached on disk (see `generate_lut`),
+    when the oscillator is elaborated.
+
+    The table is read through a synchronous (block RAM) read port, and the output is registered;
+    o_a lags the phase on o_i by `latency` cycles.
+
+    The oscillator advances on every cycle i_strobe is high (by default, every cycle); f_clk is then the strobe rate.
+    The read pipeline is clock-enabled by the same strobe, and o_stb pulses when o_a holds the new sample.
+
+    With interpolation_bits = k, only every 2 ** k-th entry of the table is stored (see `compress_lut`),
+    and the lower k bits of the phase linearly interpolate between entries with one registered multiply.
+    A table 2 ** k times smaller then reaches the precision of the full lut_depth table,
+    for waveforms that are piecewise linear between the stored points, like the saw.
+
+    The phase accumulator's mode (see `PhaseAccumulator`) sets how the pitch is given: as a frequency in Hz,
+    on i_f_target, or (with "increment") as the tuning word itself, on i_inc.
+
+    With a lut_slot, the table is not generated into the design; it is loaded from the data slot, over the
+    bridge signals (i_bridge_*), at boot (see `modules.bridge`).
 
     Parameters
     ----------
     f_clk : int
-        The clock frequency.
+        The clock frequency (or strobe rate) the oscillator advances at.
     lut_width : int
         The width in bits of the waveform LUT elements.
     lut_depth : int
         The word count (# of storage elements) of the waveform LUT.
-    lut_generator : Function(i: int, width: int, depth: int)
-        A function that will generate the values of the waveform LUT.
+    lut_generator : Function(i: int | np.ndarray, width: int, depth: int)
+        A function that will generate the values of the waveform LUT; preferably vectorized over i.
+    interpolation_bits : int
+        The number of phase bits used to interpolate between the stored entries; 0 stores the full table.
+    lut_slot : DataSlot
+        The data slot to load the table from, if any.
+    mode : str
+        The phase accumulator's tuning word mode; "divide", "reciprocal" or "increment".
 
     """
 
@@ -28,22 +81,51 @@ class Oscillator(Elaboratable):
                  lut_width: int,
                  lut_depth: int,
                  lut_generator,
+                 interpolation_bits: int = 0,
+                 lut_slot: DataSlot = None,
+                 mode: str = "divide",
                  ):
         self.f_clk = f_clk
         self.lut_width = lut_width
+        self.lut_depth = lut_depth
+        self.lut_generator = lut_generator
         self.memory_addr_width = math.ceil(math.log2(lut_depth))
         self.phase_acc_width = 32
+        self.interpolation_bits = interpolation_bits
+        self.lut_slot = lut_slot
+        self.mode = mode
+
+        self.i_bridge_addr = Signal(32)
+        self.i_bridge_wr = Signal()
+        self.i_bridge_wr_data = Signal(32)
 
         self.i_enable = Signal()
         self.i_reset = Signal()
+        self.i_strobe = Signal(init=1)
         self.i_f_target = Signal(16)
+        self.i_inc = Signal(self.phase_acc_width)
 
         self.o_a = Signal(lut_width)
         self.o_i = Signal(lut_width)
+        self.o_stb = Signal()
+
+        # Cycles from the phase (o_i) to the corresponding sample (o_a)
+        self.latency = 3 if interpolation_bits else 2
 
-        lut = [lut_generator(x, lut_width, self.memory_addr_width)
-               for x in range(lut_depth)]
-        self.memory = Memory(width=lut_width, depth=lut_depth, init=lut)
+    def table(self) -> list[int]:
+        """The entries of the waveform LUT (see `lut_table`)."""
+        return lut_table(self.lut_generator, self.lut_width, self.lut_depth, self.interpolation_bits)
+
+    def tables(self) -> dict:
+        """The tables loaded from data slots, by slot."""
+        return {self.lut_slot: self.table()} if self.lut_slot else {}
+
+    def memory(self) -> Memory:
+        """The waveform LUT; generated only when the oscillator is elaborated, and only if it isn't loaded."""
+        k = self.interpolation_bits
+        width = 2 * self.lut_width + 1 if k else self.lut_width
+        init = [] if self.lut_slot else self.table()
+        return Memory(shape=unsigned(width), depth=self.lut_depth >> k, init=init)
 
     def elaborate(self, _) -> Module:
         m = Module()
@@ -51,26 +133,67 @@ class Oscillator(Elaboratable):
         m.submodules.phase_acc = phase_acc = PhaseAccumulator(
             self.f_clk,
             self.memory_addr_width,
+            self.mode,
         )
+        memory = add_table(m, "memory", self.memory(), self.lut_slot, self)
+        rd = memory.read_port()
 
         m.d.sync += [
             phase_acc.i_enable.eq(self.i_enable),
             phase_acc.i_reset.eq(self.i_reset),
-            phase_acc.i_f_target.eq(self.i_f_target)
+            phase_acc.i_strobe.eq(self.i_strobe),
+            phase_acc.i_f_target.eq(self.i_f_target),
+            phase_acc.i_inc.eq(self.i_inc),
         ]
 
+        m.d.comb += self.o_i.eq(phase_acc.o_i)
+
+        # The strobe, delayed to follow the sample through the pipeline; s_stb[0] is high the cycle the new phase is out
+        s_stb = Signal(self.latency + 1)
+        m.d.sync += s_stb.eq(Cat(phase_acc.i_strobe, s_stb))
         m.d.comb += [
-            self.o_a.eq(phase_acc.o_i),
-            self.o_i.eq(phase_acc.o_i)
+            rd.en.eq(s_stb[0]),
+            self.o_stb.eq(s_stb[-1]),
         ]
 
+        k = self.interpolation_bits
+        if k:
+            # 0: address the coarse entry, hold on to the fraction
+            s_frac = Signal(k)
+            m.d.comb += rd.addr.eq(phase_acc.o_i[k:])
+            with m.If(s_stb[0]):
+                m.d.sync += s_frac.eq(phase_acc.o_i[:k])
+
+            # 1: entry is read; scale the slope by the fraction
+            value = rd.data[:self.lut_width]
+            delta = rd.data[self.lut_width:].as_signed()
+            s_value = Signal(self.lut_width)
+            s_product = Signal(signed(self.lut_width + 1 + k + 1))
+            with m.If(s_stb[1]):
+                m.d.sync += [
+                    s_value.eq(value),
+                    s_product.eq(delta * s_frac),
+                ]
+
+            # 2: interpolate
+            with m.If(s_stb[2]):
+                m.d.sync += self.o_a.eq(s_value + (s_product >> k))
+
+        else:
+            m.d.comb += rd.addr.eq(phase_acc.o_i)
+            with m.If(s_stb[1]):
+                m.d.sync += self.o_a.eq(rd.data)
+
         return m
 
     def ports(self):
-        return [
+        bridge = [self.i_bridge_addr, self.i_bridge_wr, self.i_bridge_wr_data] if self.lut_slot else []
+        return bridge + [
             self.i_enable,
             self.i_reset,
-            self.i_f_target,
+            self.i_strobe,
+            self.i_inc if self.mode == "increment" else self.i_f_target,
             self.o_a,
             self.o_i,
+            self.o_stb,
         ]
@@ -0,0 +1,149 @@
+import math
+from amaranth import Elaboratable, Module, Signal, unsigned
+from amaranth.lib.memory import Memory
+
+from .lut import generate_lut
+
+
+class OscillatorBank(Elaboratable):
+    """A bank of time-multiplexed waveform generators.
+
+    Serves n_voices DDS voices from one phase adder and one LUT read port. Each voice's phase and
+    increment (tuning word) live in block RAM; on every i_strobe, the voices are swept round-robin,
+    one per cycle, through a 3 stage pipeline:
+
+        0: read the voice's phase and increment
+        1: write back phase + increment, read the LUT at the top bits of the phase
+        2: register the sample
+
+    Each sample comes out on o_a with its voice on o_voice, and o_valid high. A sweep takes `cycles`
+    clock cycles, which must fit within a sample period (see `modules.strobe.Scheduler.cycles_per_sample`).
+    Strobes during a sweep are ignored; i_strobe is high by default, sweeping back to back.
+
+    Increments are written through i_voice / i_inc / i_we, e.g. inc = (Ft * 2 ** 32) // f_sample;
+    a unison/detune stack is a set of voices with neighbouring increments.
+
+    Parameters
+    ----------
+    n_voices : int
+        The number of voices.
+    lut_width : int
+        The width in bits of the waveform LUT elements.
+    lut_depth : int
+        The word count (# of storage elements) of the waveform LUT.
+    lut_generator : Function(i: int | np.ndarray, width: int, depth: int)
+        A function that will generate the values of the waveform LUT; preferably vectorized over i.
+
+    """
+
+    def __init__(self,
+                 n_voices: int,
+                 lut_width: int,
+                 lut_depth: int,
+                 lut_generator,
+                 ):
+        self.n_voices = n_voices
+        self.lut_width = lut_width
+        self.memory_addr_width = math.ceil(math.log2(lut_depth))
+        self.phase_acc_width = 32
+
+        # Clock cycles per sweep, from strobe to the last voice's sample
+        self.cycles = n_voices + 3
+
+        self.i_strobe = Signal(init=1)
+        self.i_voice = Signal(range(n_voices))
+        self.i_inc = Signal(self.phase_acc_width)
+        self.i_we = Signal()
+
+        self.o_a = Signal(lut_width)
+        self.o_voice = Signal(range(n_voices))
+        self.o_valid = Signal()
+
+        self.lut_depth = lut_depth
+        self.lut_generator = lut_generator
+        self.phase = Memory(shape=unsigned(self.phase_acc_width), depth=n_voices, init=[])
+        self.inc = Memory(shape=unsigned(self.phase_acc_width), depth=n_voices, init=[])
+
+    def elaborate(self, _) -> Module:
+        m = Module()
+
+        # The LUT is only generated (or loaded from the cache) once elaborated
+        # Memory truncates its initial values to the element width
+        mask = (1 << self.lut_width) - 1
+        values = generate_lut(self.lut_generator, self.lut_width, self.lut_depth)
+        m.submodules.lut = lut = Memory(shape=unsigned(self.lut_width), depth=self.lut_depth,
+                                        init=(values & mask).tolist())
+        m.submodules.phase = self.phase
+        m.submodules.inc = self.inc
+
+        lut_rd = lut.read_port()
+        phase_rd = self.phase.read_port()
+        phase_wr = self.phase.write_port()
+        inc_rd = self.inc.read_port()
+        inc_wr = self.inc.write_port()
+
+        m.d.comb += [
+            inc_wr.addr.eq(self.i_voice),
+            inc_wr.data.eq(self.i_inc),
+            inc_wr.en.eq(self.i_we),
+        ]
+
+        # Sweep
+        s_busy = Signal()
+        s_voice = Signal(range(self.n_voices))
+        with m.If(self.i_strobe & ~s_busy):
+            m.d.sync += [
+                s_busy.eq(1),
+                s_voice.eq(0),
+            ]
+        with m.Elif(s_busy):
+            with m.If(s_voice == self.n_voices - 1):
+                m.d.sync += s_busy.eq(0)
+            with m.Else():
+                m.d.sync += s_voice.eq(s_voice + 1)
+
+        # 0: read the voice's phase and increment
+        s_voice_1 = Signal.like(s_voice)
+        s_valid_1 = Signal()
+        m.d.comb += [
+            phase_rd.addr.eq(s_voice),
+            inc_rd.addr.eq(s_voice),
+        ]
+        m.d.sync += [
+            s_voice_1.eq(s_voice),
+            s_valid_1.eq(s_busy),
+        ]
+
+        # 1: accumulate, look up the sample
+        s_voice_2 = Signal.like(s_voice)
+        s_valid_2 = Signal()
+        m.d.comb += [
+            phase_wr.addr.eq(s_voice_1),
+            phase_wr.data.eq(phase_rd.data + inc_rd.data),
+            phase_wr.en.eq(s_valid_1),
+            lut_rd.addr.eq(phase_rd.data[-self.memory_addr_width:]),
+        ]
+        m.d.sync += [
+            s_voice_2.eq(s_voice_1),
+            s_valid_2.eq(s_valid_1),
+        ]
+
+        # 2: register the sample
+        m.d.sync += [
+            self.o_a.eq(lut_rd.data),
+            self.o_voice.eq(s_voice_2),
+            self.o_valid.eq(s_valid_2),
+        ]
+
+        return m
+
+    def ports(self):
+        return [
+            self.i_strobe,
+            self.i_voice,
+            self.i_inc,
+            self.i_we,
+            self.o_a,
+            self.o_voice,
+            self.o_valid,
+        ]
@@ -1,17 +1,69 @@
 from amaranth import Elaboratable, Module, Signal
 
 
+def reciprocal(f_clk: int, acc_width: int, f_width: int) -> tuple[int, int]:
+    """A constant reciprocal of the clock frequency, for division-free tuning words.
+
+    Finds the smallest shift s, and r = ceil(2 ** (acc_width + s) / f_clk), such that
+
+        (f * r) >> s == (f * 2 ** acc_width) // f_clk
+
+    holds for every f below 2 ** f_width. With e = r * f_clk - 2 ** (acc_width + s), the product
+    overshoots the exact quotient by f * e / (f_clk * 2 ** s); that's harmless as long as it never
+    carries the quotient's fractional part, ((f * 2 ** acc_width) % f_clk) / f_clk, past the next integer.
+
+    Returns
+    -------
+    (r, s)
+    """
+    residues = [(f << acc_width) % f_clk for f in range(1 << f_width)]
+
+    shift = 0
+    while True:
+        r = -(-(1 << (acc_width + shift)) // f_clk)
+        e = r * f_clk - (1 << (acc_width + shift))
+        bound = f_clk << shift
+        if all((res << shift) + f * e < bound for f, res in enumerate(residues)):
+            return r, shift
+        shift += 1
+
+
 class PhaseAccumulator(Elaboratable):
     """A phase accumulator for DDS.
+
+    The accumulator advances on every cycle i_strobe is high (by default, every cycle).
+    When i_strobe is driven by a clock enable (see `modules.strobe.Scheduler`), f_clk is the strobe rate.
+
+    Parameters
+    ----------
+    f_clk : int
+        The clock frequency (or strobe rate) the accumulator advances at.
+    output_width : int
+        The width in bits of the phase output.
+    mode : str
+        How the tuning word is derived from the target frequency.
+        "divide" uses a combinational divider; o_inc follows i_f_target in the same cycle.
+        "reciprocal" multiplies by a constant reciprocal of f_clk (see `reciprocal`) in a registered
+        pipeline; 16 x 37 bits at 100 MHz, wider than one DSP block (three, by `fixed.dsp_blocks`).
+        o_inc is bit-identical, but lags i_f_target by `latency` cycles.
+        "increment" takes the tuning word itself, on i_inc (e.g. from `modules.cv.TuningWord`, through
+        `modules.cv.Slide`); no divide, no multiply.
+
     """
 
-    def __init__(self, f_clk: int, output_width: int):
+    def __init__(self, f_clk: int, output_width: int, mode: str = "divide"):
+        if mode not in ("divide", "reciprocal", "increment"):
+            raise ValueError(f"Unknown tuning word mode '{mode}'")
+
         self.output_width = output_width
         self.phase_acc_width = 32
+        self.mode = mode
 
         self.i_enable = Signal()
         self.i_reset = Signal()
+        self.i_strobe = Signal(init=1)
         self.i_f_target = Signal(16)
+        self.i_inc = Signal(self.phase_acc_width)
 
         self.o_inc = Signal(self.phase_acc_width)
         self.o_i = Signal(output_width)
@@ -20,6 +72,9 @@ class PhaseAccumulator(Elaboratable):
 
         self.f_clk = f_clk
 
+        # Cycles from i_f_target (or i_inc) to o_inc
+        self.latency = 2 if mode == "reciprocal" else 0
+
     def elaborate(self, _) -> Module:
         """
         To achieve a target frequency Ft,
@@ -30,16 +85,35 @@ class PhaseAccumulator(Elaboratable):
         """
         m = Module()
 
+        if self.mode == "reciprocal":
+            r, shift = reciprocal(self.f_clk, self.phase_acc_width, len(self.i_f_target))
+
+            # Registered multiplier inputs and output, so the multiply (split across its DSP blocks) is
+            # pipelined off the accumulator's path
+            s_f_target = Signal.like(self.i_f_target)
+            s_product = Signal(len(self.i_f_target) + r.bit_length())
+            m.d.sync += [
+                s_f_target.eq(self.i_f_target),
+                s_product.eq(s_f_target * r),
+            ]
+            inc = s_product[shift:]
+
+        elif self.mode == "increment":
+            inc = self.i_inc
+
+        else:
+            inc = (self.i_f_target * (1 << self.phase_acc_width)) // self.f_clk
+
         with m.If(self.i_reset):
             m.d.sync += self.s_phase_acc.eq(0)
 
         with m.Elif(self.i_enable):
-            m.d.comb += self.o_inc.eq((self.i_f_target *
-                                       (1 << self.phase_acc_width)) // self.f_clk)
+            m.d.comb += self.o_inc.eq(inc)
 
             m.d.comb += self.o_i.eq(self.s_phase_acc[-self.output_width:])
 
-        m.d.sync += self.s_phase_acc.eq(self.s_phase_acc + self.o_inc)
+            with m.If(self.i_strobe):
+                m.d.sync += self.s_phase_acc.eq(self.s_phase_acc + self.o_inc)
 
         return m
 
@@ -47,7 +121,8 @@ class PhaseAccumulator(Elaboratable):
         return [
             self.i_enable,
             self.i_reset,
-            self.i_f_target,
+            self.i_strobe,
+            self.i_inc if self.mode == "increment" else self.i_f_target,
             self.o_inc,
             self.o_i,
         ]
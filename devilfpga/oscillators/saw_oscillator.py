@@ -1,28 +1,28 @@
-import math
+import numpy as np
 from .oscillator import Oscillator
+from ..modules.bridge import DataSlot
 
 import matplotlib.pyplot as plt
 
 N_SAMPLES_RISING = 7.0 / 9.0
 
 
-def identity(i: int, width: int, depth: int):
-    return math.ceil(i * (2 ** width - 1) / (2 ** depth - 1))
+def identity(i, width: int, depth: int):
+    return np.ceil(i * (2 ** width - 1) / (2 ** depth - 1)).astype(np.int64)
 
 
-def saw(i: int, width: int, depth: int):
+def saw(i, width: int, depth: int):
+    """The TB-303 saw, sampled at index (or NumPy array of indices) i."""
     a = 2.0 ** width
     n_samples = 2 ** depth - 1
     n_rise = min(max(int(N_SAMPLES_RISING * n_samples - 1), 1), n_samples - 1)
     n_fall = n_samples - n_rise
 
-    m = -a / (n_rise - 1.0)
-    b = a
-    if i >= n_rise:
-        m = a / (n_fall + 1.0)
-        b = -a / (n_fall + 1.0) * (n_rise - 1.0)
+    rising = np.asarray(i) < n_rise
+    m = np.where(rising, -a / (n_rise - 1.0), a / (n_fall + 1.0))
+    b = np.where(rising, a, -a / (n_fall + 1.0) * (n_rise - 1.0))
 
-    return math.ceil(m * i + b)
+    return np.ceil(m * i + b).astype(np.int64)
 
 
 class SawOscillator(Oscillator):
@@ -41,10 +41,17 @@ class SawOscillator(Oscillator):
         The width in bits of the waveform LUT elements.
     lut_depth : int
         The word count (# of storage elements) of the waveform LUT.
+    interpolation_bits : int
+        The number of phase bits used to interpolate between the stored entries; 0 stores the full table.
+    lut_slot : DataSlot
+        The data slot to load the table from, if any.
+    mode : str
+        The phase accumulator's tuning word mode; "divide", "reciprocal" or "increment".
     """
 
-    def __init__(self, f_clk: int, lut_width: int, lut_depth: int):
-        super().__init__(f_clk, lut_width, lut_depth, saw)
+    def __init__(self, f_clk: int, lut_width: int, lut_depth: int, interpolation_bits: int = 0,
+                 lut_slot: DataSlot = None, mode: str = "divide"):
+        super().__init__(f_clk, lut_width, lut_depth, saw, interpolation_bits, lut_slot, mode)
 
 
 def plot_saw_oscillator():
@@ -0,0 +1,228 @@
+"""Renders note patterns through the reference model of the voice (`model.voice.Voice`), to WAV.
+
+A pattern is a loop of 16th-note steps, separated by spaces; each step is a note name and octave (A1 - E5,
+as on the TB-303's keyboard, see `modules.cv.NoteWord`), optionally followed by `a` (accent) and/or `s` (slide
+into the step from the previous note), or a rest (`.`):
+
+    C2 C2a D#2 . G1s C3as . A#2
+
+Audio is rendered, and written out, one chunk at a time, so memory doesn't grow with the length of the render.
+"""
+import contextlib
+import itertools
+import math
+import os
+import re
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+import numpy as np
+
+from .model.cv import Slide
+from .model.vco import F_C1, F_E5
+from .model.voice import Voice
+from .modules.cv import NOTE_C1, NOTE_E5
+
+NOTES = ["A", "A#", "B", "C", "C#", "D", "D#", "E", "F", "F#", "G", "G#"]
+STEP = re.compile(r"^(?P<note>[A-G]#?)(?P<octave>[1-5])(?P<flags>[as]*)$")
+
+
+@dataclass(frozen=True)
+class Step:
+    note: int | None  # the NoteWord value; None for a rest
+    accent: bool = False
+    slide: bool = False
+
+
+def note_word(name: str, octave: int) -> int:
+    """The 6-bit note value (see `modules.cv.NoteWord`) of a note name in octave 1 - 5."""
+    return NOTES.index(name) + octave * 12 - 4
+
+
+def parse_pattern(text: str) -> list[Step]:
+    steps = []
+    for token in text.split():
+        if token in (".", "-"):
+            steps.append(Step(None))
+            continue
+
+        match = STEP.match(token)
+        if match is None:
+            raise ValueError(f"Invalid step {token!r}; expected e.g. C2, D#3a, G1s, or . for a rest")
+        note = note_word(match["note"], int(match["octave"]))
+        if note > NOTE_E5:
+            raise ValueError(f"Step {token!r} is above E5")
+        steps.append(Step(note, "a" in match["flags"], "s" in match["flags"]))
+
+    if not steps:
+        raise ValueError("Empty pattern")
+    return steps
+
+
+def note_cv(note: int, width: int = 16) -> int:
+    """The pitch CV of a note value; exponential from C1 (0) to E5 (max), as the VCO's `Antilog` maps it.
+
+    Notes below C1 pin to C1.
+    """
+    octaves = math.log2(F_E5 / F_C1)
+    semitones = max(note - NOTE_C1, 0)
+    return min(round(semitones / 12 / octaves * (1 << width)), (1 << width) - 1)
+
+
+@dataclass(frozen=True)
+class Render:
+    """One render job; a pattern, and the voice's settings."""
+    pattern: str
+    output: Path
+    tempo: float = 120.0        # BPM; four steps per beat
+    loops: int = 1
+    cutoff: float = 800.0       # Hz
+    resonance: float = 2.0      # 0 - 4; 4 self-oscillates
+    env_mod: float = 2.0        # peak cutoff, as a multiple of the cutoff
+    decay: float = 0.2          # s; envelope time constant
+    gate: float = 0.5           # fraction of the step the gate is held
+    accent: float = 1.5         # envelope peak of an accented step
+    f_sample: int = 48_000
+    chunk: int = 8192           # samples per block
+
+
+class Envelopes:
+    """Per-sample controls of a pattern: the pitch CV, the VCA gain (Q16) and the cutoff (Q0.16).
+
+    Each note restarts a decaying envelope (unless it is slid into, so tied to the previous note), which
+    opens the VCA while the gate is held, and sweeps the cutoff up by env_mod. Accents raise its peak.
+    """
+
+    def __init__(self, job: Render, steps: list[Step], cv_width: int = 16):
+        self.job = job
+        self.samples_per_step = job.f_sample * 60 / job.tempo / 4
+        self.length = round(len(steps) * job.loops * self.samples_per_step)
+
+        n = len(steps)
+        # Step i is tied to (continues the envelope of) the note it slides from
+        self.onset = np.arange(n)
+        for i, step in enumerate(steps):
+            if i > 0 and step.slide and step.note is not None and steps[i - 1].note is not None:
+                self.onset[i] = self.onset[i - 1]
+        onset_steps = [steps[i] for i in self.onset]
+
+        # The gate is held through the step when the next note slides in
+        tied = [steps[(i + 1) % n].slide and steps[(i + 1) % n].note is not None for i in range(n)]
+        self.gate = np.array([1.0 if t else job.gate for t in tied])
+        self.note = np.array([step.note is not None for step in steps])
+        self.peak = np.array([job.accent if step.accent else 1.0 for step in onset_steps])
+        self.cv = np.array([note_cv(step.note or 0, cv_width) for step in steps], dtype=np.int64)
+        self.slide = np.array([step.slide for step in steps])
+        self.n_steps = n
+
+        self.pitch = Slide(cv_width, shift=11)
+
+    def block(self, start: int, stop: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        job = self.job
+        t = np.arange(start, stop)
+        position = t / self.samples_per_step
+        index = position.astype(np.int64)
+        step = index % self.n_steps
+
+        # Time since the onset of the (tied) note, and within the step
+        since = (position - (index - (step - self.onset[step]))) / job.f_sample * self.samples_per_step
+        phase = position - index
+        # A 2 ms release at the end of the gate, unless it's held into the next step
+        release = (self.gate[step] - phase) * self.samples_per_step / (0.002 * job.f_sample)
+        ramp = np.where(self.gate[step] >= 1, 1.0, np.clip(release, 0, 1))
+        env = np.where(self.note[step], self.peak[step] * np.exp(-since / job.decay) * ramp, 0.0)
+
+        gain = np.round(np.minimum(env, 2) * (1 << 16)).astype(np.int64)
+        fc = job.cutoff * (1 + job.env_mod * env)
+        cutoff = np.round(np.minimum(2 * np.pi * fc / job.f_sample, 0.99) * (1 << 16)).astype(np.int64)
+        cv = self.pitch.process(self.cv[step], self.slide[step])
+
+        return cv, gain, cutoff
+
+
+def render(job: Render) -> Path:
+    """Renders a pattern to a 16-bit mono WAV file, one chunk at a time."""
+    return render_batch([job])[0]
+
+
+def render_batch(jobs: list[Render]) -> list[Path]:
+    """Renders patterns together, one voice (a column of the model's blocks) each; as `render` does each of them.
+
+    The jobs must share a sample rate and chunk size; those that end early are padded with silence, which isn't
+    written out.
+    """
+    f_sample, chunk = jobs[0].f_sample, jobs[0].chunk
+    if any((job.f_sample, job.chunk) != (f_sample, chunk) for job in jobs):
+        raise ValueError("Jobs rendered together must share a sample rate and chunk size")
+
+    voice = Voice(f_sample=f_sample, voices=len(jobs))
+    envelopes = [Envelopes(job, parse_pattern(job.pattern)) for job in jobs]
+    resonance = np.array([min(round(job.resonance * (1 << 14)), (1 << 16) - 1) for job in jobs])
+    length = max(e.length for e in envelopes)
+
+    with contextlib.ExitStack() as stack:
+        files = []
+        for job in jobs:
+            job.output.parent.mkdir(parents=True, exist_ok=True)
+            f = stack.enter_context(wave.open(str(job.output), "wb"))
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(f_sample)
+            files.append(f)
+
+        for start in range(0, length, chunk):
+            stop = min(start + chunk, length)
+            # cv, gain and cutoff; samples x voices
+            controls = np.zeros((3, stop - start, len(jobs)), dtype=np.int64)
+            for j, e in enumerate(envelopes):
+                if start < e.length:
+                    controls[:, :min(stop, e.length) - start, j] = e.block(start, min(stop, e.length))
+            cv, gain, cutoff = controls
+            if len(jobs) == 1:
+                audio = voice.process(cv[:, 0], cutoff[:, 0], resonance[0], gain[:, 0])[:, np.newaxis]
+            else:
+                audio = voice.process(cv, cutoff, resonance, gain)
+
+            for j, (f, e) in enumerate(zip(files, envelopes)):
+                if start < e.length:
+                    f.writeframes(audio[:min(stop, e.length) - start, j].astype("<i2").tobytes())
+
+    return [job.output for job in jobs]
+
+
+def render_all(jobs: list[Render], workers: int | None = None, batch: int = 16):
+    """Renders the jobs in parallel, in batches (see `render_batch`) of up to `batch` per process; yields each job
+    once its file is written."""
+    workers = workers or os.cpu_count() or 1
+    batches = []
+    for _, group in itertools.groupby(sorted(jobs, key=lambda job: (job.f_sample, job.chunk)),
+                                      key=lambda job: (job.f_sample, job.chunk)):
+        group = list(group)
+        # Smaller batches, so there's one for each worker
+        size = max(1, min(batch, math.ceil(len(group) / workers)))
+        batches += [group[i:i + size] for i in range(0, len(group), size)]
+
+    if workers == 1 or len(batches) == 1:
+        for group in batches:
+            render_batch(group)
+            yield from group
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for group, _ in zip(batches, pool.map(render_batch, batches)):
+            yield from group
+
+
+def jobs(patterns: list[str], output: Path, settings: dict, **kwargs) -> list[Render]:
+    """One job per pattern and combination of settings (each a list of values), written to output/."""
+    names = list(settings)
+    combinations = list(itertools.product(*settings.values()))
+    result = []
+    for i, pattern in enumerate(patterns):
+        for j, values in enumerate(combinations):
+            name = f"{i:03d}" if len(combinations) == 1 else f"{i:03d}_{j:03d}"
+            job = Render(pattern, output / f"{name}.wav", **kwargs)
+            result.append(replace(job, **dict(zip(names, values))))
+    return result
@@ -0,0 +1,219 @@
+"""Compiled simulation; designs converted with CXXRTL, built to a shared library and driven through its C API.
+
+The libraries are cached by source, alongside the LUT cache, so a design is only compiled once.
+"""
+import ctypes
+import hashlib
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+
+from amaranth import Const, Fragment, Signal, Value
+from amaranth.back import cxxrtl
+
+from .oscillators.lut import cache_dir
+
+
+def testbench(bench, domain: str = "sync"):
+    """Adapts a generator bench to `Simulator.add_testbench`.
+
+    The bench yields `signal.eq(value)` to write a signal, a value to read it, or None to wait for a clock
+    edge. Its writes take effect after the next edge, and its reads see the settled state after the last one;
+    the timing of the (deprecated) sync processes, and of `CxxrtlSimulator`.
+    """
+    async def run(ctx):
+        gen = bench()
+        writes = []
+        response = None
+        while True:
+            try:
+                command = gen.send(response)
+            except StopIteration:
+                return
+
+            response = None
+            if command is None:
+                await ctx.tick(domain)
+                for signal, value in writes:
+                    ctx.set(signal, value)
+                writes = []
+            elif isinstance(command, Value):
+                response = ctx.get(command)
+            else:
+                writes.append((command.lhs, ctx.get(command.rhs)))
+    return run
+
+
+def cxxrtl_include_dir() -> Path:
+    """The CXXRTL runtime headers bundled with the amaranth-yosys package."""
+    import amaranth_yosys
+    return Path(amaranth_yosys.__file__).parent / "share" / "include" / "backends" / "cxxrtl" / "runtime"
+
+
+def cxxrtl_build(source: str) -> Path:
+    """Compile CXXRTL source to a shared library; cached by source, alongside the LUT cache."""
+    key = hashlib.sha256(source.encode()).hexdigest()[:16]
+    path = cache_dir().parent / "cxxrtl" / f"{key}.so"
+    if path.exists():
+        return path
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=path.parent) as tmp:
+        cc = Path(tmp) / "design.cc"
+        cc.write_text(source)
+        so = Path(tmp) / "design.so"
+        subprocess.run(
+            [os.environ.get("CXX", "g++"), "-std=c++14", "-O1", "-shared", "-fPIC",
+             f"-I{cxxrtl_include_dir()}", "-DCXXRTL_INCLUDE_CAPI_IMPL", str(cc), "-o", str(so)],
+            check=True,
+        )
+        os.replace(so, path)
+    return path
+
+
+class _CxxrtlObject(ctypes.Structure):
+    _fields_ = [
+        ("type", ctypes.c_uint32),
+        ("flags", ctypes.c_uint32),
+        ("width", ctypes.c_size_t),
+        ("lsb_at", ctypes.c_size_t),
+        ("depth", ctypes.c_size_t),
+        ("zero_at", ctypes.c_size_t),
+        ("curr", ctypes.POINTER(ctypes.c_uint32)),
+        ("next", ctypes.POINTER(ctypes.c_uint32)),
+        ("outline", ctypes.c_void_p),
+        ("attrs", ctypes.c_void_p),
+    ]
+
+
+CXXRTL_INPUT = 1 << 0
+
+
+class CxxrtlSimulator:
+    """Runs generator benches (as `testbench` adapts them) against a design compiled with CXXRTL.
+
+    Benches may yield `signal.eq(value)`, a signal to read, or None for a clock edge. As in Amaranth's
+    simulator, writes take effect after the next edge, and reads see the settled state after the last one.
+
+    Parameters
+    ----------
+    dut : Elaboratable
+        The design under test; only its sync domain is clocked.
+
+    """
+
+    def __init__(self, dut):
+        # Name the ports uniquely, so ports shared with submodules are reachable at the top
+        ports = [(f"port{i}_{signal.name}", signal, None) for i, signal in enumerate(dut.ports())]
+        fragment = Fragment.get(dut, None)
+        source, name_map = cxxrtl.convert_fragment(fragment, ports=ports)
+
+        self.lib = ctypes.CDLL(str(cxxrtl_build(source)))
+        self.lib.cxxrtl_design_create.restype = ctypes.c_void_p
+        self.lib.cxxrtl_create.restype = ctypes.c_void_p
+        self.lib.cxxrtl_create.argtypes = [ctypes.c_void_p]
+        self.lib.cxxrtl_destroy.argtypes = [ctypes.c_void_p]
+        self.lib.cxxrtl_step.argtypes = [ctypes.c_void_p]
+        self.lib.cxxrtl_get_parts.restype = ctypes.POINTER(_CxxrtlObject)
+        self.lib.cxxrtl_get_parts.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.POINTER(ctypes.c_size_t)]
+        self.lib.cxxrtl_outline_eval.argtypes = [ctypes.c_void_p]
+
+        self.handle = self.lib.cxxrtl_create(self.lib.cxxrtl_design_create())
+        # Signals aren't hashable; keyed by identity
+        self.signals = {id(signal): signal for signal in name_map}
+        self.names = {id(signal): " ".join(path[1:]) for signal, path in name_map.items()}
+        for name, signal, _ in ports:
+            self.signals[id(signal)] = signal
+            self.names[id(signal)] = name
+        self.objects = {}
+
+        self.clk = self._get("clk")
+        for signal in self.signals.values():
+            obj = self._lookup(signal)
+            if obj is not None and obj.flags & CXXRTL_INPUT and signal.name not in ("clk", "rst"):
+                self._write(signal, signal.init)
+        self.lib.cxxrtl_step(self.handle)
+
+    def _get(self, name: str):
+        n_parts = ctypes.c_size_t()
+        obj = self.lib.cxxrtl_get_parts(self.handle, name.encode(), ctypes.byref(n_parts))
+        if not obj or n_parts.value != 1:
+            return None
+        return obj.contents
+
+    def _lookup(self, signal: Signal):
+        if id(signal) not in self.objects:
+            name = self.names.get(id(signal))
+            self.objects[id(signal)] = self._get(name) if name is not None else None
+        return self.objects[id(signal)]
+
+    def _read(self, signal: Signal) -> int:
+        obj = self._lookup(signal)
+        if obj is None:
+            raise KeyError(f"Signal {signal.name!r} is not visible in the compiled design")
+        if obj.outline:
+            self.lib.cxxrtl_outline_eval(obj.outline)
+
+        value = 0
+        for i in range((obj.width + 31) // 32):
+            value |= obj.curr[i] << (32 * i)
+        if signal.shape().signed and value >> (obj.width - 1):
+            value -= 1 << obj.width
+        return value
+
+    def _write(self, signal: Signal, value: int):
+        obj = self._lookup(signal)
+        if obj is None:
+            raise KeyError(f"Signal {signal.name!r} is not visible in the compiled design")
+
+        value &= (1 << obj.width) - 1
+        for i in range((obj.width + 31) // 32):
+            obj.next[i] = (value >> (32 * i)) & 0xFFFF_FFFF
+
+    def tick(self, writes: list):
+        self.clk.next[0] = 1
+        self.lib.cxxrtl_step(self.handle)
+        for signal, value in writes:
+            self._write(signal, value)
+        self.clk.next[0] = 0
+        self.lib.cxxrtl_step(self.handle)
+
+    def run(self, benches: list):
+        """Run the benches, round-robin, until they all return."""
+        gens = [bench() for bench in benches]
+        responses = [None] * len(gens)
+        while gens:
+            writes = []
+            for i, gen in enumerate(gens):
+                response = responses[i]
+                while True:
+                    try:
+                        command = gen.send(response)
+                    except StopIteration:
+                        gens[i] = None
+                        break
+
+                    if command is None:
+                        responses[i] = None
+                        break
+                    elif isinstance(command, Signal):
+                        response = self._read(command)
+                    elif isinstance(command, Value) or not hasattr(command, "lhs"):
+                        raise TypeError(f"Unsupported command {command!r}")
+                    else:
+                        if not isinstance(command.lhs, Signal):
+                            raise TypeError(f"Can only assign to signals, not {command.lhs!r}")
+                        if not isinstance(command.rhs, Const):
+                            raise TypeError(f"Can only assign constants, not {command.rhs!r}")
+                        writes.append((command.lhs, command.rhs.value))
+                        response = None
+
+            responses = [response for gen, response in zip(gens, responses) if gen is not None]
+            gens = [gen for gen in gens if gen is not None]
+            if gens:
+                self.tick(writes)
+
+    def __del__(self):
+        if getattr(self, "handle", None):
+            self.lib.cxxrtl_destroy(self.handle)
@@ -0,0 +1,94 @@
+"""Packages the core's data slots; the tables the Pocket loads over the bridge at boot (see `Core(data_slots=True)`).
+
+    python -m devilfpga.slots [--dist open-fpga/dist] [--core-dir open-fpga]
+
+Run after packaging a data-slot build's bitstream (`make package-slots`). Each table is written into the
+distribution's assets, as a binary file of one 32-bit big-endian word per entry, and its slot is defined in the
+packaged core's data.json (Cores/<author>.<shortname>/data.json). The data.json in the core directory, which
+ships with builds that have the tables in the bitstream, is left as it is.
+A table change only needs the files rewritten, not a new bitstream.
+"""
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+
+from .core import slot_tables
+
+ROOT = Path(__file__).parents[1]
+OPEN_FPGA_DIR = ROOT / "open-fpga"
+# The platform folder the assets are written under, in the distribution
+PLATFORM = "devilfpga"
+
+
+def pack(entries) -> bytes:
+    """A table as a data slot file; one big-endian 32-bit word per entry, as the bridge writes them."""
+    entries = np.asarray(entries, dtype=np.int64)
+    if entries.size and (entries.min() < 0 or entries.max() >= 1 << 32):
+        raise ValueError("Table entries must fit in an unsigned 32-bit word")
+    return entries.astype(">u4").tobytes()
+
+
+def define(data: dict, tables: dict) -> dict:
+    """data.json with the slots of tables defined; other slots are kept, those with the same id replaced."""
+    ids = {slot.id for slot in tables}
+    slots = [slot for slot in data["data"]["data_slots"] if slot["id"] not in ids]
+    slots += [slot.definition(len(entries)) for slot, entries in tables.items()]
+    return {**data, "data": {**data["data"], "data_slots": sorted(slots, key=lambda slot: slot["id"])}}
+
+
+def core_folder(core_dir: Path, dist: Path) -> Path:
+    """The core's folder in the distribution, as core.json names it; Cores/<author>.<shortname>."""
+    metadata = json.loads((Path(core_dir) / "core.json").read_text())["core"]["metadata"]
+    return Path(dist) / "Cores" / f"{metadata['author']}.{metadata['shortname']}"
+
+
+def write_slots(tables: dict = None, dist: Path = None, core_dir: Path = OPEN_FPGA_DIR, log=print) -> list[Path]:
+    """Writes the tables into dist's assets, and the packaged data.json defining their slots; returns the files written.
+
+    Parameters
+    ----------
+    tables : dict
+        The tables, by slot; those of `Core(data_slots=True)` (see `slot_tables`) by default.
+    dist : Path
+        The distribution directory; <core_dir>/dist by default.
+    core_dir : Path
+        The directory of core.json and data.json.
+
+    """
+    tables = slot_tables() if tables is None else tables
+    core_dir = Path(core_dir)
+    dist = core_dir / "dist" if dist is None else Path(dist)
+
+    assets = dist / "Assets" / PLATFORM / "common"
+    assets.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for slot, entries in tables.items():
+        path = assets / slot.filename
+        path.write_bytes(pack(entries))
+        paths.append(path)
+        log(f"{slot.name}: {len(entries)} entries to {path}")
+
+    folder = core_folder(core_dir, dist)
+    folder.mkdir(parents=True, exist_ok=True)
+    data = define(json.loads((core_dir / "data.json").read_text()), tables)
+    # CRLF, as the definitions in the core directory
+    (folder / "data.json").write_text(json.dumps(data, indent=4) + "\n", newline="\r\n")
+    paths.append(folder / "data.json")
+
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Write the core's tables as data slot files into the distribution, and define the slots")
+    parser.add_argument("--dist", type=Path, help="Distribution directory (default: <core-dir>/dist)")
+    parser.add_argument("--core-dir", type=Path, default=OPEN_FPGA_DIR, help="Directory of core.json et al.")
+    args = parser.parse_args(argv)
+
+    write_slots(dist=args.dist, core_dir=args.core_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import functools
+import os
+import re
+import shutil
+from pathlib import Path
+
+import pytest
+
+from .harness import SimCache, simulate as _simulate
+
+ARTIFACT_DIR = Path(__file__).parents[2] / "sim"
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "compiled: run on the compiled (CXXRTL) simulator backend")
+
+
+@pytest.fixture
+def artifacts(request) -> Path:
+    """A directory of this test's own, for waveforms and other outputs; emptied at the start of the test.
+
+    Under sim/ at the repository root, or DEVILFPGA_ARTIFACT_DIR; one directory per test, so parallel runs
+    (pytest-xdist) don't clobber each other.
+    """
+    root = Path(os.environ.get("DEVILFPGA_ARTIFACT_DIR", ARTIFACT_DIR))
+    path = root / re.sub(r"[^\w.-]+", "_", request.node.nodeid)
+    shutil.rmtree(path, ignore_errors=True)
+    path.mkdir(parents=True)
+    return path
+
+
+@pytest.fixture
+def simulate(request):
+    """`harness.simulate`, on the compiled backend for tests marked `compiled`, and cached.
+
+    Set DEVILFPGA_VCD=1 to write sim.vcd to each test's artifact directory (bypassing the cache),
+    DEVILFPGA_SIM_BACKEND to pick the default backend, and DEVILFPGA_SIM_CACHE=0 to always simulate.
+    """
+    backend = "cxxrtl" if request.node.get_closest_marker("compiled") else None
+    vcd = request.getfixturevalue("artifacts") / "sim.vcd" if os.environ.get("DEVILFPGA_VCD") else None
+    cache = None if os.environ.get("DEVILFPGA_SIM_CACHE") == "0" else SimCache()
+    return functools.partial(_simulate, backend=backend, vcd=vcd, cache=cache)
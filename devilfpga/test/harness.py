@@ -0,0 +1,479 @@
+import copy
+import hashlib
+import os
+import pickle
+import tempfile
+import wave
+from pathlib import Path
+
+import numpy as np
+from amaranth import Fragment, Signal, Value
+from amaranth.back import rtlil
+from amaranth.sim import Simulator
+from vcd import VCDWriter
+from vcd.reader import TokenKind, tokenize
+
+from ..fingerprint import fingerprint
+from ..oscillators.lut import cache_dir
+from ..sim import CxxrtlSimulator, testbench
+
+BACKENDS = ("pysim", "cxxrtl")
+
+
+def default_backend() -> str:
+    """The backend tests run on unless they ask for one; set by the DEVILFPGA_SIM_BACKEND environment variable."""
+    backend = os.environ.get("DEVILFPGA_SIM_BACKEND", "pysim")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown simulator backend {backend!r}; expected one of {BACKENDS}")
+    return backend
+
+
+def simulate(dut,
+             *benches,
+             clocks: dict = None,
+             vcd: str | Path = None,
+             traces: list = None,
+             window: tuple[int, int] = None,
+             backend: str = None,
+             cache: "SimCache" = None,
+             ):
+    """Simulate dut, driven by one or more generator benches, until they all return.
+
+    Benches run in the `sync` domain, unless given as a (domain, bench) tuple. Waveforms are only written
+    when vcd is given: every signal in the design, or only `traces` (signals), and only for the sync clock
+    cycles in `window` (start, stop), if given.
+
+    Parameters
+    ----------
+    dut : Elaboratable
+        The design under test.
+    benches : callable | tuple[str, callable]
+        Generator functions, run as `devilfpga.sim.testbench` adapts them.
+    clocks : dict
+        The clock period (s) of each domain; defaults to 10 ns on `sync`.
+    vcd : str | Path
+        The VCD file to write, if any.
+    traces : list
+        The signals to write to the VCD file; defaults to all signals (pysim) or to dut.ports() (cxxrtl).
+    window : tuple[int, int]
+        The sync clock cycles [start, stop) to write to the VCD file; defaults to all of them.
+    backend : str
+        "pysim" (Amaranth's Python simulator) or "cxxrtl" (compiled; sync domain only).
+        Defaults to `default_backend()`, where the design has only the sync domain.
+    cache : SimCache
+        If given, and no VCD is written, a run of the same design with the same benches is replayed from the
+        cache instead of simulated.
+
+    """
+    clocks = clocks or {"sync": 1e-8}
+    benches = [bench if isinstance(bench, tuple) else ("sync", bench) for bench in benches]
+    single_domain = set(clocks) == {"sync"} and all(domain == "sync" for domain, _ in benches)
+    if backend is None:
+        # The default only applies where it can
+        backend = default_backend() if single_domain else "pysim"
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown simulator backend {backend!r}; expected one of {BACKENDS}")
+    if backend == "cxxrtl" and not single_domain:
+        raise ValueError("The cxxrtl backend only simulates the sync domain")
+
+    if cache is not None and vcd is None:
+        key = cache.key(dut, benches, clocks)
+        recording = cache.load(key)
+        if recording is not None:
+            Fragment.get(dut, None)     # as a simulation would; nothing is left unelaborated
+            replay([bench for _, bench in benches], recording)
+            return
+
+        recorders = [Recorder(bench) for _, bench in benches]
+        benches = [(domain, recorder.wrap()) for (domain, _), recorder in zip(benches, recorders)]
+        simulate(dut, *benches, clocks=clocks, backend=backend)
+        cache.store(key, [(recorder.digest.hexdigest(), recorder.reads) for recorder in recorders])
+        return
+
+    tracer = None
+    if vcd is not None and (traces is not None or window is not None or backend == "cxxrtl"):
+        tracer = Tracer(vcd, traces if traces is not None else dut.ports(), clocks["sync"], window)
+        # Sample after each tick of the first sync bench
+        i = next(i for i, (domain, _) in enumerate(benches) if domain == "sync")
+        benches[i] = ("sync", tracer.wrap(benches[i][1]))
+
+    try:
+        if backend == "cxxrtl":
+            CxxrtlSimulator(dut).run([bench for _, bench in benches])
+            return
+
+        sim = Simulator(dut)
+        for domain, period in clocks.items():
+            sim.add_clock(period, domain=domain)
+        for domain, bench in benches:
+            sim.add_testbench(testbench(bench, domain))
+
+        if vcd is not None and tracer is None:
+            with sim.write_vcd(str(vcd)):
+                sim.run()
+        else:
+            sim.run()
+    finally:
+        if tracer is not None:
+            tracer.close()
+
+
+class Recorder:
+    """Records what a bench reads, and a digest of everything it does, for `SimCache`."""
+
+    def __init__(self, bench):
+        self.bench = bench
+        self.digest = hashlib.sha256()
+        self.reads = []
+
+    def wrap(self):
+        def recorded():
+            gen = self.bench()
+            response = None
+            while True:
+                try:
+                    command = gen.send(response)
+                except StopIteration:
+                    return
+                self.digest.update(repr(command).encode())
+                response = yield command
+                if isinstance(command, Value):
+                    self.reads.append(response)
+        return recorded
+
+
+def replay(benches: list, recording: list):
+    """Run benches against a recording of an earlier simulation, without simulating."""
+    for bench, (digest, reads) in zip(benches, recording):
+        gen = bench()
+        replayed = hashlib.sha256()
+        reads = iter(reads)
+        response = None
+        while True:
+            try:
+                command = gen.send(response)
+            except StopIteration:
+                break
+            replayed.update(repr(command).encode())
+            response = next(reads) if isinstance(command, Value) else None
+
+        if replayed.hexdigest() != digest:
+            raise RuntimeError("The bench diverged from its cached simulation; clear the simulation cache")
+
+
+class SimCache:
+    """Caches simulation results, keyed by a hash of the design's RTLIL and of the benches' stimulus.
+
+    A hit replays the benches against the values they read in the cached run, so their assertions
+    (and side effects) still run, but the design isn't simulated.
+
+    Parameters
+    ----------
+    root : Path
+        The directory to cache results in; defaults to a `sim` directory alongside the LUT cache.
+
+    """
+
+    def __init__(self, root: Path = None):
+        self.root = Path(root) if root is not None else cache_dir().parent / "sim"
+
+    def key(self, dut, benches: list, clocks: dict) -> str:
+        # A design can only be elaborated once; convert a copy
+        design = copy.deepcopy(dut)
+        key = hashlib.sha256()
+        key.update(rtlil.convert(design, ports=design.ports(), emit_src=False).encode())
+        key.update(repr(sorted(clocks.items())).encode())
+        for domain, bench in benches:
+            key.update(domain.encode() + fingerprint(bench))
+        return key.hexdigest()
+
+    def load(self, key: str) -> list | None:
+        try:
+            with open(self.root / f"{key[:32]}.pickle", "rb") as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def store(self, key: str, recording: list):
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.root / f"{key[:32]}.pickle"
+        with tempfile.NamedTemporaryFile(dir=self.root, delete=False) as f:
+            pickle.dump(recording, f)
+        os.replace(f.name, path)
+
+
+class Tracer:
+    """Writes selected signals to a VCD file, sampled once per sync clock cycle, from inside a bench.
+
+    Cheaper than tracing the whole design; only the traced signals are read, and only within the window.
+    """
+
+    def __init__(self, vcd: str | Path, traces: list, period: float, window: tuple[int, int] = None):
+        self.traces = [trace for trace in traces if isinstance(trace, Signal)]
+        self.period_ps = round(period * 1e12)
+        self.start, self.stop = window or (0, None)
+
+        self.file = open(vcd, "w")
+        self.writer = VCDWriter(self.file, timescale="1 ps")
+        self.vars = [self.writer.register_var("top", trace.name, "wire", size=len(trace)) for trace in self.traces]
+        self.cycle = 0
+
+    def wrap(self, bench):
+        def traced():
+            gen = bench()
+            response = None
+            while True:
+                try:
+                    command = gen.send(response)
+                except StopIteration:
+                    return
+                response = yield command
+                if command is None:
+                    self.cycle += 1
+                    if self.cycle >= self.start and (self.stop is None or self.cycle < self.stop):
+                        for trace, var in zip(self.traces, self.vars):
+                            value = yield trace
+                            self.writer.change(var, self.cycle * self.period_ps, value & ((1 << len(trace)) - 1))
+        return traced
+
+    def close(self):
+        self.writer.close()
+        self.file.close()
+
+
+class Capture:
+    """Records one signal to a .npy or .wav file, each cycle a strobe is high; in constant memory.
+
+    Samples are collected in a preallocated buffer of `chunk` samples, and flushed to the file as it fills:
+    a memory-mapped .npy array of n_samples entries (the ones not captured stay zero), or a 16-bit mono WAV
+    (the signal is centred, if unsigned, and scaled to 16 bits).
+
+        with Capture(artifacts / "saw.wav", dut.o_a, dut.o_stb, n_samples=48_000) as capture:
+            simulate(dut, capture.wrap())
+
+    Parameters
+    ----------
+    path : str | Path
+        The file to write; .npy or .wav.
+    signal : Signal
+        The signal to record.
+    strobe : Signal
+        Records the signal on cycles this is high; every cycle if None.
+    n_samples : int
+        The number of samples to capture; required for .npy files. Further samples are ignored.
+    f_sample : int
+        The sample rate written to WAV files.
+    chunk : int
+        The size of the buffer, in samples.
+
+    """
+
+    def __init__(self,
+                 path: str | Path,
+                 signal: Signal,
+                 strobe: Signal = None,
+                 n_samples: int = None,
+                 f_sample: int = 48_000,
+                 chunk: int = 4096,
+                 ):
+        self.path = Path(path)
+        self.signal = signal
+        self.strobe = strobe
+        self.n_samples = n_samples
+        self.count = 0
+
+        width = len(signal)
+        is_signed = signal.shape().signed
+        bits = next(b for b in (8, 16, 32, 64) if b >= width)
+        self.buffer = np.zeros(min(chunk, n_samples or chunk), dtype=f"{'i' if is_signed else 'u'}{bits // 8}")
+        self.filled = 0
+
+        if self.path.suffix == ".npy":
+            if n_samples is None:
+                raise ValueError("Capturing to .npy needs n_samples")
+            self.file = np.lib.format.open_memmap(self.path, mode="w+", dtype=self.buffer.dtype, shape=(n_samples,))
+        elif self.path.suffix == ".wav":
+            # Centre unsigned samples, and shift them to 16 bits
+            self.offset = 0 if is_signed else 1 << (width - 1)
+            self.shift = 16 - width
+            self.file = wave.open(str(self.path), "wb")
+            self.file.setnchannels(1)
+            self.file.setsampwidth(2)
+            self.file.setframerate(f_sample)
+        else:
+            raise ValueError(f"Unknown capture format {self.path.suffix!r}; expected .npy or .wav")
+
+    def __fingerprint__(self):
+        # How many samples are read; not where they're written
+        return self.n_samples
+
+    @property
+    def done(self) -> bool:
+        return self.n_samples is not None and self.count >= self.n_samples
+
+    def flush(self):
+        data = self.buffer[:self.filled]
+        if isinstance(self.file, np.memmap):
+            self.file[self.count - self.filled:self.count] = data
+        else:
+            audio = data.astype(np.int64) - self.offset
+            audio = audio << self.shift if self.shift >= 0 else audio >> -self.shift
+            self.file.writeframes(audio.astype("<i2").tobytes())
+        self.filled = 0
+
+    def wrap(self, bench=None):
+        """Wraps a bench, sampling after each of its ticks; with no bench, ticks until n_samples are captured."""
+        if bench is None:
+            if self.n_samples is None:
+                raise ValueError("Capturing without a bench needs n_samples")
+
+            def bench():
+                while not self.done:
+                    yield
+
+        def captured():
+            gen = bench()
+            response = None
+            while True:
+                try:
+                    command = gen.send(response)
+                except StopIteration:
+                    return
+                response = yield command
+                if command is None and not self.done and (self.strobe is None or (yield self.strobe)):
+                    self.buffer[self.filled] = yield self.signal
+                    self.filled += 1
+                    self.count += 1
+                    if self.filled == len(self.buffer) or self.done:
+                        self.flush()
+        return captured
+
+    def close(self):
+        if self.filled:
+            self.flush()
+        if isinstance(self.file, np.memmap):
+            self.file.flush()
+            del self.file
+        else:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Activity:
+    """Toggle activity of a simulation, per signal and per module; a proxy for dynamic power.
+
+    Read from the VCD file of a (pysim) simulation of the whole design: each value change adds the number of
+    bits that flipped to its signal. A signal counts toward the innermost module it appears in (so a module's
+    ports count toward it), but clocks and resets count toward the top.
+
+        activity = profile(dut, bench, vcd=artifacts / "sim.vcd")
+        print(activity.report())
+        (artifacts / "activity.folded").write_text(activity.folded())   # flamegraph.pl, speedscope
+
+    Parameters
+    ----------
+    toggles : dict
+        Bit flips per signal, keyed by its path; its modules' names, then its own.
+    widths : dict
+        The width of each signal, by path.
+    cycles : int
+        The clock cycles simulated.
+
+    """
+
+    def __init__(self, toggles: dict, widths: dict, cycles: int):
+        self.toggles = toggles
+        self.widths = widths
+        self.cycles = cycles
+
+    @classmethod
+    def from_vcd(cls, path: str | Path, clock: str = "clk") -> "Activity":
+        """The activity recorded in a VCD file; cycles are counted on the top level's clock."""
+        scope = []
+        paths = {}
+        widths = {}
+        values = {}
+        toggles = {}
+        clock_code = None
+        cycles = 0
+        dumping = False
+        with open(path, "rb") as f:
+            for token in tokenize(f):
+                kind, data = token.kind, token.data
+                if kind is TokenKind.SCOPE:
+                    scope.append(data.ident)
+                elif kind is TokenKind.UPSCOPE:
+                    scope.pop()
+                elif kind is TokenKind.VAR:
+                    # Amaranth wraps the design in a "bench" scope
+                    modules = tuple(scope[1:])
+                    domain_signal = data.reference in ("clk", "rst") or data.reference.endswith(("_clk", "_rst"))
+                    if domain_signal:
+                        modules = modules[:1]
+                    if data.id_code not in paths or (not domain_signal and len(modules) >= len(paths[data.id_code]) - 1):
+                        paths[data.id_code] = modules + (data.reference,)
+                    widths[data.id_code] = data.size
+                    if data.reference == clock and len(modules) <= 1 and clock_code is None:
+                        clock_code = data.id_code
+                elif kind is TokenKind.DUMPVARS:
+                    dumping = True
+                elif kind is TokenKind.END:
+                    dumping = False
+                elif kind in (TokenKind.CHANGE_SCALAR, TokenKind.CHANGE_VECTOR):
+                    value = data.value
+                    if isinstance(value, str):
+                        value = int("".join(c if c in "01" else "0" for c in value) or "0", 2)
+                    code = data.id_code
+                    if not dumping and code in values:
+                        toggles[code] = toggles.get(code, 0) + bin(values[code] ^ value).count("1")
+                        if code == clock_code and value:
+                            cycles += 1
+                    values[code] = value
+
+        return cls({paths[code]: toggles.get(code, 0) for code in paths},
+                   {paths[code]: widths[code] for code in paths},
+                   cycles)
+
+    def modules(self, inclusive: bool = False) -> dict:
+        """Bit flips per module, keyed by its path; with inclusive, its submodules' count toward it too."""
+        totals = {}
+        for path, toggles in self.toggles.items():
+            modules = path[:-1]
+            for depth in range(1 if inclusive else len(modules), len(modules) + 1):
+                key = modules[:depth]
+                totals[key] = totals.get(key, 0) + toggles
+        return totals
+
+    def report(self, n: int = 20) -> str:
+        """The n most active signals, and the activity of every module (inclusive), as text."""
+        cycles = max(self.cycles, 1)
+        lines = [f"Toggle activity over {self.cycles} cycles", "",
+                 f"{'toggles/cycle':>14} {'per bit':>8} {'bits':>5}  signal"]
+        ranked = sorted(self.toggles.items(), key=lambda item: -item[1])[:n]
+        for path, toggles in ranked:
+            if not toggles:
+                break
+            rate = toggles / cycles
+            lines.append(f"{rate:14.3f} {rate / self.widths[path]:8.3f} {self.widths[path]:5}  {'.'.join(path)}")
+
+        lines += ["", f"{'toggles/cycle':>14} {'share':>8}  module"]
+        modules = self.modules(inclusive=True)
+        total = max(sum(self.toggles.values()), 1)
+        for path, toggles in sorted(modules.items(), key=lambda item: -item[1]):
+            lines.append(f"{toggles / cycles:14.3f} {toggles / total:8.1%}  {'.'.join(path)}")
+        return "\n".join(lines) + "\n"
+
+    def folded(self) -> str:
+        """The bit flips as folded stacks (module;submodule;signal count), for flame graph tools."""
+        return "".join(f"{';'.join(path)} {toggles}\n" for path, toggles in sorted(self.toggles.items()) if toggles)
+
+
+def profile(dut, *benches, vcd: str | Path, clocks: dict = None) -> Activity:
+    """Simulates dut (as `simulate`, on pysim, uncached) writing every signal to vcd; returns its `Activity`."""
+    simulate(dut, *benches, clocks=clocks, vcd=vcd, backend="pysim")
+    return Activity.from_vcd(vcd)
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from ...model import oscillator as model
+from ...oscillators.oscillator import Oscillator
+from ...oscillators.phase_accumulator import PhaseAccumulator
+from ...oscillators.saw_oscillator import saw
+
+
+def test_phase_accumulator_increment():
+    phase_acc = model.PhaseAccumulator(100_000_000, 11)
+    assert phase_acc.increment(440) == 18897
+
+
+def test_phase_accumulator_blocks():
+    phase_acc = model.PhaseAccumulator(100_000_000, 11)
+    inc = phase_acc.increment(np.full(10_000, 60_000))
+    whole = phase_acc.process(inc)
+
+    phase_acc.reset()
+    blocks = np.concatenate([phase_acc.process(block)
+                            for block in np.array_split(inc, 7)])
+
+    assert np.array_equal(whole, blocks)
+
+
+def test_phase_accumulator_matches_hdl(simulate):
+    f_clk = 100_000_000
+    f_target = 60_000
+    output_width = 11
+    n_cycles = 4000
+
+    expected = model.PhaseAccumulator(f_clk, output_width).process(
+        np.full(n_cycles, 2576980))  # (60 kHz * 2 ** 32) // 100 MHz
+
+    dut = PhaseAccumulator(f_clk, output_width)
+
+    def bench():
+        yield dut.i_reset.eq(1)
+        yield
+        yield dut.i_reset.eq(0)
+        yield dut.i_enable.eq(1)
+        yield dut.i_f_target.eq(f_target)
+
+        for i in range(n_cycles):
+            yield
+            assert (yield dut.o_i) == expected[i]
+
+    simulate(dut, bench)
+
+
+@pytest.mark.parametrize("interpolation_bits", [0, 3])
+def test_oscillator_matches_hdl(interpolation_bits, simulate):
+    lut_width = 8
+    lut_depth = 2 ** 11
+    f_clk = 100_000_000
+    f_target = 60_000
+    n_cycles = 4000
+
+    osc = model.Oscillator(f_clk, lut_width, lut_depth, saw, interpolation_bits)
+    expected_i, expected_a = osc.process(np.full(n_cycles, f_target))
+
+    dut = Oscillator(f_clk, lut_width, lut_depth, saw, interpolation_bits)
+
+    def bench():
+        yield dut.i_reset.eq(1)
+        yield
+        yield dut.i_reset.eq(0)
+        yield dut.i_enable.eq(1)
+        yield dut.i_f_target.eq(f_target)
+
+        for i in range(n_cycles):
+            yield
+            assert (yield dut.o_i) == expected_i[i]
+            assert (yield dut.o_a) == expected_a[i]
+
+    simulate(dut, bench)
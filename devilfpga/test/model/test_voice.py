@@ -0,0 +1,49 @@
+import numpy as np
+from ...model.vca import VCA
+from ...model.vcf import LadderFilter
+from ...model.voice import Voice
+
+
+def test_ladder_filter_dc():
+    vcf = LadderFilter(16)
+    out = vcf.process(np.full(2000, 10_000), 2 ** 14, 0)
+
+    # Floor rounding in each pole leaves the output just shy of the input
+    assert 9_980 <= out[-1] <= 10_000
+    assert np.all(np.diff(out) >= 0)
+
+
+def test_vca_saturates():
+    vca = VCA(16, 16)
+    out = vca.process([-32768, 16384, 32767], 2 ** 17)
+    assert list(out) == [-32768, 32767, 32767]
+
+
+def test_voice_blocks():
+    n = 4800
+    cv = np.linspace(0, 2 ** 16 - 1, n).astype(np.int64)
+
+    voice = Voice()
+    whole = voice.process(cv, 2 ** 13, 2 ** 14, 2 ** 16)
+
+    voice.reset()
+    blocks = np.concatenate([voice.process(block, 2 ** 13, 2 ** 14, 2 ** 16)
+                            for block in np.array_split(cv, 5)])
+
+    assert np.array_equal(whole, blocks)
+    assert np.any(whole != 0)
+
+
+def test_voice_columns():
+    n = 2400
+    rng = np.random.default_rng(0)
+    cv = rng.integers(0, 2 ** 16, (n, 3))
+    cutoff = rng.integers(2 ** 12, 2 ** 15, (n, 3))
+    resonance = np.array([0, 2 ** 14, 3 * 2 ** 14])
+
+    # Each column as a voice of its own
+    voice = Voice(voices=3)
+    columns = np.concatenate([voice.process(block, c, resonance, 2 ** 16)
+                              for block, c in zip(np.array_split(cv, 3), np.array_split(cutoff, 3))])
+    for j in range(3):
+        assert np.array_equal(columns[:, j], Voice().process(cv[:, j], cutoff[:, j], resonance[j], 2 ** 16))
@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+from amaranth import Elaboratable, Module
+from ...model import exp_converter as model
+from ...modules.bridge import DataSlot
+from ...modules.exp_converter import Antilog
+from ...oscillators.saw_oscillator import SawOscillator
+from ...slots import pack
+
+SLOT = DataSlot("Table", 2, 0x1000_0000, "table.bin")
+
+CLOCKS = {"sync": 1e-8, "bridge": 1 / 74.25e6}
+
+
+def loader(dut, data: bytes):
+    """A bench streaming a data slot file over the bridge, as the Pocket does at boot."""
+    def bench():
+        # Writes outside the slot, or past the table, are ignored
+        for addr in (SLOT.address - 4, SLOT.address + len(data)):
+            yield dut.i_bridge_addr.eq(addr)
+            yield dut.i_bridge_wr_data.eq(0xffff_ffff)
+            yield dut.i_bridge_wr.eq(1)
+            yield
+
+        words = np.frombuffer(data, dtype=">u4")
+        for i, word in enumerate(words.tolist()):
+            yield dut.i_bridge_addr.eq(SLOT.address + 4 * i)
+            yield dut.i_bridge_wr_data.eq(word)
+            yield dut.i_bridge_wr.eq(1)
+            yield
+        yield dut.i_bridge_wr.eq(0)
+        yield
+
+    return "bridge", bench
+
+
+def load_cycles(data: bytes) -> int:
+    """The sync cycles until the loader is done (benches only share the clock, as the simulator may replay one)."""
+    return int((len(data) // 4 + 4) * CLOCKS["bridge"] / CLOCKS["sync"]) + 4
+
+
+def test_slot_definition():
+    definition = SLOT.definition(64)
+    assert definition["size_exact"] == 256
+    assert definition["address"] == "0x10000000"
+
+    with pytest.raises(ValueError):
+        DataSlot("Unaligned", 3, 0x1000_0100, "unaligned.bin")
+
+
+def test_antilog_slot(simulate):
+    params = dict(width=16, y_min=130.81, y_max=2637.02)
+    cv = np.arange(0, 2 ** 16, 97)
+    expected = model.Antilog(**params).process(cv)
+
+    dut = Antilog(**params, slot=SLOT)
+    tables = dut.tables()
+    assert list(tables) == [SLOT]
+    data = pack(tables[SLOT])
+
+    def bench():
+        for _ in range(load_cycles(data)):
+            yield
+
+        for i in range(len(cv)):
+            yield dut.i_cv.eq(int(cv[i]))
+            yield
+            if i >= dut.latency:
+                assert (yield dut.o_y) == expected[i]
+
+    simulate(dut, bench, loader(dut, data), clocks=CLOCKS)
+
+
+class SideBySide(Elaboratable):
+    """An oscillator loaded from a slot, next to one whose LUT is built in."""
+
+    def __init__(self):
+        self.loaded = SawOscillator(1_000_000, 8, 2 ** 8, lut_slot=SLOT)
+        self.reference = SawOscillator(1_000_000, 8, 2 ** 8)
+
+    def elaborate(self, _) -> Module:
+        m = Module()
+        m.submodules.loaded = self.loaded
+        m.submodules.reference = self.reference
+        return m
+
+    def ports(self):
+        return self.loaded.ports() + self.reference.ports()
+
+
+def test_oscillator_slot(simulate):
+    pair = SideBySide()
+    dut, reference = pair.loaded, pair.reference
+    data = pack(dut.table())
+
+    def bench():
+        for osc in (dut, reference):
+            yield osc.i_enable.eq(1)
+            yield osc.i_f_target.eq(10_000)
+        for _ in range(load_cycles(data)):
+            yield
+
+        for _ in range(500):
+            yield
+            assert (yield dut.o_a) == (yield reference.o_a)
+
+    simulate(pair, bench, loader(dut, data), clocks=CLOCKS)
@@ -0,0 +1,90 @@
+from fractions import Fraction
+
+import numpy as np
+import pytest
+from ...model import cv as model
+from ...modules.cv import DAC, NOTE_C1, NOTE_E5, Slide, TuningWord, slide_shift, tuning_words
+from ...modules.vco import F_C1, F_E5
+
+
+def test_dac(simulate):
+    dut = DAC(16)
+
+    def bench():
+        for note in range(64):
+            yield dut.i_note.eq(note)
+            yield
+            yield
+            # Linear from C1 to E5, rounded to the nearest step; pinned below C1 and at the top
+            step = round(Fraction((note - NOTE_C1) * 2 ** 16, NOTE_E5 - NOTE_C1))
+            assert (yield dut.o_cv) == min(max(step, 0), 2 ** 16 - 1)
+
+    simulate(dut, bench)
+
+
+def test_slide_shift():
+    # ~60 ms at 3 kHz
+    assert slide_shift(0.06, 3000) == 7
+
+
+def test_slide(simulate):
+    c2 = (65 << 32) // 3000
+    c3 = (131 << 32) // 3000
+    target = np.repeat([c2, c3, c2, c3], 1000)
+    slide = np.repeat([0, 1, 1, 0], 1000)
+    expected = model.Slide(32, 6).process(target, slide)
+
+    # Glides reach the target, and only glide while sliding
+    assert expected[999] == c2 and expected[1999] == c3 and expected[2999] == c2
+    assert c2 < expected[1010] < c3
+    assert expected[3000] == c3
+
+    dut = Slide(32, 6)
+
+    def bench():
+        out = []
+        for i in range(len(target) * 2):
+            yield dut.i_target.eq(int(target[i // 2]))
+            yield dut.i_slide.eq(int(slide[i // 2]))
+            yield dut.i_strobe.eq(i % 2 == 0)
+            yield
+            if i % 2 == 1:
+                out.append((yield dut.o_inc))
+
+        assert out == list(expected)
+
+    simulate(dut, bench)
+
+
+def test_tuning_words():
+    words = tuning_words(48_000)
+    assert len(words) == 64
+    # Below C1 pins to C1; an octave doubles the word
+    assert words[8] == words[NOTE_C1] == round(F_C1 * 2 ** 32 / 48_000)
+    assert words[NOTE_C1 + 12] == round(2 * F_C1 * 2 ** 32 / 48_000)
+    # E5, as the antilog maps the top of the CV range
+    assert words[63] * 48_000 / 2 ** 32 == pytest.approx(F_E5, rel=1e-4)
+
+
+def test_tuning_word(simulate):
+    dut = TuningWord(48_000)
+    words = tuning_words(48_000)
+
+    def bench():
+        # i_octave 2 (A3 - G#3), C held
+        yield dut.i_octave.eq(2)
+        yield dut.i_note_c.eq(1)
+        yield
+        yield
+        assert (yield dut.o_note) == 35
+        assert (yield dut.o_inc) == words[35]
+
+        # The lowest held key wins; the word follows the keys a cycle later
+        yield dut.i_note_a.eq(1)
+        yield
+        assert (yield dut.o_inc) == words[35]
+        yield
+        assert (yield dut.o_note) == 32
+        assert (yield dut.o_inc) == words[32]
+
+    simulate(dut, bench)
@@ -0,0 +1,69 @@
+import numpy as np
+from ...model import decimator as model
+from ...modules.decimator import CICDecimator, Decimator, FIR, cic_compensator
+
+rng = np.random.default_rng(1212)
+SAMPLES = rng.integers(-2 ** 15, 2 ** 15, 400)
+
+
+def run(simulate, dut, samples, strobe_every=1, cycles=None):
+    out = []
+
+    def bench():
+        # i_strobe starts high, so the first edge takes a zero sample; the strobes then start strobe_every later
+        yield dut.i_strobe.eq(0)
+        for _ in range(strobe_every - 1):
+            yield
+            if (yield dut.o_stb):
+                out.append((yield dut.o_data))
+
+        for i in range(cycles or len(samples) * strobe_every):
+            j, phase = divmod(i, strobe_every)
+            if j < len(samples):
+                yield dut.i_data.eq(int(samples[j]))
+            yield dut.i_strobe.eq(j < len(samples) and phase == 0)
+            yield
+            if (yield dut.o_stb):
+                out.append((yield dut.o_data))
+
+    simulate(dut, bench)
+    return out
+
+
+def test_cic_decimator(simulate):
+    dut = CICDecimator(16, 8, 3)
+    assert dut.output_width == 25
+
+    # i_strobe starts high, so the first edge integrates a zero
+    cic = model.CICDecimator(16, 8, 3)
+    samples = np.concatenate([[0], SAMPLES])
+    expected = np.concatenate([cic.process(samples[:101]), cic.process(samples[101:])])
+
+    out = run(simulate, dut, SAMPLES, cycles=len(SAMPLES) + 8)
+    assert out == list(expected)
+
+
+def test_cic_decimator_dc_gain(simulate):
+    dut = CICDecimator(16, 8, 3)
+    out = run(simulate, dut, [1000] * 80, cycles=90)
+    assert out[-1] == 1000 * dut.gain
+
+
+def test_fir(simulate):
+    taps = cic_compensator(3, 8, 7)
+    # i_strobe starts high, so the first sample is a zero
+    expected = model.FIR(16, taps).process(np.concatenate([[0], SAMPLES[:50]]))
+
+    dut = FIR(16, taps)
+    out = run(simulate, dut, SAMPLES[:50], strobe_every=len(taps), cycles=50 * len(taps) + dut.cycles)
+    assert out == list(expected)
+
+
+def test_decimator(simulate):
+    dut = Decimator(16, 8, 3, 7)
+
+    decimator = model.Decimator(16, 8, 3, 7)
+    expected = decimator.process(np.concatenate([[0], SAMPLES]))
+
+    out = run(simulate, dut, SAMPLES, cycles=len(SAMPLES) + 20)
+    assert out == list(expected)
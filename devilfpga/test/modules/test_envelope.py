@@ -0,0 +1,80 @@
+import numpy as np
+from ...model.envelope import Envelope as EnvelopeModel
+from ...modules.envelope import Envelope, EnvelopeBank, decay_shift
+
+
+def test_decay_shift():
+    # ~170 ms at 3 kHz
+    assert decay_shift(0.17, 3000) == 9
+
+
+def test_envelope(simulate):
+    n = 600
+    trigger = np.zeros(n, dtype=bool)
+    trigger[[0, 300, 350]] = True
+    accent = np.zeros(n, dtype=bool)
+    accent[300] = True
+    expected = EnvelopeModel(16, 5).process(trigger, accent)
+
+    # Decays exponentially, all the way to 0; accents peak higher
+    assert expected[0] == 0xffff - 0x3fff
+    assert expected[32] < expected[0] * 0.4
+    assert expected[299] == 0
+    assert expected[300] == 0xffff
+    assert 0 < expected[349] < expected[350]
+
+    dut = Envelope(16, 5)
+
+    def bench():
+        out = []
+        for i in range(n * 2 - 1):
+            # Triggered with the strobe, or (the retrigger) the cycle before it
+            step = (i + 1) // 2
+            yield dut.i_trigger.eq(bool(trigger[step]) and (i % 2 == 1 if step == 350 else i % 2 == 0))
+            yield dut.i_accent.eq(bool(accent[i // 2]))
+            yield dut.i_strobe.eq(i % 2 == 0)
+            yield
+            if i % 2 == 1:
+                out.append((yield dut.o_env))
+
+        assert out == list(expected[:-1])
+
+    simulate(dut, bench)
+
+
+def test_envelope_bank(simulate):
+    n_voices = 4
+    n_sweeps = 200
+    cycles_per_sweep = 8
+
+    # Each voice is triggered at a different time, some with accent
+    trigger = np.zeros((n_voices, n_sweeps), dtype=bool)
+    accent = np.zeros((n_voices, n_sweeps), dtype=bool)
+    for voice in range(n_voices):
+        trigger[voice, [10 * voice, 100 + 20 * voice]] = True
+        accent[voice, 100 + 20 * voice] = voice % 2 == 1
+    expected = [EnvelopeModel(16, 4).process(trigger[voice], accent[voice]) for voice in range(n_voices)]
+
+    dut = EnvelopeBank(n_voices, 16, 4)
+    assert dut.cycles <= cycles_per_sweep
+
+    def bench():
+        samples = [[] for _ in range(n_voices)]
+        for i in range(n_sweeps * cycles_per_sweep):
+            sweep, cycle = divmod(i, cycles_per_sweep)
+            # Triggered with the strobe that starts the sweep
+            if cycle == 0:
+                yield dut.i_trigger.eq(int(sum(int(trigger[v, sweep]) << v for v in range(n_voices))))
+                yield dut.i_accent.eq(int(sum(int(accent[v, sweep]) << v for v in range(n_voices))))
+            else:
+                yield dut.i_trigger.eq(0)
+            yield dut.i_strobe.eq(cycle == 0)
+            yield
+            if (yield dut.o_valid):
+                samples[(yield dut.o_voice)].append((yield dut.o_env))
+
+        for voice in range(n_voices):
+            assert samples[voice] == list(expected[voice][:len(samples[voice])])
+            assert len(samples[voice]) >= n_sweeps - 1
+
+    simulate(dut, bench)
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from ...model import exp_converter as model
+from ...modules.exp_converter import Antilog, antilog_table
+
+
+@pytest.mark.parametrize("y_min, y_max", [(130.81, 2637.02), (858.0, 42_893.0)])
+def test_antilog(y_min, y_max, simulate):
+    cv = np.arange(0, 2 ** 16, 97)
+    expected = model.Antilog(16, y_min, y_max).process(cv)
+
+    dut = Antilog(16, y_min, y_max)
+
+    def bench():
+        for i in range(len(cv)):
+            yield dut.i_cv.eq(int(cv[i]))
+            yield
+            if i >= dut.latency:
+                assert (yield dut.o_y) == expected[i]
+
+    simulate(dut, bench)
+
+    # Within rounding (and the interpolation's error, relative to the output) of the exponential, over the whole range
+    cv = np.arange(2 ** 16)
+    exact = y_min * (y_max / y_min) ** (cv / (2 ** 16 - 1))
+    assert np.all(np.abs(model.Antilog(16, y_min, y_max).convert(cv) - exact) < 0.5 + 4e-5 * exact)
+
+
+def test_antilog_table():
+    mantissas, deltas, octaves, shift = antilog_table(16, 130.81, 2637.02, 8, 16)
+    assert max(mantissas) < 2 ** 16 and shift == 8
+    # Narrow enough to load from a data slot, one entry per word
+    assert max(mantissas).bit_length() + max(deltas).bit_length() + max(octaves).bit_length() <= 32
+
+    with pytest.raises(ValueError):
+        antilog_table(16, 200.0, 100.0, 8, 16)
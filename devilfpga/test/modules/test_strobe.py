@@ -0,0 +1,42 @@
+from ...modules.strobe import Scheduler, Strobe
+
+
+def test_strobe(simulate):
+    f_clk = 100_000_000
+    f_out = 48_000
+    n_cycles = 20_000
+
+    dut = Strobe(f_clk, f_out)
+
+    def bench():
+        ticks = []
+        for i in range(n_cycles):
+            yield
+            if (yield dut.o_stb):
+                ticks.append(i)
+
+        # 100 MHz / 48 kHz = 2083.33 cycles per tick
+        assert len(ticks) == n_cycles * f_out // f_clk
+        assert {b - a for a, b in zip(ticks, ticks[1:])} == {2083, 2084}
+
+    simulate(dut, bench)
+
+
+def test_scheduler(simulate):
+    dut = Scheduler(f_clk=1000, f_sample=100, control_divider=4)
+
+    def bench():
+        n_audio = 0
+        n_control = 0
+        for _ in range(1000):
+            yield
+            audio = yield dut.o_audio
+            control = yield dut.o_control
+            assert audio or not control
+            n_audio += audio
+            n_control += control
+
+        assert n_audio == 100
+        assert n_control == 25
+
+    simulate(dut, bench, clocks={"sync": 1e-3})
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+from amaranth import Elaboratable, Fragment, Module, signed, unsigned
+from ...model import vca as model
+from ...modules.multiplier import MultiplierPort, SharedMultiplier
+from ...modules.vca import VCA
+
+rng = np.random.default_rng(303)
+AUDIO = rng.integers(-2 ** 15, 2 ** 15, 100)
+GAIN = rng.integers(0, 2 ** 17, 100)
+
+
+@pytest.mark.parametrize("saturate", [True, False])
+def test_vca(saturate, simulate):
+    expected = model.VCA(16, 16, saturate).process(AUDIO, GAIN)
+
+    dut = VCA(16, 18, 16, saturate)
+
+    def bench():
+        # i_strobe starts high; let that sample drain
+        yield dut.i_strobe.eq(0)
+        for _ in range(8):
+            yield
+
+        out = []
+        for i in range(len(AUDIO) * 4):
+            yield dut.i_audio.eq(int(AUDIO[i // 4]))
+            yield dut.i_gain.eq(int(GAIN[i // 4]))
+            yield dut.i_strobe.eq(i % 4 == 0)
+            yield
+            if (yield dut.o_stb):
+                out.append((yield dut.o_audio))
+
+        assert out == list(expected)
+
+    simulate(dut, bench)
+
+
+class SharedVCAs(Elaboratable):
+    def __init__(self):
+        self.multiplier = SharedMultiplier(signed(16), unsigned(18), 2)
+        self.vcas = [VCA(16, 18, 16, multiplier=port) for port in self.multiplier.clients]
+
+    def elaborate(self, _):
+        m = Module()
+        m.submodules.multiplier = self.multiplier
+        for i, vca in enumerate(self.vcas):
+            m.submodules[f"vca{i}"] = vca
+        return m
+
+    def ports(self):
+        return [port for vca in self.vcas for port in vca.ports()]
+
+
+def test_vca_shared_multiplier(simulate):
+    expected = [model.VCA(16, 16).process(AUDIO, GAIN),
+                model.VCA(16, 16).process(-AUDIO - 1, GAIN)]
+
+    dut = SharedVCAs()
+    assert dut.vcas[0].latency == 2 + dut.multiplier.latency
+
+    def bench():
+        # i_strobe starts high; let that sample drain
+        for vca in dut.vcas:
+            yield vca.i_strobe.eq(0)
+        for _ in range(8):
+            yield
+
+        out = [[], []]
+        for i in range(len(AUDIO) * 8):
+            for vca, audio in zip(dut.vcas, [AUDIO, -AUDIO - 1]):
+                yield vca.i_audio.eq(int(audio[i // 8]))
+                yield vca.i_gain.eq(int(GAIN[i // 8]))
+                # Both strobe together; one waits a cycle for the multiplier
+                yield vca.i_strobe.eq(i % 8 == 0)
+            yield
+            for k, vca in enumerate(dut.vcas):
+                if (yield vca.o_stb):
+                    out[k].append((yield vca.o_audio))
+
+        for k in range(2):
+            assert out[k] == list(expected[k])
+
+    simulate(dut, bench)
+
+
+def test_vca_multiplier_port():
+    # The port's operands must match the VCA's audio and gain
+    with pytest.raises(ValueError):
+        Fragment.get(VCA(16, 18, 16, multiplier=MultiplierPort(signed(16), unsigned(16), 0, 2)), None)
@@ -0,0 +1,102 @@
+import numpy as np
+from ...model import vcf as model
+from ...model.exp_converter import Antilog as AntilogModel
+from ...model.vca import VCA
+from ...modules.exp_converter import Antilog
+from ...modules.vcf import VCF, LadderFilter, cutoff_range
+
+
+def test_ladder_filter(simulate):
+    width = 16
+    n_samples = 300
+    cycles_per_sample = 20
+
+    rng = np.random.default_rng(303)
+    audio = np.repeat(rng.integers(-2 ** 15, 2 ** 15, n_samples // 30), 30)
+    cutoff = np.linspace(2 ** 12, 2 ** 15, n_samples).astype(np.int64)
+    resonance = np.linspace(0, 2 ** 16 - 1, n_samples).astype(np.int64)
+    expected = model.LadderFilter(width).process(audio, cutoff, resonance)
+
+    dut = LadderFilter(width)
+    assert dut.cycles <= cycles_per_sample
+
+    def bench():
+        # i_strobe starts high; the first edge filters a zero sample, which leaves the filter at rest
+        yield dut.i_strobe.eq(0)
+        for _ in range(cycles_per_sample):
+            yield
+
+        out = []
+        for i in range(n_samples * cycles_per_sample):
+            if i % cycles_per_sample == 0:
+                n = i // cycles_per_sample
+                yield dut.i_audio.eq(int(audio[n]))
+                yield dut.i_cutoff.eq(int(cutoff[n]))
+                yield dut.i_resonance.eq(int(resonance[n]))
+            yield dut.i_strobe.eq(i % cycles_per_sample == 0)
+            yield
+            if (yield dut.o_stb):
+                out.append((yield dut.o_audio))
+
+        assert out == list(expected)
+
+    simulate(dut, bench)
+
+
+def test_cutoff_antilog(simulate):
+    cv = np.arange(0, 2 ** 16, 97)
+    expected = AntilogModel(16, *cutoff_range(48_000)).process(cv)
+
+    dut = Antilog(16, *cutoff_range(48_000))
+
+    def bench():
+        for i in range(len(cv)):
+            yield dut.i_cv.eq(int(cv[i]))
+            yield
+            if i >= dut.latency:
+                assert (yield dut.o_y) == expected[i]
+
+    simulate(dut, bench)
+
+    g = expected[dut.latency:]
+    assert np.all(np.diff(g) >= 0)
+
+    # 2 * pi * 100 Hz / 48 kHz, 2 * pi * 5 kHz / 48 kHz
+    g = AntilogModel(16, *cutoff_range(48_000)).convert([0, 2 ** 16 - 1])
+    assert abs(g[0] - 858) <= 1
+    assert abs(g[1] - 42893) <= 2
+
+
+def test_vcf(simulate):
+    n_samples = 100
+    cycles_per_sample = 24
+    cutoff_cv = 40_000
+    resonance = 2 ** 15
+    envelope = 50_000
+
+    audio = np.repeat([20_000, -20_000], n_samples // 2)
+    g = AntilogModel(16, *cutoff_range(48_000)).convert(cutoff_cv)
+    expected = VCA().process(model.LadderFilter().process(audio, g, resonance), envelope)
+
+    dut = VCF()
+
+    def bench():
+        yield dut.i_cutoff_cv.eq(cutoff_cv)
+        yield dut.i_resonance.eq(resonance)
+        yield dut.i_envelope.eq(envelope)
+        # i_strobe starts high; the first edge filters a zero sample, which leaves the filter at rest
+        yield dut.i_strobe.eq(0)
+        for _ in range(cycles_per_sample):
+            yield
+
+        out = []
+        for i in range(n_samples * cycles_per_sample):
+            yield dut.i_audio.eq(int(audio[i // cycles_per_sample]))
+            yield dut.i_strobe.eq(i % cycles_per_sample == 0)
+            yield
+            if (yield dut.o_stb):
+                out.append((yield dut.o_audio))
+
+        assert out == list(expected)
+
+    simulate(dut, bench)
@@ -1,25 +1,80 @@
-from amaranth.sim import Delay, Settle, Simulator
-from ...modules.vco import Antilog
+import numpy as np
+import pytest
+from ...model import vco as model
+from ...modules.exp_converter import Antilog
+from ...modules.vco import F_C1, F_E5, VCO
 
 
-def test_antilog():
-    dut = Antilog(16)
-    sim = Simulator(dut)
+def test_antilog(simulate):
+    dut = Antilog(16, F_C1, F_E5)
 
     def bench():
         # C1 = 0    = 130.81 Hz
         # E5 = max  = 2637.02 Hz
 
         yield dut.i_cv.eq(0)
-        yield Delay(1e-6)
-        yield Settle()
-        assert (yield dut.o_f) == 131
+        for _ in range(dut.latency + 1):
+            yield
+        assert (yield dut.o_y) == 131
+
+        # Exponential; halfway is 2 1/6 octaves above C1
+        yield dut.i_cv.eq(2 ** 15)
+        for _ in range(dut.latency + 1):
+            yield
+        assert (yield dut.o_y) == 587
 
         yield dut.i_cv.eq(2 ** 16 - 1)
-        yield Delay(1e-6)
-        yield Settle()
-        assert (yield dut.o_f) == 2637
+        for _ in range(dut.latency + 1):
+            yield
+        assert (yield dut.o_y) == 2637
+
+    simulate(dut, bench)
+
+
+@pytest.mark.parametrize("waveform", [0, 1])
+def test_vco_matches_model(waveform, simulate):
+    f_clk = 1_000_000
+    n_cycles = 2000
+    cv = 2 ** 16 - 1
+
+    expected = model.VCO(16, f_clk).process(np.full(n_cycles, cv), waveform)
+
+    dut = VCO(16, f_clk)
+
+    def bench():
+        yield dut.i_cv.eq(cv)
+        yield dut.i_waveform.eq(waveform)
+
+        for i in range(n_cycles):
+            yield
+            assert (yield dut.o_a) == expected[i]
+
+    simulate(dut, bench)
+
+    if waveform:
+        # A square, of roughly even duty
+        assert set(expected[100:]) == {0, 255}
+        assert 0.4 < np.mean(expected[100:] == 255) < 0.6
+
+
+def test_vco_increment(simulate):
+    f_clk = 1_000_000
+    n_cycles = 2000
+    # A tuning word, as from modules.cv.TuningWord
+    inc = round(440 * 2 ** 32 / f_clk)
+
+    expected = model.VCO(16, f_clk, mode="increment").process(np.full(n_cycles, inc))
+
+    dut = VCO(16, f_clk, mode="increment")
+
+    def bench():
+        yield dut.i_inc.eq(inc)
+
+        for i in range(n_cycles):
+            yield
+            assert (yield dut.o_a) == expected[i]
+
+    simulate(dut, bench)
 
-    sim.add_process(bench)
-    with sim.write_vcd("vco.vcd"):
-        sim.run()
+    # 440 Hz; one period is f_clk / 440 cycles
+    assert np.sum(np.diff(expected) < -100) == n_cycles * 440 // f_clk
@@ -0,0 +1,51 @@
+import functools
+import numpy as np
+from ...oscillators import lut
+from ...oscillators.lut import generate_lut, generator_key
+from ...oscillators import saw_oscillator
+from ...oscillators.saw_oscillator import saw
+
+
+def scalar_saw(i: int, width: int, depth: int):
+    return int(saw(i, width, depth))
+
+
+def step(level: int):
+    def generator(i, width, depth):
+        return np.full_like(i, level)
+    return generator
+
+
+def test_generate_lut_vectorized(tmp_path, monkeypatch):
+    monkeypatch.setenv("DEVILFPGA_CACHE_DIR", str(tmp_path))
+
+    assert np.array_equal(generate_lut(saw, 8, 2 ** 11),
+                          generate_lut(scalar_saw, 8, 2 ** 11))
+
+
+def test_generate_lut_disk_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("DEVILFPGA_CACHE_DIR", str(tmp_path))
+    lut._generate_cached.cache_clear()
+
+    expected = generate_lut(saw, 8, 2 ** 14)
+    assert len(list(tmp_path.glob("lut/*.npy"))) == 1
+
+    lut._generate_cached.cache_clear()
+    monkeypatch.setattr(lut, "_generate", None)
+    assert np.array_equal(generate_lut(saw, 8, 2 ** 14), expected)
+
+
+def test_generator_key(monkeypatch):
+    assert generator_key(saw) == generator_key(saw)
+    assert generator_key(step(1)) != generator_key(step(2))
+    assert generator_key(functools.partial(saw)) is None
+
+    # The module constants the generator reads
+    key = generator_key(saw)
+    monkeypatch.setattr(saw_oscillator, "N_SAMPLES_RISING", saw_oscillator.N_SAMPLES_RISING + 1)
+    assert generator_key(saw) != key
+
+    # And those of the helpers it calls
+    key = generator_key(scalar_saw)
+    monkeypatch.setattr(saw_oscillator, "N_SAMPLES_RISING", saw_oscillator.N_SAMPLES_RISING + 1)
+    assert generator_key(scalar_saw) != key
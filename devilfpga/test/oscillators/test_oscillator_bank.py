@@ -0,0 +1,51 @@
+import numpy as np
+from ...model.oscillator import PhaseAccumulator
+from ...oscillators.lut import generate_lut
+from ...oscillators.oscillator_bank import OscillatorBank
+from ...oscillators.saw_oscillator import saw
+
+
+def test_oscillator_bank(simulate):
+    lut_width = 8
+    lut_depth = 2 ** 11
+    n_voices = 8
+    n_samples = 64
+    f_clk = 100_000_000
+    cycles_per_sample = 16
+
+    # A detuned unison stack
+    inc = [(int(f) << 32) // (f_clk // cycles_per_sample)
+           for f in np.linspace(1e5, 1.1e5, n_voices).astype(int)]
+
+    lut = generate_lut(saw, lut_width, lut_depth) & (2 ** lut_width - 1)
+    expected = [lut[PhaseAccumulator(f_clk, 11).process(np.full(n_samples, x))]
+                for x in inc]
+
+    dut = OscillatorBank(n_voices, lut_width, lut_depth, saw)
+    assert dut.cycles <= cycles_per_sample
+
+    def bench():
+        # i_strobe starts high; let the first sweep (of zero increments) pass
+        yield dut.i_strobe.eq(0)
+        for _ in range(cycles_per_sample):
+            yield
+
+        for voice, x in enumerate(inc):
+            yield dut.i_voice.eq(voice)
+            yield dut.i_inc.eq(x)
+            yield dut.i_we.eq(1)
+            yield
+        yield dut.i_we.eq(0)
+
+        samples = [[] for _ in range(n_voices)]
+        for i in range(n_samples * cycles_per_sample):
+            yield dut.i_strobe.eq(i % cycles_per_sample == 0)
+            yield
+            if (yield dut.o_valid):
+                samples[(yield dut.o_voice)].append((yield dut.o_a))
+
+        for voice in range(n_voices):
+            assert samples[voice] == list(expected[voice][:len(samples[voice])])
+            assert len(samples[voice]) >= n_samples - 1
+
+    simulate(dut, bench)
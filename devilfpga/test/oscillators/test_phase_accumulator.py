@@ -1,9 +1,10 @@
 import math
-from amaranth.sim import Simulator
-from ...oscillators.phase_accumulator import PhaseAccumulator
+import pytest
+from ...oscillators.phase_accumulator import PhaseAccumulator, reciprocal
 
 
-def test_phase_accumulator():
+@pytest.mark.compiled
+def test_phase_accumulator(simulate):
     f_clk = 100_000_000
     f_target = 440
     inc = 18897
@@ -11,8 +12,6 @@ def test_phase_accumulator():
     n_cycles = math.ceil(2 ** 32 / inc)
 
     dut = PhaseAccumulator(f_clk, output_width)
-    sim = Simulator(dut)
-    sim.add_clock(1 / f_clk)
 
     def bench():
         yield dut.i_reset.eq(1)
@@ -35,6 +34,79 @@ def test_phase_accumulator():
 
         assert (yield dut.o_i) == 0
 
-    sim.add_sync_process(bench)
-    with sim.write_vcd("phase_accumulator.vcd"):
-        sim.run()
+    simulate(dut, bench)
+
+
+def test_reciprocal():
+    for f_clk in [100_000_000, 48_000, 12_288_000]:
+        r, shift = reciprocal(f_clk, 32, 16)
+        for f in range(2 ** 16):
+            assert (f * r) >> shift == (f << 32) // f_clk
+
+
+def test_phase_accumulator_reciprocal(simulate):
+    f_clk = 100_000_000
+    f_target = 440
+    inc = 18897
+    output_width = 11
+
+    dut = PhaseAccumulator(f_clk, output_width, mode="reciprocal")
+
+    def bench():
+        yield dut.i_reset.eq(1)
+        yield
+
+        yield dut.i_reset.eq(0)
+        yield dut.i_enable.eq(1)
+        yield dut.i_f_target.eq(f_target)
+        yield
+
+        for _ in range(dut.latency):
+            assert (yield dut.o_inc) == 0
+            yield
+
+        assert (yield dut.o_inc) == inc
+        assert (yield dut.o_i) == 0
+
+    simulate(dut, bench)
+
+
+def test_phase_accumulator_strobe(simulate):
+    f_clk = 100_000_000
+    f_target = 440
+    inc = 18897
+    output_width = 32
+
+    dut = PhaseAccumulator(f_clk, output_width)
+
+    def bench():
+        yield dut.i_enable.eq(1)
+        yield dut.i_f_target.eq(f_target)
+
+        n_strobes = 0
+        for i in range(32):
+            yield dut.i_strobe.eq(i % 4 == 0)
+            yield
+            assert (yield dut.o_i) == n_strobes * inc
+            n_strobes += i % 4 == 0
+
+    simulate(dut, bench)
+
+
+def test_phase_accumulator_increment(simulate):
+    inc = 18897
+    output_width = 32
+
+    dut = PhaseAccumulator(100_000_000, output_width, mode="increment")
+
+    def bench():
+        yield dut.i_enable.eq(1)
+        yield dut.i_inc.eq(inc)
+        yield
+
+        assert (yield dut.o_inc) == inc
+        for i in range(8):
+            assert (yield dut.o_i) == i * inc
+            yield
+
+    simulate(dut, bench)
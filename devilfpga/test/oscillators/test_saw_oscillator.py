@@ -1,5 +1,5 @@
 import math
-from amaranth.sim import Simulator
+import pytest
 from ...oscillators.saw_oscillator import SawOscillator, saw
 
 import matplotlib.pyplot as plt
@@ -15,7 +15,8 @@ import matplotlib.pyplot as plt
 #     assert saw(n_samples - 1, 8, 11) == 0.0
 
 
-def test_saw_oscillator():
+@pytest.mark.compiled
+def test_saw_oscillator(simulate):
     lut_width = 8
     lut_depth = 2 ** 11
     f_clk = 100_000_000
@@ -24,8 +25,6 @@ def test_saw_oscillator():
     n_cycles = math.ceil(2 ** 32 / inc)
 
     dut = SawOscillator(f_clk, lut_width, lut_depth)
-    sim = Simulator(dut)
-    sim.add_clock(1 / f_clk)
 
     def bench():
         yield dut.i_reset.eq(1)
@@ -49,9 +48,7 @@ def test_saw_oscillator():
 
         assert (yield dut.o_i) == 0
 
-    sim.add_sync_process(bench)
-    with sim.write_vcd("saw_oscillator.vcd"):
-        sim.run()
+    simulate(dut, bench)
 
 
 def plot_saw_oscillator():
@@ -66,5 +63,33 @@ def plot_saw_oscillator():
     plt.show()
 
 
+def test_saw_oscillator_strobe(simulate):
+    lut_width = 8
+    lut_depth = 2 ** 11
+    f_clk = 100_000_000
+    f_target = 60_000
+
+    dut = SawOscillator(f_clk // 8, lut_width, lut_depth)
+
+    def bench():
+        yield dut.i_enable.eq(1)
+        yield dut.i_f_target.eq(f_target)
+
+        n_strobes = 0
+        o_a = 0
+        for i in range(4000):
+            yield dut.i_strobe.eq(i % 8 == 0)
+            yield
+            if (yield dut.o_stb):
+                n_strobes += i >= 8
+            else:
+                assert (yield dut.o_a) == o_a
+            o_a = yield dut.o_a
+
+        assert n_strobes == 4000 // 8 - 1
+
+    simulate(dut, bench)
+
+
 if __name__ == "__main__":
     plot_saw_oscillator()
@@ -0,0 +1,43 @@
+from ..benchmark import BENCHMARKS, compare, logic_depth, resources
+from ..oscillators.phase_accumulator import PhaseAccumulator
+
+
+def test_resources():
+    divide = resources(PhaseAccumulator(100_000_000, 11))
+    reciprocal = resources(PhaseAccumulator(100_000_000, 11, mode="reciprocal"))
+
+    assert divide["ffs"] == 32
+    assert divide["dsps"] == 0 and reciprocal["dsps"] > 0
+    # The reciprocal trades the divider for a DSP
+    assert reciprocal["luts"] < divide["luts"]
+
+    dut, _ = BENCHMARKS["SawOscillator"]()
+    assert resources(dut)["brams"] == 2
+
+
+def test_logic_depth():
+    def cell(kind, inputs, outputs):
+        return {
+            "type": kind,
+            "connections": {"A": inputs, "Y": outputs},
+            "port_directions": {"A": "input", "Y": "output"},
+        }
+
+    # ff -> a -> b -> ff, with a loop back through the register
+    cells = {
+        "ff": cell("$dff", [3], [1]),
+        "a": cell("$not", [1], [2]),
+        "b": cell("$not", [2], [3]),
+    }
+    assert logic_depth(cells) == 2
+
+    # A 16-bit adder is a carry chain, four levels deep
+    cells["b"] = {**cell("$add", [2], [3]), "parameters": {"Y_WIDTH": "00000000000000000000000000010000"}}
+    assert logic_depth(cells) == 5
+
+
+def test_compare(capsys):
+    before = {"results": {"X": {"resources": {"luts": 100, "ffs": 8}}}}
+    after = {"results": {"X": {"resources": {"luts": 110, "ffs": 8}}}}
+    compare(before, after)
+    assert capsys.readouterr().out == "X.luts: 100 -> 110 (+10.0%)\n"
@@ -0,0 +1,75 @@
+import json
+
+from amaranth import Elaboratable, Module, Signal
+
+from ..build import MANIFEST, Cache, build, clean
+from ..core import Core
+from ..modules.strobe import Strobe
+from ..toolchain import yosys
+
+
+class Strobes(Elaboratable):
+    def __init__(self, f_a: int, f_b: int):
+        self.o_stb = Signal()
+        self.units = {
+            "a": Strobe(1_000, f_a),
+            "b": Strobe(1_000, f_b),
+        }
+
+    def elaborate(self, _) -> Module:
+        m = Module()
+        for name, unit in self.units.items():
+            m.submodules[name] = unit
+        m.d.comb += self.o_stb.eq(self.units["a"].o_stb & self.units["b"].o_stb)
+        return m
+
+    def ports(self):
+        return [self.o_stb]
+
+
+def check_hierarchy(output):
+    """Reads the generated RTLIL back into Yosys; fails if an instance doesn't match its unit's module."""
+    files = json.loads((output / MANIFEST).read_text())["files"]
+    script = [f"read_rtlil <<rtlil\n{(output / name).read_text()}\nrtlil" for name in files if name.endswith(".il")]
+    script.append("hierarchy -check -top devilfpga_core")
+    yosys("\n".join(script))
+
+
+def test_build_incremental(tmp_path):
+    output = tmp_path / "fpga"
+    cache = Cache(tmp_path / "netlists")
+
+    assert build(Strobes(10, 20), output, cache, log=lambda _: None) == {
+        "a": "generated", "b": "generated", "top": "generated",
+    }
+    check_hierarchy(output)
+    top = (output / "devilfpga_core.v").read_text()
+    assert "devilfpga_a a (" in top and "devilfpga_b b (" in top
+
+    assert set(build(Strobes(10, 20), output, cache, log=lambda _: None).values()) == {"cached"}
+
+    # Only the changed unit (and the top level, which instantiates it) are regenerated
+    assert build(Strobes(10, 30), output, cache, log=lambda _: None) == {
+        "a": "cached", "b": "generated", "top": "generated",
+    }
+
+    clean(output, cache)
+    assert list(output.iterdir()) == []
+    assert not cache.root.exists()
+
+
+def test_build_core(tmp_path):
+    build(Core(), tmp_path, Cache(tmp_path / "netlists"), log=lambda _: None)
+    check_hierarchy(tmp_path)
+
+    # The declared ports only; no bridge without data slots, and no source paths
+    top = (tmp_path / "devilfpga_core.il").read_text()
+    assert "i_keys" in top and "bridge" not in top
+    assert "attribute \\src" not in top
+
+
+def test_build_data_slots(tmp_path):
+    cache = Cache(tmp_path / "netlists")
+    build(Core(data_slots=True), tmp_path, cache, log=lambda _: None)
+    check_hierarchy(tmp_path)
+    assert "bridge_clk" in (tmp_path / "devilfpga_vco.v").read_text()
@@ -0,0 +1,64 @@
+import numpy as np
+from amaranth import Signal
+
+from ..fingerprint import fingerprint
+from ..model.pipeline import Delay
+from ..oscillators import saw_oscillator
+
+
+def test_values():
+    assert fingerprint([1, 2.0, "a", None]) == fingerprint([1, 2.0, "a", None])
+    assert fingerprint(np.arange(4)) != fingerprint(np.arange(4).astype(np.int32))
+    assert fingerprint({"a": 1}) != fingerprint({"a": 2})
+    # Signals are identified by type only
+    assert fingerprint(Signal(4)) == fingerprint(Signal(8))
+
+
+def test_helpers(monkeypatch):
+    def bench():
+        return saw_oscillator.saw(np.arange(4), 8, 11)
+
+    # The helper a function calls through its module, and the constants the helper reads
+    key = fingerprint(bench)
+    monkeypatch.setattr(saw_oscillator, "N_SAMPLES_RISING", saw_oscillator.N_SAMPLES_RISING + 1)
+    assert fingerprint(bench) != key
+
+    key = fingerprint(bench)
+    monkeypatch.setattr(saw_oscillator, "saw", saw_oscillator.identity)
+    assert fingerprint(bench) != key
+
+
+def test_objects(monkeypatch):
+    # Plain objects by their attributes
+    assert fingerprint(Delay(1, [3])) == fingerprint(Delay(1, [3]))
+    assert fingerprint(Delay(1, [3])) != fingerprint(Delay(1, [4]))
+
+    # Classes of this package by their methods
+    key = fingerprint(Delay)
+    monkeypatch.setattr(Delay, "reset", lambda self: None)
+    assert fingerprint(Delay) != key
+
+    class Identified:
+        def __fingerprint__(self):
+            return 1
+
+    assert fingerprint(Identified()) == fingerprint(Identified())
+
+
+def test_repeats():
+    # Values repeat by value; only containers and objects are visited once
+    assert fingerprint([2, 1, 1]) != fingerprint([2, 1, 2])
+
+    def classes(peak: int):
+        class A:
+            def process(self):
+                return 1
+
+        class B:
+            def process(self):
+                return peak
+
+        return [A, B]
+
+    # The second class is hashed in full, though the first's temporaries have been freed
+    assert fingerprint(classes(1)) != fingerprint(classes(2))
@@ -0,0 +1,97 @@
+import math
+
+import pytest
+from amaranth import Const, Elaboratable, Module, Signal, signed, unsigned
+
+from ..fixed import Fixed, Q, dsp_blocks
+
+
+def test_format():
+    q = Q(2, 14)
+    assert q.width == 16 and (q.min, q.max) == (0, 2 ** 16 - 1)
+    assert Q(1, 15, signed=True).min == -2 ** 15
+    assert q.quantize(1.5) == 3 << 13
+    assert q.quantize(5.0) == q.max
+    with pytest.raises(OverflowError):
+        q.quantize(5.0, saturate=False)
+
+
+def test_width_inference():
+    x = Fixed(Signal(signed(16)), 12)
+    k = Fixed.const(2 * math.pi * 440 / 48_000, 16)
+    # Only as wide as the constant needs; 0.0576 has 4 leading zero fraction bits
+    assert k.format == Q(-4, 16) and k.value.value == round(2 * math.pi * 440 / 48_000 * 2 ** 16)
+
+    # Products keep every bit; sums align their binary points, and grow by one
+    assert (x * k).format == Q(0, 28, signed=True)
+    assert (x + k).format == Q(5, 16, signed=True)
+    assert (x >> 2).format == Q(2, 14, signed=True)
+    assert Fixed.const(-1, 0).format == Q(1, 0, signed=True)
+
+
+def test_operands():
+    x = Fixed(Signal(8), 4)
+    # Integers are exact; floats need a precision
+    assert (x * 3).format == Q(6, 4)
+    with pytest.raises(TypeError, match=r"Fixed\.const\(0\.3, frac_bits\)"):
+        x * 0.3
+    with pytest.raises(TypeError):
+        0.3 + x
+
+
+def test_widening():
+    # Extended to the format before wrapping; results always have the format's shape
+    y = Fixed(Const(-1, signed(4))).to(Q(8, 0), saturate=False)
+    assert y.shape() == unsigned(8) and Const.cast(y).value == 255
+    y = Fixed(Const(5, unsigned(4))).to(Q(8, 0, signed=True), saturate=False)
+    assert y.shape() == signed(8)
+    assert Fixed(Const(-3, signed(4))).to(Q(8, 0, signed=True)).shape() == signed(8)
+
+
+def test_dsp_blocks():
+    assert dsp_blocks(18, 18) == 1
+    assert dsp_blocks(27, 20) == 1
+    assert dsp_blocks(32, 16) == 2
+
+
+class Scale(Elaboratable):
+    """o_y = i_x * k, as Q4.4, rounded and saturated; or truncated and wrapped."""
+
+    def __init__(self, k: float, rounding: bool, saturate: bool):
+        self.i_x = Signal(signed(8))  # Q4.4
+        self.o_y = Signal(signed(8))  # Q4.4
+        self.k = k
+        self.rounding = rounding
+        self.saturate = saturate
+
+    def elaborate(self, _) -> Module:
+        m = Module()
+        y = Fixed(self.i_x, 4) * Fixed.const(self.k, 6, signed=True)
+        m.d.sync += self.o_y.eq(y.to(Q(4, 4, signed=True), self.rounding, self.saturate))
+        return m
+
+    def ports(self):
+        return [self.i_x, self.o_y]
+
+
+@pytest.mark.parametrize("rounding, saturate", [(True, True), (False, False)])
+def test_fixed(rounding, saturate, simulate):
+    k = -1.37
+    dut = Scale(k, rounding, saturate)
+    raw_k = round(k * 2 ** 6)
+
+    def expected(x):
+        y = x * raw_k
+        y = (y + (1 << 5)) >> 6 if rounding else y >> 6
+        if saturate:
+            return min(max(y, -128), 127)
+        return (y + 128) % 256 - 128
+
+    def bench():
+        for x in range(-128, 128):
+            yield dut.i_x.eq(x)
+            yield
+            yield
+            assert (yield dut.o_y) == expected(x)
+
+    simulate(dut, bench)
@@ -0,0 +1,123 @@
+import wave
+
+import numpy as np
+import pytest
+from amaranth import Fragment
+from ..modules.strobe import Strobe
+from ..oscillators.saw_oscillator import SawOscillator
+from . import harness
+from .harness import Capture, SimCache, profile, simulate
+
+
+def strobe_ticks(backend, **kwargs):
+    dut = Strobe(100, 7)
+    ticks = []
+
+    def bench():
+        for i in range(200):
+            yield
+            if (yield dut.o_stb):
+                ticks.append(i)
+
+    simulate(dut, bench, backend=backend, **kwargs)
+    return ticks
+
+
+def test_backends_agree():
+    assert strobe_ticks("cxxrtl") == strobe_ticks("pysim")
+
+
+@pytest.mark.parametrize("backend", ["pysim", "cxxrtl"])
+def test_vcd_window(tmp_path, backend):
+    vcd = tmp_path / "strobe.vcd"
+    strobe_ticks(backend, vcd=vcd, window=(50, 100))
+
+    text = vcd.read_text()
+    # After the initial (#0) dump
+    times = [int(line[1:]) for line in text.splitlines() if line.startswith("#")][1:]
+    assert "o_stb" in text
+    assert times[0] == 50 * 10_000 and times[-1] < 100 * 10_000
+
+
+def test_sim_cache(tmp_path, monkeypatch):
+    cache = SimCache(tmp_path)
+    first = strobe_ticks("pysim", cache=cache)
+
+    # A hit replays the bench, without simulating
+    def no_simulator(*args, **kwargs):
+        raise AssertionError("simulated")
+
+    monkeypatch.setattr(harness, "Simulator", no_simulator)
+    assert strobe_ticks("pysim", cache=cache) == first
+
+    # A different design, or stimulus, misses
+    def bench():
+        yield
+
+    for dut in [Strobe(100, 7), Strobe(100, 9)]:
+        assert cache.load(cache.key(dut, [("sync", bench)], {"sync": 1e-8})) is None
+        Fragment.get(dut, None)
+
+
+@pytest.mark.parametrize("suffix", [".npy", ".wav"])
+def test_capture(tmp_path, suffix):
+    dut = SawOscillator(100_000, 8, 2 ** 11)
+    expected = []
+
+    def bench():
+        yield dut.i_enable.eq(1)
+        yield dut.i_f_target.eq(1_000)
+        while len(expected) < 300:
+            yield
+            if (yield dut.o_stb):
+                expected.append((yield dut.o_a))
+
+    # A small buffer, so it's flushed a few times
+    with Capture(tmp_path / f"saw{suffix}", dut.o_a, dut.o_stb, n_samples=300, chunk=64) as capture:
+        simulate(dut, capture.wrap(bench))
+    assert capture.count == 300
+
+    if suffix == ".npy":
+        captured = np.load(tmp_path / "saw.npy")
+        assert captured.dtype == np.uint8
+        assert list(captured) == expected
+    else:
+        with wave.open(str(tmp_path / "saw.wav"), "rb") as f:
+            assert f.getnframes() == 300
+            captured = np.frombuffer(f.readframes(300), dtype="<i2")
+        assert list(captured) == [(x - 128) << 8 for x in expected]
+
+
+def test_capture_without_bench(tmp_path):
+    dut = Strobe(100, 7)
+    with Capture(tmp_path / "stb.npy", dut.o_stb, n_samples=100) as capture:
+        simulate(dut, capture.wrap())
+
+    assert list(np.load(tmp_path / "stb.npy")) == [1 if i in strobe_ticks("pysim") else 0 for i in range(100)]
+
+
+def test_profile(tmp_path):
+    dut = SawOscillator(1_000_000, 8, 2 ** 8)
+
+    def bench():
+        yield dut.i_enable.eq(1)
+        yield dut.i_f_target.eq(10_000)
+        for _ in range(300):
+            yield
+
+    activity = profile(dut, bench, vcd=tmp_path / "sim.vcd")
+    assert 300 <= activity.cycles <= 302
+
+    # The phase accumulator is the hot spot; its low bits flip about every cycle
+    signals = sorted(activity.toggles, key=activity.toggles.get, reverse=True)
+    assert signals[0] == ("top", "phase_acc", "s_phase_acc")
+    assert activity.toggles[("top", "clk")] in (2 * activity.cycles - 1, 2 * activity.cycles)
+
+    modules = activity.modules(inclusive=True)
+    assert modules[("top",)] == sum(activity.toggles.values())
+    assert modules[("top",)] > modules[("top", "phase_acc")] == activity.modules()[("top", "phase_acc")]
+
+    assert "top.phase_acc.s_phase_acc" in activity.report(5)
+    for line in activity.folded().splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert stack.startswith("top;") and int(count) > 0
@@ -0,0 +1,70 @@
+import wave
+
+import numpy as np
+import pytest
+
+from ..__main__ import main
+from ..render import NOTE_C1, NOTE_E5, Render, Step, note_cv, parse_pattern, render, render_batch
+
+
+def read_wav(path) -> np.ndarray:
+    with wave.open(str(path), "rb") as f:
+        assert (f.getnchannels(), f.getsampwidth()) == (1, 2)
+        return np.frombuffer(f.readframes(f.getnframes()), dtype="<i2")
+
+
+def test_parse_pattern():
+    assert parse_pattern("C1 A1a . E5as") == [
+        Step(NOTE_C1),
+        Step(8, accent=True),
+        Step(None),
+        Step(NOTE_E5, accent=True, slide=True),
+    ]
+
+    with pytest.raises(ValueError):
+        parse_pattern("H2")
+    with pytest.raises(ValueError):
+        parse_pattern("F5")
+
+
+def test_note_cv():
+    assert note_cv(8) == note_cv(NOTE_C1) == 0
+    assert note_cv(NOTE_E5) == 2 ** 16 - 1
+    # Semitones are evenly spaced, as the antilog is exponential
+    assert note_cv(NOTE_C1 + 24) - note_cv(NOTE_C1 + 12) == pytest.approx(note_cv(NOTE_C1 + 12), abs=1)
+
+
+def test_render_chunks(tmp_path):
+    job = Render("C2 C2a D#2s .", tmp_path / "whole.wav", tempo=480.0)
+
+    whole = read_wav(render(job))
+    chunked = read_wav(render(Render(job.pattern, tmp_path / "chunked.wav", tempo=480.0, chunk=1000)))
+
+    assert len(whole) == 4 * 48_000 * 60 // 480 // 4
+    assert np.array_equal(whole, chunked)
+    assert np.any(whole != 0)
+
+
+def test_main(tmp_path, capsys):
+    main(["render", "C2 G2a", "A1 . A2", "--cutoff", "400", "1600", "--tempo", "960", "-o", str(tmp_path),
+          "--jobs", "2"])
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["000_000.wav", "000_001.wav", "001_000.wav", "001_001.wav"]
+    assert len(capsys.readouterr().out.splitlines()) == 4
+    # A lower cutoff takes the edge off
+    assert np.abs(np.diff(read_wav(tmp_path / "000_000.wav"))).mean() < \
+        np.abs(np.diff(read_wav(tmp_path / "000_001.wav"))).mean()
+
+
+def test_render_batch(tmp_path):
+    patterns = ["C2 C2a D#2s .", "A1 . A2as", "G1s C3"]
+    alone = [read_wav(render(Render(pattern, tmp_path / f"{i}.wav", tempo=480.0, chunk=1000)))
+             for i, pattern in enumerate(patterns)]
+
+    # Patterns of different lengths, rendered together
+    together = render_batch([Render(pattern, tmp_path / f"batch_{i}.wav", tempo=480.0, chunk=1000)
+                             for i, pattern in enumerate(patterns)])
+    assert all(np.array_equal(read_wav(path), a) for path, a in zip(together, alone))
+
+    with pytest.raises(ValueError):
+        render_batch([Render("C2", tmp_path / "a.wav"), Render("C2", tmp_path / "b.wav", chunk=1000)])
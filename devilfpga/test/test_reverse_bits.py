@@ -0,0 +1,71 @@
+import importlib.util
+import json
+import os
+import stat
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).parents[2] / "scripts" / "reverse_bits.py"
+
+spec = importlib.util.spec_from_file_location("reverse_bits", SCRIPT)
+reverse_bits = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(reverse_bits)
+
+
+def test_table():
+    assert len(reverse_bits.TABLE) == 256
+    assert reverse_bits.TABLE[0b0000_0001] == 0b1000_0000
+    assert reverse_bits.TABLE[0b1100_1010] == 0b0101_0011
+    assert all(reverse_bits.TABLE[reverse_bits.TABLE[byte]] == byte for byte in range(256))
+
+
+@pytest.mark.parametrize("size", [0, 1, 15, 16, 17, 100])
+def test_reverse_file(tmp_path, size):
+    data = bytes(range(256)) * (size // 256 + 1)
+    data = data[:size]
+    (tmp_path / "in.rbf").write_bytes(data)
+
+    # Chunks of 16 bytes; a chunk boundary falls inside, at, and past the end of the input
+    output = tmp_path / "out" / "out.rbf_r"
+    assert reverse_bits.reverse_file(tmp_path / "in.rbf", output, chunk=16) == size
+    assert output.read_bytes() == bytes(reverse_bits.TABLE[byte] for byte in data)
+
+
+def test_reverse_file_permissions(tmp_path):
+    (tmp_path / "in.rbf").write_bytes(b"\x01\x02")
+    output = tmp_path / "out.rbf_r"
+
+    umask = os.umask(0o022)
+    try:
+        reverse_bits.reverse_file(tmp_path / "in.rbf", output)
+    finally:
+        os.umask(umask)
+    assert stat.S_IMODE(output.stat().st_mode) == 0o644
+
+    # A replaced file keeps its permissions
+    output.chmod(0o664)
+    reverse_bits.reverse_file(tmp_path / "in.rbf", output)
+    assert stat.S_IMODE(output.stat().st_mode) == 0o664
+
+
+def test_package(tmp_path):
+    core_dir = tmp_path / "open-fpga"
+    core_dir.mkdir()
+    (core_dir / "core.json").write_text(json.dumps({"core": {
+        "metadata": {"author": "a", "shortname": "b"},
+        "cores": [{"name": "default", "id": 0, "filename": "bitstream.rbf_r"}],
+    }}))
+    (core_dir / "data.json").write_text("{}\r\n")
+    (tmp_path / "bitstream.rbf").write_bytes(b"\x01")
+
+    output = reverse_bits.package(tmp_path / "bitstream.rbf", core_dir)
+    folder = core_dir / "dist" / "Cores" / "a.b"
+    assert output == folder / "bitstream.rbf_r"
+    assert output.read_bytes() == b"\x80"
+    # The definitions that exist are copied, as they are
+    assert sorted(path.name for path in folder.iterdir()) == ["bitstream.rbf_r", "core.json", "data.json"]
+    assert (folder / "data.json").read_bytes() == b"{}\r\n"
+
+    with pytest.raises(ValueError):
+        reverse_bits.package(tmp_path / "bitstream.rbf", core_dir, core="other")
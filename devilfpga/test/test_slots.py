@@ -0,0 +1,50 @@
+import json
+
+import numpy as np
+from amaranth.hdl import Fragment
+
+from ..core import SLOTS, Core, slot_tables
+from ..slots import pack, write_slots
+
+
+def test_pack():
+    assert pack([1, 0x1234_5678]) == bytes([0, 0, 0, 1, 0x12, 0x34, 0x56, 0x78])
+
+
+def test_slot_tables():
+    core = Core(data_slots=True)
+    Fragment.get(core, None)
+    assert core.tables() == slot_tables()
+
+
+def test_write_slots(tmp_path):
+    core_dir = tmp_path / "open-fpga"
+    core_dir.mkdir()
+    (core_dir / "core.json").write_text(json.dumps({"core": {"metadata": {"author": "a", "shortname": "b"}}}))
+    data_json = core_dir / "data.json"
+    data_json.write_text(json.dumps({"data": {"magic": "APF_VER_1", "data_slots": [
+        {"name": "Background", "id": 1, "required": True, "parameters": 3, "extensions": ["bin"],
+         "size_exact": 0, "address": "0x00000000"},
+    ]}}))
+    source = data_json.read_bytes()
+
+    paths = write_slots(dist=tmp_path / "dist", core_dir=core_dir, log=lambda _: None)
+    assert sorted(path.relative_to(tmp_path / "dist").as_posix() for path in paths) == [
+        "Assets/devilfpga/common/saw.bin",
+        "Cores/a.b/data.json",
+    ]
+
+    # The saw LUT, one word per entry
+    saw = np.frombuffer((tmp_path / "dist" / "Assets" / "devilfpga" / "common" / "saw.bin").read_bytes(), dtype=">u4")
+    assert list(saw) == slot_tables()[SLOTS["saw"]]
+
+    # Other slots are kept, in the packaged data.json only; rewriting is idempotent
+    packaged = tmp_path / "dist" / "Cores" / "a.b" / "data.json"
+    slots = json.loads(packaged.read_text())["data"]["data_slots"]
+    assert [slot["id"] for slot in slots] == [1, 2]
+    assert slots[1]["size_exact"] == 4 * len(saw)
+    assert data_json.read_bytes() == source
+    text = packaged.read_bytes()
+    assert b"\r\n" in text
+    write_slots(dist=tmp_path / "dist", core_dir=core_dir, log=lambda _: None)
+    assert packaged.read_bytes() == text
@@ -0,0 +1,22 @@
+"""The external tools the build and the benchmarks run."""
+import importlib.util
+import os
+import subprocess
+import sys
+
+
+def yosys(script: str) -> str:
+    """Runs a Yosys script (quietly); returns what it wrote to stdout.
+
+    As Amaranth does, runs the Yosys of the amaranth-yosys package, or the one on the PATH (or $YOSYS)
+    with AMARANTH_USE_YOSYS=system, or if the package isn't installed.
+    """
+    if os.environ.get("AMARANTH_USE_YOSYS") == "system" or importlib.util.find_spec("amaranth_yosys") is None:
+        command = [os.environ.get("YOSYS", "yosys")]
+    else:
+        command = [sys.executable, "-m", "amaranth_yosys"]
+
+    result = subprocess.run([*command, "-q", "-"], input=script, capture_output=True, text=True)
+    if result.returncode:
+        raise RuntimeError(f"Yosys failed:\n{result.stderr or result.stdout}")
+    return result.stdout
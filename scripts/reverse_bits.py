@@ -1,34 +1,117 @@
+"""Reverses the bit order of each byte of a bitstream; the Analogue Pocket loads its FPGA bitstreams (.rbf_r) reversed.
+
+    python scripts/reverse_bits.py bitstream.rbf bitstream.rbf_r
+    python scripts/reverse_bits.py output/bitstream.rbf --package
+
+With --package, the reversed bitstream is written into the core's folder in the distribution, as named in
+core.json (Cores/<author>.<shortname>/<filename>), alongside the core's JSON definitions.
+"""
 import argparse
+import json
+import mmap
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+OPEN_FPGA_DIR = Path(__file__).parents[1] / "open-fpga"
+
+# Byte -> byte, bits reversed
+TABLE = bytes(int(format(byte, '08b')[::-1], 2) for byte in range(256))
+
+CHUNK = 1 << 20
+
+# The core definitions copied into the package
+DEFINITIONS = ["audio.json", "core.json", "data.json", "input.json", "interact.json", "variants.json", "video.json"]
+
+
+def reverse_bits(data: bytes) -> bytes:
+    return data.translate(TABLE)
+
 
+def reverse_file(input_path: Path, output_path: Path, chunk: int = CHUNK) -> int:
+    """Writes the reversed input to output, a chunk at a time from a memory map of the input; returns its size."""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(input_path, 'rb') as input_file, \
+            tempfile.NamedTemporaryFile(dir=output_path.parent, delete=False) as output_file:
+        try:
+            size = os.fstat(input_file.fileno()).st_size
+            if size:
+                with mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    for start in range(0, size, chunk):
+                        output_file.write(reverse_bits(data[start:start + chunk]))
+        except BaseException:
+            os.unlink(output_file.name)
+            raise
 
-def reverse_bits(byte):
-    return int(format(byte, '08b')[::-1], 2)
+    # The temporary file is private (0600); take the permissions of the file it replaces, or those of a new file
+    if output_path.exists():
+        shutil.copymode(output_path, output_file.name)
+    else:
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(output_file.name, 0o644 & ~umask)
+
+    # Replaced in one step, so a failed run never leaves a truncated bitstream behind
+    os.replace(output_file.name, output_path)
+    return size
+
+
+def package(input_path: Path, core_dir: Path = OPEN_FPGA_DIR, dist: Path = None, core: str = None) -> Path:
+    """Packages the bitstream into dist/Cores/<author>.<shortname>/ as the core.json layout names it."""
+    dist = core_dir / "dist" if dist is None else dist
+    definition = json.loads((core_dir / "core.json").read_text())["core"]
+    metadata = definition["metadata"]
+
+    cores = definition["cores"]
+    if core is not None:
+        cores = [entry for entry in cores if entry["name"] == core]
+    if len(cores) != 1:
+        names = [entry["name"] for entry in definition["cores"]]
+        raise ValueError(f"Pick one of the cores {names} to package the bitstream as (--core)")
+
+    folder = dist / "Cores" / f"{metadata['author']}.{metadata['shortname']}"
+    output_path = folder / cores[0]["filename"]
+    reverse_file(input_path, output_path)
+
+    for name in DEFINITIONS:
+        if (core_dir / name).exists():
+            shutil.copyfile(core_dir / name, folder / name)
+
+    return output_path
 
 
 def main():
     parser = argparse.ArgumentParser(
         description="Reverse a bitstream")
-    parser.add_argument("input_file", help="Input binary file")
-    parser.add_argument("output_file", help="Output binary file")
+    parser.add_argument("input_file", type=Path, help="Input binary file")
+    parser.add_argument("output_file", type=Path, nargs="?", help="Output binary file")
+    parser.add_argument("--package", action="store_true",
+                        help="Write the output into the core's folder in the distribution, with its definitions")
+    parser.add_argument("--core-dir", type=Path, default=OPEN_FPGA_DIR, help="Directory of core.json et al.")
+    parser.add_argument("--dist", type=Path, help="Distribution directory (default: <core-dir>/dist)")
+    parser.add_argument("--core", help="Name of the core (in core.json) the bitstream is for")
 
     args = parser.parse_args()
+    if args.package == (args.output_file is not None):
+        parser.error("pass either an output file, or --package")
 
     try:
-        with open(args.input_file, 'rb') as input_file:
-            input_data = input_file.read()
-
-        reversed_data = bytes(reverse_bits(byte) for byte in input_data)
-
-        with open(args.output_file, 'wb') as output_file:
-            output_file.write(reversed_data)
+        if args.package:
+            output_path = package(args.input_file, args.core_dir, args.dist, args.core)
+        else:
+            output_path = args.output_file
+            reverse_file(args.input_file, output_path)
 
-        print(f"Reversed {len(input_data)} bytes")
+        print(f"Reversed {args.input_file.stat().st_size} bytes to {output_path}")
         print("Done")
-    except FileNotFoundError:
-        print(f"Couldn't open the file {args.input_file} for input")
+    except FileNotFoundError as e:
+        print(f"Couldn't open the file {e.filename}")
+        return 1
     except Exception as e:
         print(f"An error occurred: {str(e)}")
+        return 1
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())